@@ -6,6 +6,7 @@ class LaTeXResumeEditor {
             coverLetter: ''
         };
         this.apiKey = null;
+        this.installId = null; // Random per-install id, scopes the backend's compile workspaces to this user
         this.autoSaveInterval = null;
         this.currentPdfUrl = null;
         this.currentPdfData = null; // Store base64 PDF data for uploading
@@ -27,6 +28,7 @@ class LaTeXResumeEditor {
         // Load saved documents and API key
         await this.loadDocuments();
         await this.loadApiKey();
+        await this.loadInstallId();
         
         // Load saved PDF data
         await this.loadSavedPDFs();
@@ -208,6 +210,20 @@ class LaTeXResumeEditor {
         }
     }
 
+    async loadInstallId() {
+        try {
+            const result = await chrome.storage.local.get(['installId']);
+            this.installId = result.installId;
+            if (!this.installId) {
+                this.installId = crypto.randomUUID();
+                await chrome.storage.local.set({ installId: this.installId });
+            }
+        } catch (error) {
+            console.error('Error loading install id:', error);
+            this.installId = crypto.randomUUID();
+        }
+    }
+
     async loadApiKey() {
         try {
             const result = await chrome.storage.local.get(['geminiApiKey']);
@@ -418,7 +434,9 @@ class LaTeXResumeEditor {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
-                    latex_content: content
+                    latex_content: content,
+                    document_id: `${this.installId}:${this.currentDocument}`, // reuse this user's warm compile workspace
+                    response_format: 'base64' // PDF is kept as base64 in Chrome storage
                 })
             });
 
@@ -518,6 +536,26 @@ class LaTeXResumeEditor {
             document.getElementById('keywordsSection').style.display = 'block';
             document.getElementById('keywordsContainer').innerHTML = '<div class="keywords-loading">Extracting keywords...</div>';
 
+            // Show keywords from the local skills dictionary right away; the AI list replaces them when it arrives
+            let aiKeywordsShown = false;
+            fetch(`${this.backendUrl}/extract-keywords`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    job_posting: jobContent,
+                    mode: 'fast'
+                })
+            })
+                .then(fastResponse => fastResponse.json())
+                .then(fastResult => {
+                    if (!aiKeywordsShown && fastResult.success && fastResult.keywords && fastResult.keywords.length) {
+                        this.displayKeywords(fastResult.keywords);
+                    }
+                })
+                .catch(error => console.log('[DEBUG] Fast keyword extraction failed:', error));
+
             // Call Python backend for keyword extraction
             const response = await fetch(`${this.backendUrl}/extract-keywords`, {
                 method: 'POST',
@@ -534,6 +572,7 @@ class LaTeXResumeEditor {
 
             if (result.success && result.keywords) {
                 // Display keywords as pills
+                aiKeywordsShown = true;
                 this.displayKeywords(result.keywords);
                 this.showNotification('Keywords extracted successfully!', 'success');
             } else {
@@ -959,15 +998,63 @@ class LaTeXResumeEditor {
         }
     }
 
-    finishEditReview() {
+    async finishEditReview() {
         if (!this.editReviewMode) return;
         
         // Apply only approved edits
         const approvedEdits = this.pendingEdits.filter(edit => edit.status === 'approved');
         const rejectedCount = this.pendingEdits.filter(edit => edit.status === 'rejected').length;
         
-        // Start with original content and apply approved edits
-        let finalContent = this.originalContent;
+        // The backend resolves every target once and applies all edits in a single pass;
+        // fall back to applying them here if it is unreachable
+        let finalContent;
+        try {
+            const response = await fetch(`${this.backendUrl}/apply-suggestions`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    document_content: this.originalContent,
+                    suggestions: approvedEdits
+                })
+            });
+            const result = await response.json();
+            if (!result.success) {
+                throw new Error(result.error || 'Failed to apply suggestions');
+            }
+            finalContent = result.document_content;
+            if (result.skipped.length > 0) {
+                console.log('[DEBUG] Edits not applied by backend:', result.skipped);
+            }
+        } catch (error) {
+            console.error('Error applying suggestions on backend, applying locally:', error);
+            finalContent = this.applyEditsLocally(this.originalContent, approvedEdits);
+        }
+        
+        // Update editor with final content (plain text)
+        this.setEditorText(finalContent);
+        this.documents[this.currentDocument] = finalContent;
+        this.updateLineNumbers();
+        
+        // Clean up edit review mode
+        this.editReviewMode = false;
+        this.pendingEdits = [];
+        this.currentEditIndex = 0;
+        this.originalContent = '';
+        
+        // Hide navigation controls
+        document.getElementById('editNavigation').style.display = 'none';
+        
+        // Show summary
+        this.showNotification(
+            `Applied ${approvedEdits.length} edit${approvedEdits.length !== 1 ? 's' : ''}${rejectedCount > 0 ? `, rejected ${rejectedCount}` : ''}!`, 
+            'success'
+        );
+    }
+
+    applyEditsLocally(content, approvedEdits) {
+        let finalContent = content;
         
         // Sort approved edits by position (reverse order to avoid position shifts)
         const sortedApprovedEdits = approvedEdits.sort((a, b) => {
@@ -995,25 +1082,7 @@ class LaTeXResumeEditor {
             }
         });
         
-        // Update editor with final content (plain text)
-        this.setEditorText(finalContent);
-        this.documents[this.currentDocument] = finalContent;
-        this.updateLineNumbers();
-        
-        // Clean up edit review mode
-        this.editReviewMode = false;
-        this.pendingEdits = [];
-        this.currentEditIndex = 0;
-        this.originalContent = '';
-        
-        // Hide navigation controls
-        document.getElementById('editNavigation').style.display = 'none';
-        
-        // Show summary
-        this.showNotification(
-            `Applied ${approvedEdits.length} edit${approvedEdits.length !== 1 ? 's' : ''}${rejectedCount > 0 ? `, rejected ${rejectedCount}` : ''}!`, 
-            'success'
-        );
+        return finalContent;
     }
 
     async saveOriginalContent() {
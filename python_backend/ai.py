@@ -6,73 +6,101 @@ This file contains the logic for how the AI backend will do the following:
 """
 
 import json
-import re
-from typing import Dict, List, Optional, Any
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from google import genai
 from google.genai import types
 
+from fake_gemini import FakeGeminiClient
+from json_stream import JSONArrayStreamParser
+from keyword_cache import KeywordCache
+from latex_sections import PromptDocument, estimate_tokens, trim_latex_document
+from latex_validator import has_errors, validate_suggestion, validate_suggestions
+from metrics import record_model_call
+from skill_extractor import extract_skill_keywords
+from suggestion_cache import SuggestionCache
+from tracing import propagate, span
+
+logger = logging.getLogger(__name__)
+
+# Structured output schema shared by the resume and cover letter suggestion prompts
+SUGGESTIONS_SCHEMA = {
+    'type': 'ARRAY',
+    'items': {
+        'type': 'OBJECT',
+        'required': ['id', 'type', 'target_text', 'replacement_text', 'description', 'keywords_used'],
+        'properties': {
+            'id': {
+                'type': 'STRING',
+            },
+            'type': {
+                'type': 'STRING',
+                'enum': ['replace', 'insert_after']
+            },
+            'target_text': {
+                'type': 'STRING',
+            },
+            'replacement_text': {
+                'type': 'STRING',
+            },
+            'description': {
+                'type': 'STRING',
+            },
+            'keywords_used': {
+                'type': 'ARRAY',
+                'items': {
+                    'type': 'STRING'
+                }
+            }
+        },
+    }
+}
 
 class AIAnalyzer:
-    def __init__(self, api_key: str):
-        """Initialize the AI analyzer with Gemini API key."""
-        self.client = genai.Client(api_key=api_key)
+    def __init__(self,
+                 api_key: str,
+                 keyword_cache: Optional[KeywordCache] = None,
+                 trim_prompts: bool = True,
+                 keyword_timeout: Optional[float] = None,
+                 suggestion_cache: Optional[SuggestionCache] = None,
+                 client: Any = None):
+        """
+        Initialize the AI analyzer with Gemini API key and optional shared keyword/suggestion caches.
+        
+        A client with the genai.Client interface (e.g. fake_gemini.FakeGeminiClient)
+        can be passed instead of connecting to Gemini.
+        """
+        self.client = client if client is not None else genai.Client(api_key=api_key)
         self.keyword_model = 'gemini-2.5-flash-lite'
         self.suggestions_model = 'gemini-2.5-flash'
-
-    def validate_latex_suggestion(self, suggestion: Dict[str, Any]) -> bool:
+        self.keyword_cache = keyword_cache
+        self.trim_prompts = trim_prompts  # send only the relevant sections, not the preamble
+        self.keyword_timeout = keyword_timeout  # seconds before keyword extraction falls back to the local extractor
+        self.suggestion_cache = suggestion_cache  # enables one cached call per keyword for resume suggestions
+        self.fanout_workers = 4  # concurrent per-keyword calls
+
+    def validate_latex_suggestion(self,
+                                  suggestion: Dict[str, Any],
+                                  findings: Optional[List[Dict[str, Any]]] = None) -> bool:
         """
         Validate that a suggestion contains properly formatted LaTeX.
         
         Args:
             suggestion: The suggestion dictionary to validate
+            findings: Findings from a batch run of validate_suggestions, if already computed
             
         Returns:
             True if the suggestion appears to be valid LaTeX, False otherwise
         """
-        target_text = suggestion.get('target_text', '')
-        replacement_text = suggestion.get('replacement_text', '')
-        
-        # Check for balanced braces
-        def check_balanced_braces(text):
-            count = 0
-            for char in text:
-                if char == '{':
-                    count += 1
-                elif char == '}':
-                    count -= 1
-                if count < 0:
-                    return False
-            return count == 0
-        
-        # Basic LaTeX validation checks
-        if not check_balanced_braces(target_text) or not check_balanced_braces(replacement_text):
-            print(f"[DEBUG] LaTeX validation failed: Unbalanced braces in suggestion {suggestion.get('id')}")
-            return False
-        
-        # Check for unescaped special characters that should be escaped in LaTeX
-        special_chars = {'&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_', '^': r'\^'}
-        for char, escaped in special_chars.items():
-            if char in replacement_text and escaped not in replacement_text:
-                # Allow some exceptions (like & in URLs or $ in math mode indicators)
-                if char == '&' and ('http' in replacement_text or 'www' in replacement_text):
-                    continue
-                print(f"[DEBUG] LaTeX validation warning: Unescaped {char} in suggestion {suggestion.get('id')}")
-        
-        # Check for proper LaTeX command structure
-        latex_commands = re.findall(r'\\([a-zA-Z]+)(\{[^}]*\})?', replacement_text)
-        valid_commands = ['textbf', 'textit', 'emph', 'item', 'section', 'subsection', 'begin', 'end', 'newline', 'linebreak']
-        
-        for cmd, args in latex_commands:
-            if cmd not in valid_commands and len(cmd) < 3:  # Allow longer custom commands
-                print(f"[DEBUG] LaTeX validation warning: Potentially invalid command \\{cmd} in suggestion {suggestion.get('id')}")
-        
-        # Check for common LaTeX patterns in resumes
-        if '\\item' in replacement_text:
-            # Ensure item commands are properly formatted
-            if not re.search(r'\\item\s+', replacement_text):
-                print(f"[DEBUG] LaTeX validation warning: \\item should be followed by space in suggestion {suggestion.get('id')}")
-        
-        return True
+        if findings is None:
+            # Warnings never reject a suggestion and are only logged, so only scan for them when they show
+            findings = validate_suggestion(suggestion, warnings=logger.isEnabledFor(logging.DEBUG))
+        for finding in findings:
+            logger.debug("LaTeX validation %s: %s (%s) in suggestion %s", finding['severity'], finding['message'],
+                         finding['field'], suggestion.get('id'))
+        return not has_errors(findings)
 
     def extract_job_keywords(self, job_posting: str) -> Dict[str, List[str]]:
         """
@@ -84,6 +112,48 @@ class AIAnalyzer:
         Returns:
             Dict containing categorized keywords
         """
+        # Same posting (after normalization) and model: skip the Gemini round trip
+        cached_keywords = self._cached_keywords(job_posting)
+        if cached_keywords is not None:
+            return cached_keywords
+
+        try:
+            response = self._generate_content(self._keyword_request(job_posting), 'extract_job_keywords')
+            return self._keywords_from_response(job_posting, response)
+            
+        except Exception as e:
+            logger.warning("Error extracting keywords: %s", e)
+            if 'response' in locals():
+                logger.debug("Keyword response text: %r", response.text)
+            return self._fallback_keywords(job_posting)
+
+    def _generate_content(self, request: Dict[str, Any], method: str):
+        """Run one generate_content call and record its latency, outcome and tokens under method."""
+        start_time = time.perf_counter()
+        try:
+            with span('gemini', method=method, model=request['model']):
+                response = self.client.models.generate_content(**request)
+        except Exception:
+            record_model_call(method, request['model'], time.perf_counter() - start_time, error=True)
+            raise
+        record_model_call(method, request['model'], time.perf_counter() - start_time, response)
+        return response
+
+    @staticmethod
+    def _fallback_keywords(job_posting: str) -> List[str]:
+        """Keywords from the local skills dictionary, used when Gemini fails or times out."""
+        keywords = extract_skill_keywords(job_posting)
+        logger.info("Falling back to %d locally extracted keywords", len(keywords))
+        return keywords
+
+    def _cached_keywords(self, job_posting: str) -> Optional[List[str]]:
+        """Return keywords cached for this posting and model, if any."""
+        if self.keyword_cache is None:
+            return None
+        return self.keyword_cache.get(job_posting, self.keyword_model)
+
+    def _keyword_request(self, job_posting: str) -> Dict[str, Any]:
+        """Build the generate_content arguments for keyword extraction."""
         prompt = f"""
         Your task is to analyze a job posting and extract relevant SKILL RELATED KEYWORDS that should be included in a resume or cover letter.
 
@@ -108,32 +178,32 @@ class AIAnalyzer:
         Do not include any non-technical keywords or general terms that do not directly relate to the job requirements.
         """
 
-    
-        try:
-            response = self.client.models.generate_content(
-                model=self.keyword_model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction='You are an expert in resume optimization and job analysis.',
-                    temperature=0.1,
-                    response_mime_type='application/json',
-                    response_schema={
-                        'type': 'ARRAY',
-                        'items': {
-                            'type': 'STRING'
-                        }
-                    },
-                    seed=42,
-                ),
-            )
-            
-            # Parse JSON response directly
-            return json.loads(response.text)
-            
-        except Exception as e:
-            print(f"Error extracting keywords: {e}")
-            print(f"Response text: '{response.text if 'response' in locals() else 'No response'}'")
-            return {}
+
+        return {
+            'model': self.keyword_model,
+            'contents': prompt,
+            'config': types.GenerateContentConfig(
+                system_instruction='You are an expert in resume optimization and job analysis.',
+                temperature=0.1,
+                response_mime_type='application/json',
+                response_schema={
+                    'type': 'ARRAY',
+                    'items': {
+                        'type': 'STRING'
+                    }
+                },
+                seed=42,
+                http_options=types.HttpOptions(timeout=int(self.keyword_timeout * 1000)) if self.keyword_timeout else None,
+            ),
+        }
+
+    def _keywords_from_response(self, job_posting: str, response) -> List[str]:
+        """Parse the keyword list from a response and cache it."""
+        # Parse JSON response directly
+        keywords = json.loads(response.text)
+        if self.keyword_cache is not None and isinstance(keywords, list) and keywords:
+            self.keyword_cache.put(job_posting, self.keyword_model, keywords)
+        return keywords
 
     
     def generate_resume_suggestions(self, 
@@ -150,12 +220,116 @@ class AIAnalyzer:
         Returns:
             Dict containing various types of suggestions
         """
+        if self.suggestion_cache is None:
+            return self._generate_resume_suggestions_once(resume_content, job_keywords)
+
+        # One call per keyword, so changing the selection only pays for the new keywords
+        keywords = self._keyword_names(job_keywords)
+        results, missing = self._cached_keyword_suggestions(resume_content, keywords)
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), self.fanout_workers)) as executor:
+                generated = executor.map(
+                    propagate(lambda keyword: self._generate_resume_suggestions_once(resume_content, [keyword])),
+                    missing)
+                for keyword, result in zip(missing, generated):
+                    results[keyword] = self._store_keyword_suggestions(resume_content, keyword, result)
+        return self._merge_keyword_suggestions(resume_content, keywords, results, len(missing))
+
+    def _generate_resume_suggestions_once(self,
+                                          resume_content: str,
+                                          job_keywords: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Generate resume suggestions for the given keywords with a single Gemini call."""
+        document = self._prompt_document(resume_content, job_keywords)
+        try:
+            response = self._generate_content(self._resume_suggestions_request(document, job_keywords),
+                                              'generate_resume_suggestions')
+            return self._suggestions_from_response(response, 'resume', document)
+
+        except Exception as e:
+            logger.warning("Error generating resume suggestions: %s", e)
+            return {"suggestions": [], "error": str(e)}
+
+    @staticmethod
+    def _keyword_names(job_keywords: Any) -> List[str]:
+        """Selected keywords as a list without case-insensitive duplicates (old dict format accepted)."""
+        names, seen = [], set()
+        for keyword in (job_keywords.keys() if isinstance(job_keywords, dict) else job_keywords):
+            keyword = str(keyword).strip()
+            if keyword and keyword.lower() not in seen:
+                seen.add(keyword.lower())
+                names.append(keyword)
+        return names
+
+    def _cached_keyword_suggestions(self, resume_content: str, keywords: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """Split keywords into cached results and the ones that still need a Gemini call."""
+        results, missing = {}, []
+        for keyword in keywords:
+            cached = self.suggestion_cache.get(resume_content, keyword, self.suggestions_model)
+            if cached is None:
+                missing.append(keyword)
+            else:
+                results[keyword] = {"suggestions": cached, "cached": True}
+        return results, missing
+
+    def _store_keyword_suggestions(self, resume_content: str, keyword: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache one keyword's suggestions unless its call failed."""
+        if 'error' not in result:
+            self.suggestion_cache.put(resume_content, keyword, self.suggestions_model, result['suggestions'])
+        return result
+
+    @staticmethod
+    def _merge_keyword_suggestions(resume_content: str,
+                                   keywords: List[str],
+                                   results: Dict[str, Dict[str, Any]],
+                                   llm_calls: int) -> Dict[str, Any]:
+        """Merge per-keyword results in keyword order, dropping repeated targets and renaming clashing ids."""
+        merged, seen_targets, seen_ids = [], set(), set()
+        duplicates = 0
+        prompt_tokens = None
+        for keyword in keywords:
+            result = results[keyword]
+            tokens = (result.get('prompt_stats') or {}).get('prompt_tokens')
+            if tokens is not None:
+                prompt_tokens = (prompt_tokens or 0) + tokens
+
+            for suggestion in result['suggestions']:
+                target = ' '.join(str(suggestion.get('target_text', '')).split())
+                if target in seen_targets:
+                    duplicates += 1
+                    continue
+                seen_targets.add(target)
+
+                suggestion_id = str(suggestion.get('id') or f"suggestion_{len(merged) + 1}")
+                unique_id, n = suggestion_id, 2
+                while unique_id in seen_ids:
+                    unique_id, n = f"{suggestion_id}_{n}", n + 1
+                seen_ids.add(unique_id)
+                suggestion['id'] = unique_id
+                merged.append(suggestion)
+
+        logger.debug("Merged %d suggestions from %d keywords (%d Gemini calls, %d duplicate targets dropped)",
+                     len(merged), len(keywords), llm_calls, duplicates)
+        return {
+            "suggestions": merged,
+            "prompt_stats": {
+                'keywords': len(keywords),
+                'cached_keywords': len(keywords) - llm_calls,
+                'llm_calls': llm_calls,
+                'duplicate_targets': duplicates,
+                'estimated_tokens_before': estimate_tokens(resume_content),
+                'prompt_tokens': prompt_tokens,
+            },
+        }
 
+    def _resume_suggestions_request(self,
+                                    document: PromptDocument,
+                                    job_keywords: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Build the generate_content arguments for resume suggestions."""
         prompt = f"""
         Analyze this LaTeX resume and provide specific suggestions to better align it with the job requirements.
 
-        CURRENT RESUME (LaTeX format):
-        {resume_content}
+        CURRENT RESUME (LaTeX format, relevant sections only):
+        {document.text}
 
         KEYWORDS YOU NEED TO INCLUDE:
         {job_keywords}
@@ -231,74 +405,7 @@ class AIAnalyzer:
         Generate 1-2 suggestions per keyword maximum. Focus on quality over quantity.
         """
         
-        try:
-            response = self.client.models.generate_content(
-                model=self.suggestions_model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction='You are an expert resume writer and ATS optimization specialist.',
-                    temperature=0.1,
-                    response_mime_type='application/json',
-                    response_schema={
-                        'type': 'ARRAY',
-                        'items': {
-                            'type': 'OBJECT',
-                            'required': ['id', 'type', 'target_text', 'replacement_text', 'description', 'keywords_used'],
-                            'properties': {
-                                'id': {
-                                    'type': 'STRING',
-                                },
-                                'type': {
-                                    'type': 'STRING',
-                                    'enum': ['replace', 'insert_after']
-                                },
-                                'target_text': {
-                                    'type': 'STRING',
-                                },
-                                'replacement_text': {
-                                    'type': 'STRING',
-                                },
-                                'description': {
-                                    'type': 'STRING',
-                                },
-                                'keywords_used': {
-                                    'type': 'ARRAY',
-                                    'items': {
-                                        'type': 'STRING'
-                                    }
-                                }
-                            },
-                        }
-                    },
-                    seed=42,
-                ),
-            )
-            
-            # Parse JSON response directly
-            suggestions = json.loads(response.text)
-            print(f"[DEBUG AI] Generated {len(suggestions)} suggestions for resume")
-            
-            # Validate and filter suggestions
-            valid_suggestions = []
-            for i, suggestion in enumerate(suggestions):
-                print(f"[DEBUG AI] Resume Suggestion {i+1}: ID={suggestion.get('id')}, Type={suggestion.get('type')}, Keywords={suggestion.get('keywords_used')}")
-                print(f"[DEBUG AI]   Target: {suggestion.get('target_text')[:50]}...")
-                print(f"[DEBUG AI]   Replace: {suggestion.get('replacement_text')[:50]}...")
-                print(f"[DEBUG AI]   Description: {suggestion.get('description')}")
-                
-                # Validate LaTeX formatting
-                if self.validate_latex_suggestion(suggestion):
-                    valid_suggestions.append(suggestion)
-                    print(f"[DEBUG AI]   ✓ LaTeX validation passed")
-                else:
-                    print(f"[DEBUG AI]   ✗ LaTeX validation failed - suggestion skipped")
-            
-            print(f"[DEBUG AI] {len(valid_suggestions)} valid suggestions after LaTeX validation")
-            return {"suggestions": valid_suggestions}
-
-        except Exception as e:
-            print(f"Error generating resume suggestions: {e}")
-            return {"suggestions": []}
+        return self._suggestions_request(prompt, 'You are an expert resume writer and ATS optimization specialist.')
 
     def generate_cover_letter_suggestions(self, 
                                         cover_letter_content: str, 
@@ -315,12 +422,25 @@ class AIAnalyzer:
         Returns:
             Dict containing cover letter improvement suggestions
         """
-    
+        document = self._prompt_document(cover_letter_content, job_keywords)
+        try:
+            response = self._generate_content(self._cover_letter_suggestions_request(document, job_keywords),
+                                              'generate_cover_letter_suggestions')
+            return self._suggestions_from_response(response, 'cover letter', document)
+
+        except Exception as e:
+            logger.warning("Error generating cover letter suggestions: %s", e)
+            return {"suggestions": []}
+
+    def _cover_letter_suggestions_request(self,
+                                          document: PromptDocument,
+                                          job_keywords: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Build the generate_content arguments for cover letter suggestions."""
         prompt = f"""
         Analyze this LaTeX cover letter and provide specific suggestions to better align it with the job requirements.
 
-        CURRENT COVER LETTER (LaTeX format):
-        {cover_letter_content}
+        CURRENT COVER LETTER (LaTeX format, document body only):
+        {document.text}
 
         JOB REQUIREMENTS KEYWORDS:
         {job_keywords}
@@ -368,76 +488,153 @@ class AIAnalyzer:
         Generate 1-2 suggestions per keyword maximum. Focus on quality over quantity.
         """
     
-        try:
-            response = self.client.models.generate_content(
-                model=self.suggestions_model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction='You are an expert cover letter writer and ATS optimization specialist.',
-                    temperature=0.1,
-                    response_mime_type='application/json',
-                    response_schema={
-                        'type': 'ARRAY',
-                        'items': {
-                            'type': 'OBJECT',
-                            'required': ['id', 'type', 'target_text', 'replacement_text', 'description', 'keywords_used'],
-                            'properties': {
-                                'id': {
-                                    'type': 'STRING',
-                                },
-                                'type': {
-                                    'type': 'STRING',
-                                    'enum': ['replace', 'insert_after']
-                                },
-                                'target_text': {
-                                    'type': 'STRING',
-                                },
-                                'replacement_text': {
-                                    'type': 'STRING',
-                                },
-                                'description': {
-                                    'type': 'STRING',
-                                },
-                                'keywords_used': {
-                                    'type': 'ARRAY',
-                                    'items': {
-                                        'type': 'STRING'
-                                    }
-                                }
-                            },
-                        }
-                    },
-                    seed=42,
-                ),
-            )
-            
-            # Parse JSON response directly
-            suggestions = json.loads(response.text)
-            print(f"[DEBUG AI] Generated {len(suggestions)} suggestions for cover letter")
-            
-            # Validate and filter suggestions
-            valid_suggestions = []
-            for i, suggestion in enumerate(suggestions):
-                print(f"[DEBUG AI] Cover Letter Suggestion {i+1}: ID={suggestion.get('id')}, Type={suggestion.get('type')}, Keywords={suggestion.get('keywords_used')}")
-                print(f"[DEBUG AI]   Target: {suggestion.get('target_text')[:50]}...")
-                print(f"[DEBUG AI]   Replace: {suggestion.get('replacement_text')[:50]}...")
-                print(f"[DEBUG AI]   Description: {suggestion.get('description')}")
-                
-                # Validate LaTeX formatting
-                if self.validate_latex_suggestion(suggestion):
-                    valid_suggestions.append(suggestion)
-                    print(f"[DEBUG AI]   ✓ LaTeX validation passed")
-                else:
-                    print(f"[DEBUG AI]   ✗ LaTeX validation failed - suggestion skipped")
-            
-            print(f"[DEBUG AI] {len(valid_suggestions)} valid suggestions after LaTeX validation")
-            return {"suggestions": valid_suggestions}
+        return self._suggestions_request(prompt, 'You are an expert cover letter writer and ATS optimization specialist.')
+
+    def _prompt_document(self, content: str, job_keywords: Dict[str, List[str]]) -> PromptDocument:
+        """Trim a document down to what the suggestions prompt needs."""
+        if not self.trim_prompts:
+            return PromptDocument(content, content, [], [])
+        return trim_latex_document(content, job_keywords)
+
+    @staticmethod
+    def _prompt_stats(document: PromptDocument, response) -> Dict[str, Any]:
+        """Prompt size before and after trimming, plus the token count Gemini reports."""
+        usage = getattr(response, 'usage_metadata', None)
+        return {**document.stats(), 'prompt_tokens': getattr(usage, 'prompt_token_count', None)}
+
+    def _suggestions_request(self, prompt: str, system_instruction: str) -> Dict[str, Any]:
+        """Build the generate_content arguments for a suggestions prompt."""
+        return {
+            'model': self.suggestions_model,
+            'contents': prompt,
+            'config': types.GenerateContentConfig(
+                system_instruction=system_instruction,
+                temperature=0.1,
+                response_mime_type='application/json',
+                response_schema=SUGGESTIONS_SCHEMA,
+                seed=42,
+            ),
+        }
 
-        except Exception as e:
-            print(f"Error generating cover letter suggestions: {e}")
-            return {"suggestions": []}
+    def _suggestions_from_response(self, response, document_label: str, document: PromptDocument) -> Dict[str, Any]:
+        """Parse suggestions from a response and keep the ones that pass LaTeX validation."""
+        # Parse JSON response directly
+        suggestions = json.loads(response.text)
+        logger.debug("Generated %d suggestions for %s", len(suggestions), document_label)
+        
+        # Validate and filter suggestions
+        findings = validate_suggestions(suggestions, warnings=logger.isEnabledFor(logging.DEBUG))
+        valid_suggestions = [suggestion for i, suggestion in enumerate(suggestions)
+                             if self._check_suggestion(suggestion, i, document_label, document, findings[i])]
+        
+        logger.debug("%d valid suggestions after LaTeX validation", len(valid_suggestions))
+        return {"suggestions": valid_suggestions, "prompt_stats": self._prompt_stats(document, response)}
+
+    def _check_suggestion(self,
+                          suggestion: Dict[str, Any],
+                          index: int,
+                          document_label: str,
+                          document: PromptDocument,
+                          findings: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Log one suggestion and return whether it passes LaTeX validation and maps onto the document."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s suggestion %d: id=%s type=%s keywords=%s target=%.50r replacement=%.50r",
+                         document_label.title(), index + 1, suggestion.get('id'), suggestion.get('type'),
+                         suggestion.get('keywords_used'), str(suggestion.get('target_text')),
+                         str(suggestion.get('replacement_text')))
+        
+        # Validate LaTeX formatting
+        if not self.validate_latex_suggestion(suggestion, findings):
+            logger.debug("Suggestion %s skipped: LaTeX validation failed", suggestion.get('id'))
+            return False
 
-def create_ai_analyzer(api_key: str) -> AIAnalyzer:
+        # The prompt held a trimmed copy; point target_text at the exact text in the full document
+        target_text = document.map_target(suggestion.get('target_text', ''))
+        if target_text is None:
+            logger.debug("Suggestion %s skipped: target text not found in the document", suggestion.get('id'))
+            return False
+        suggestion['target_text'] = target_text
+        return True
+
+    def stream_resume_suggestions(self,
+                                  resume_content: str,
+                                  job_keywords: Dict[str, List[str]],
+                                  prompt_stats: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[Dict[str, Any], bool]]:
+        """
+        Stream resume suggestions as the model generates them.
+        
+        Args:
+            resume_content (str): Current resume content in LaTeX format
+            job_keywords (Dict): Keywords extracted from job posting
+            prompt_stats (Dict): If given, filled with prompt size stats once the stream ends
+            
+        Yields:
+            (suggestion, passed validation) as soon as each suggestion's JSON object closes
+        """
+        document = self._prompt_document(resume_content, job_keywords)
+        return self._stream_suggestions(self._resume_suggestions_request(document, job_keywords),
+                                        'resume', document, prompt_stats)
+
+    def stream_cover_letter_suggestions(self,
+                                        cover_letter_content: str,
+                                        job_keywords: Dict[str, List[str]],
+                                        prompt_stats: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[Dict[str, Any], bool]]:
+        """Stream cover letter suggestions as the model generates them (see stream_resume_suggestions)."""
+        document = self._prompt_document(cover_letter_content, job_keywords)
+        return self._stream_suggestions(self._cover_letter_suggestions_request(document, job_keywords),
+                                        'cover letter', document, prompt_stats)
+
+    def _stream_suggestions(self,
+                            request: Dict[str, Any],
+                            document_label: str,
+                            document: PromptDocument,
+                            prompt_stats: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[Dict[str, Any], bool]]:
+        """Run a suggestions request with generate_content_stream and validate each object as it completes."""
+        parser = JSONArrayStreamParser()
+        index = 0
+        chunk = None
+        method = f"stream_{document_label.replace(' ', '_')}_suggestions"
+        start_time = time.perf_counter()
+        try:
+            for chunk in self.client.models.generate_content_stream(**request):
+                for suggestion in parser.feed(chunk.text or ''):
+                    if not isinstance(suggestion, dict):
+                        continue
+                    yield suggestion, self._check_suggestion(suggestion, index, document_label, document)
+                    index += 1
+        except Exception:
+            record_model_call(method, request['model'], time.perf_counter() - start_time, error=True)
+            raise
+        # Includes the time the consumer spent between chunks, as the client sees it
+        record_model_call(method, request['model'], time.perf_counter() - start_time, chunk)
+        if parser.errors:
+            logger.warning("%d streamed %s suggestions could not be parsed", parser.errors, document_label)
+        if prompt_stats is not None:
+            # Usage metadata arrives with the last chunk
+            prompt_stats.update(self._prompt_stats(document, chunk))
+
+def create_model_client(api_key: str, backend: str = 'gemini') -> Any:
+    """
+    Create the model client for a backend.
+    
+    Args:
+        api_key (str): Gemini API key (ignored by the fake backend)
+        backend (str): 'gemini' for google-genai, 'fake' for the offline FakeGeminiClient
+    """
+    if backend == 'fake':
+        return FakeGeminiClient.from_env()
+    if backend != 'gemini':
+        raise ValueError(f"Unknown AI backend {backend!r} (expected 'gemini' or 'fake')")
+    return genai.Client(api_key=api_key)
+
+def create_ai_analyzer(api_key: str,
+                       keyword_cache: Optional[KeywordCache] = None,
+                       trim_prompts: bool = True,
+                       keyword_timeout: Optional[float] = None,
+                       suggestion_cache: Optional[SuggestionCache] = None,
+                       backend: str = 'gemini') -> AIAnalyzer:
     """Factory function to create an AI analyzer instance."""
-    return AIAnalyzer(api_key)
+    return AIAnalyzer(api_key, keyword_cache=keyword_cache, trim_prompts=trim_prompts,
+                      keyword_timeout=keyword_timeout, suggestion_cache=suggestion_cache,
+                      client=create_model_client(api_key, backend))
 
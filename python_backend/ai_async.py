@@ -0,0 +1,222 @@
+"""
+Asyncio variant of the AI analyzer.
+
+The Flask routes call generate_content synchronously, so every in-flight
+Gemini request pins a worker thread for the whole multi-second model latency.
+AsyncAIAnalyzer issues the same prompts through the SDK's async client
+(client.aio), letting one event loop (see asgi.py) keep hundreds of requests
+in flight. An AIConcurrencyLimiter caps in-flight Gemini calls globally and
+per API key, so one key cannot use up the whole budget.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ai import AIAnalyzer, create_model_client
+from analyzer_pool import hash_api_key
+from keyword_cache import KeywordCache
+from metrics import record_model_call
+from suggestion_cache import SuggestionCache
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class AIBusyError(Exception):
+    """Raised when a Gemini call cannot get a concurrency slot in time."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AIConcurrencyLimiter:
+    def __init__(self, max_in_flight: int = 64, max_in_flight_per_key: int = 8, wait_timeout: float = 30):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_in_flight (int): Gemini calls allowed in flight across all keys
+            max_in_flight_per_key (int): Gemini calls allowed in flight for one API key
+            wait_timeout (float): Seconds a call may wait for a slot before AIBusyError
+        """
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_key = max_in_flight_per_key
+        self.wait_timeout = wait_timeout
+
+        self._global = asyncio.Semaphore(max_in_flight)
+        self._per_key = {}  # key hash -> [semaphore, holders + waiters]
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self, key_hash: str) -> AsyncIterator[None]:
+        """
+        Hold one per-key and one global slot for the duration of a Gemini call.
+
+        Args:
+            key_hash (str): Hash of the API key making the call
+
+        Raises:
+            AIBusyError: If no slot frees up within wait_timeout
+        """
+        entry = self._per_key.get(key_hash)
+        if entry is None:
+            entry = self._per_key[key_hash] = [asyncio.Semaphore(self.max_in_flight_per_key), 0]
+        entry[1] += 1
+        self.waiting += 1
+        acquired = []
+        try:
+            async def acquire_all():
+                # Per-key first, so a busy key queues on its own semaphore instead of holding global slots
+                for semaphore in (entry[0], self._global):
+                    await semaphore.acquire()
+                    acquired.append(semaphore)
+
+            try:
+                await asyncio.wait_for(acquire_all(), self.wait_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise AIBusyError('Too many AI requests in flight', max(1, int(self.wait_timeout))) from None
+            finally:
+                self.waiting -= 1
+
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self._per_key[key_hash]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return in-flight, waiting and rejection counters."""
+        return {
+            'max_in_flight': self.max_in_flight,
+            'max_in_flight_per_key': self.max_in_flight_per_key,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'waiting': self.waiting,
+            'active_keys': len(self._per_key),
+            'completed': self.completed,
+            'rejected': self.rejected,
+        }
+
+
+class AsyncAIAnalyzer(AIAnalyzer):
+    def __init__(self,
+                 api_key: str,
+                 keyword_cache: Optional[KeywordCache] = None,
+                 limiter: Optional[AIConcurrencyLimiter] = None,
+                 trim_prompts: bool = True,
+                 keyword_timeout: Optional[float] = None,
+                 suggestion_cache: Optional[SuggestionCache] = None,
+                 client: Any = None):
+        """Initialize the async analyzer; prompts, caching and validation are shared with AIAnalyzer."""
+        super().__init__(api_key, keyword_cache=keyword_cache, trim_prompts=trim_prompts,
+                         keyword_timeout=keyword_timeout, suggestion_cache=suggestion_cache, client=client)
+        self.limiter = limiter
+        self.key_hash = hash_api_key(api_key)
+
+    async def _generate(self, request: Dict[str, Any], method: str):
+        """Run one generate_content call on the async client, within the concurrency caps."""
+        if self.limiter is None:
+            return await self._generate_content_async(request, method)
+        async with self.limiter.slot(self.key_hash):
+            return await self._generate_content_async(request, method)
+
+    async def _generate_content_async(self, request: Dict[str, Any], method: str):
+        """Async version of AIAnalyzer._generate_content (time waiting for a slot is not counted)."""
+        start_time = time.perf_counter()
+        try:
+            with span('gemini', method=method, model=request['model']):
+                response = await self.client.aio.models.generate_content(**request)
+        except Exception:
+            record_model_call(method, request['model'], time.perf_counter() - start_time, error=True)
+            raise
+        record_model_call(method, request['model'], time.perf_counter() - start_time, response)
+        return response
+
+    async def extract_job_keywords(self, job_posting: str) -> Dict[str, List[str]]:
+        """Async version of AIAnalyzer.extract_job_keywords. AIBusyError is raised, not swallowed."""
+        cached_keywords = self._cached_keywords(job_posting)
+        if cached_keywords is not None:
+            return cached_keywords
+
+        try:
+            response = await self._generate(self._keyword_request(job_posting), 'extract_job_keywords')
+            return self._keywords_from_response(job_posting, response)
+        except AIBusyError:
+            raise
+        except Exception as e:
+            logger.warning("Error extracting keywords: %s", e)
+            return self._fallback_keywords(job_posting)
+
+    async def generate_resume_suggestions(self,
+                                          resume_content: str,
+                                          job_keywords: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Async version of AIAnalyzer.generate_resume_suggestions (per-keyword calls run concurrently)."""
+        if self.suggestion_cache is None:
+            return await self._generate_resume_suggestions_once(resume_content, job_keywords)
+
+        keywords = self._keyword_names(job_keywords)
+        results, missing = self._cached_keyword_suggestions(resume_content, keywords)
+        generated = await asyncio.gather(
+            *[self._generate_resume_suggestions_once(resume_content, [keyword]) for keyword in missing])
+        for keyword, result in zip(missing, generated):
+            results[keyword] = self._store_keyword_suggestions(resume_content, keyword, result)
+        return self._merge_keyword_suggestions(resume_content, keywords, results, len(missing))
+
+    async def _generate_resume_suggestions_once(self,
+                                                resume_content: str,
+                                                job_keywords: Dict[str, List[str]]) -> Dict[str, Any]:
+        document = self._prompt_document(resume_content, job_keywords)
+        try:
+            response = await self._generate(self._resume_suggestions_request(document, job_keywords),
+                                            'generate_resume_suggestions')
+            return self._suggestions_from_response(response, 'resume', document)
+        except AIBusyError:
+            raise
+        except Exception as e:
+            logger.warning("Error generating resume suggestions: %s", e)
+            return {"suggestions": [], "error": str(e)}
+
+    async def generate_cover_letter_suggestions(self,
+                                                cover_letter_content: str,
+                                                job_keywords: Dict[str, List[str]],
+                                                job_posting: str = "") -> Dict[str, Any]:
+        """Async version of AIAnalyzer.generate_cover_letter_suggestions."""
+        document = self._prompt_document(cover_letter_content, job_keywords)
+        try:
+            response = await self._generate(self._cover_letter_suggestions_request(document, job_keywords),
+                                            'generate_cover_letter_suggestions')
+            return self._suggestions_from_response(response, 'cover letter', document)
+        except AIBusyError:
+            raise
+        except Exception as e:
+            logger.warning("Error generating cover letter suggestions: %s", e)
+            return {"suggestions": []}
+
+
+def create_async_ai_analyzer(api_key: str,
+                             keyword_cache: Optional[KeywordCache] = None,
+                             limiter: Optional[AIConcurrencyLimiter] = None,
+                             keyword_timeout: Optional[float] = None,
+                             suggestion_cache: Optional[SuggestionCache] = None,
+                             backend: str = 'gemini') -> AsyncAIAnalyzer:
+    """Factory function to create an async AI analyzer instance."""
+    return AsyncAIAnalyzer(api_key, keyword_cache=keyword_cache, limiter=limiter, keyword_timeout=keyword_timeout,
+                           suggestion_cache=suggestion_cache, client=create_model_client(api_key, backend))
@@ -10,6 +10,9 @@ import os
 import json
 from ai import create_ai_analyzer
 
+# 'fake' runs this script offline against fake_gemini.FakeGeminiClient
+AI_BACKEND = os.getenv('AI_BACKEND', 'gemini')
+
 # =============================================================================
 # PASTE YOUR LATEX CONTENT HERE
 # =============================================================================
@@ -121,12 +124,12 @@ def test_keyword_extraction():
     try:
         # Get API key from environment
         api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key or api_key == 'your-api-key-here':
-            print("❌ ERROR: Please set GEMINI_API_KEY environment variable")
+        if AI_BACKEND != 'fake' and (not api_key or api_key == 'your-api-key-here'):
+            print("❌ ERROR: Please set GEMINI_API_KEY environment variable (or AI_BACKEND=fake)")
             return None
         
         # Create AI analyzer
-        analyzer = create_ai_analyzer(api_key)
+        analyzer = create_ai_analyzer(api_key or '', backend=AI_BACKEND)
         
         # Extract keywords
         print("Extracting keywords from job posting...")
@@ -149,12 +152,12 @@ def test_resume_suggestions(keywords):
     try:
         # Get API key from environment
         api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key or api_key == 'your-api-key-here':
-            print("❌ ERROR: Please set GEMINI_API_KEY environment variable")
+        if AI_BACKEND != 'fake' and (not api_key or api_key == 'your-api-key-here'):
+            print("❌ ERROR: Please set GEMINI_API_KEY environment variable (or AI_BACKEND=fake)")
             return
         
         # Create AI analyzer
-        analyzer = create_ai_analyzer(api_key)
+        analyzer = create_ai_analyzer(api_key or '', backend=AI_BACKEND)
         
         # Add line numbers to the content
         numbered_content = add_line_numbers_to_content(TEST_LATEX_CONTENT)
@@ -200,12 +203,12 @@ John Doe
     try:
         # Get API key from environment
         api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key or api_key == 'your-api-key-here':
-            print("❌ ERROR: Please set GEMINI_API_KEY environment variable")
+        if AI_BACKEND != 'fake' and (not api_key or api_key == 'your-api-key-here'):
+            print("❌ ERROR: Please set GEMINI_API_KEY environment variable (or AI_BACKEND=fake)")
             return
         
         # Create AI analyzer
-        analyzer = create_ai_analyzer(api_key)
+        analyzer = create_ai_analyzer(api_key or '', backend=AI_BACKEND)
         
         # Add line numbers to the content
         numbered_content = add_line_numbers_to_content(cover_letter_content)
@@ -229,16 +232,20 @@ def main():
     
     # Check if API key is set
     api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key or api_key == 'your-api-key-here':
+    if AI_BACKEND != 'fake' and (not api_key or api_key == 'your-api-key-here'):
         print("❌ ERROR: GEMINI_API_KEY environment variable not set!")
         print("\nTo fix this:")
         print("1. Get your API key from Google AI Studio")
         print("2. Set it as an environment variable:")
         print("   export GEMINI_API_KEY='your-actual-api-key-here'")
         print("3. Run this script again")
+        print("\nOr run offline against the fake backend: AI_BACKEND=fake python ai_test.py")
         return
     
-    print(f"✅ API Key loaded: {api_key[:10]}...")
+    if AI_BACKEND == 'fake':
+        print("✅ Using the offline fake Gemini backend")
+    else:
+        print(f"✅ API Key loaded: {api_key[:10]}...")
     print(f"📝 LaTeX content length: {len(TEST_LATEX_CONTENT)} characters")
     print(f"📋 Job posting length: {len(SAMPLE_JOB_POSTING)} characters")
     
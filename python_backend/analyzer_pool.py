@@ -0,0 +1,110 @@
+"""
+Pool of AIAnalyzer instances, one per API key.
+
+Building an AIAnalyzer creates a genai.Client with its own HTTP session, so
+doing it per request pays for client setup and a fresh TLS handshake every
+time. The pool keeps a bounded LRU of analyzers keyed by a hash of the API
+key (the raw key is never stored as a dict key or reported), reuses their
+connections across requests and drops analyzers that sit idle.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def hash_api_key(api_key: str) -> str:
+    """Return the pool key for an API key."""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+class AnalyzerPool:
+    def __init__(self, factory: Callable[[str], Any], max_entries: int = 32, idle_ttl: float = 15 * 60):
+        """
+        Initialize the analyzer pool.
+
+        Args:
+            factory: Function building an analyzer for an API key (e.g. create_ai_analyzer)
+            max_entries (int): Maximum number of analyzers kept
+            idle_ttl (float): Seconds after which an unused analyzer is dropped
+        """
+        self.factory = factory
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+
+        self._lock = threading.Lock()
+        self._analyzers = OrderedDict()  # key hash -> (last_used, analyzer), least recent first
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, api_key: str) -> Any:
+        """
+        Return the analyzer for an API key, creating it on first use.
+
+        Args:
+            api_key (str): Gemini API key
+
+        Returns:
+            The pooled analyzer
+        """
+        key = hash_api_key(api_key)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._analyzers.get(key)
+            if entry is not None:
+                self._analyzers[key] = (now, entry[1])
+                self._analyzers.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            # Client construction does no network I/O, so it is cheap enough to do under the lock
+            analyzer = self.factory(api_key)
+            self._analyzers[key] = (now, analyzer)
+            self.misses += 1
+            while len(self._analyzers) > self.max_entries:
+                _, (_, evicted) = self._analyzers.popitem(last=False)
+                self.evictions += 1
+                self._close(evicted)
+            return analyzer
+
+    def _expire(self, now: float):
+        """Drop analyzers idle for longer than the TTL. Caller holds the lock."""
+        while self._analyzers:
+            key, (last_used, analyzer) = next(iter(self._analyzers.items()))
+            if now - last_used <= self.idle_ttl:
+                break
+            del self._analyzers[key]
+            self.expirations += 1
+            self._close(analyzer)
+
+    @staticmethod
+    def _close(analyzer: Any):
+        """Release the analyzer's HTTP session if the SDK supports it."""
+        close = getattr(getattr(analyzer, 'client', None), 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning("Failed to close AI client: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and hit, miss and eviction counters."""
+        with self._lock:
+            return {
+                'analyzers': len(self._analyzers),
+                'max_entries': self.max_entries,
+                'idle_ttl': self.idle_ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -1,28 +1,215 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, g, request, jsonify, send_file, url_for
 from flask_cors import CORS
 import subprocess
 import tempfile
 import os
 import base64
+import io
 import json
+import logging
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 
 # Import our AI analyzer
 from ai import create_ai_analyzer
+from pdf_cache import PDFCache, make_cache_key
+from preamble_cache import PreambleFormatCache, split_preamble
+from workspace_pool import WorkspacePool
+from scratch_pool import ScratchPool
+from process_limits import RLIMITS_SUPPORTED, LimitedRunTimeout, ProcessLimits, run_limited
+from tex_cache import SharedTexCache
+from compile_jobs import CompileJobManager
+from compile_verify import SuggestionVerifier
+from compile_scheduler import CompileScheduler, SchedulerFullError
+from tex_log import parse_tex_log
+from keyword_cache import KeywordCache
+from metrics import COMPILE_PASSES, COMPILE_STAGE_SECONDS, COMPILES_TOTAL, REGISTRY, record_compile_usage
+from analyzer_pool import AnalyzerPool
+from skill_extractor import extract_skill_keywords
+from suggestion_apply import apply_suggestions
+from suggestion_cache import SuggestionCache
+from tracing import (RequestTrace, TraceBuffer, configure_logging, end_request, new_request_id, record_span,
+                     span, start_request)
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+CORS(app, expose_headers=['X-Compile-Duration-Ms', 'X-Compile-Cache', 'X-Compile-Mode',
+                          'X-Compile-Queue-Wait-Ms', 'X-Compile-Time-Saved-Ms', 'X-Compile-Warnings',
+                          'X-Compile-Cpu-Ms', 'X-Compile-Max-Rss-Kb', 'Retry-After', 'X-Request-Id'])  # Enable CORS for all routes
 
 # Configure Gemini AI
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', 'your-api-key-here')
-ai_analyzer = None
 
-def get_ai_analyzer():
-    """Get or create AI analyzer instance"""
-    global ai_analyzer
-    if ai_analyzer is None:
-        ai_analyzer = create_ai_analyzer(GEMINI_API_KEY)
-    return ai_analyzer
+# Extracted keywords by normalized job posting + model (memory LRU + SQLite), shared by all analyzers
+keyword_cache = KeywordCache(
+    db_path=os.getenv('KEYWORD_CACHE_DB', os.path.join(tempfile.gettempdir(), 'latex_resume_keywords.sqlite3')),
+    max_entries=int(os.getenv('KEYWORD_CACHE_MAX', '1024')),
+    ttl=float(os.getenv('KEYWORD_CACHE_TTL', str(7 * 24 * 3600))),
+)
+
+# Resume suggestions per (document, keyword), so changing the keyword selection only pays for new keywords
+suggestion_cache = SuggestionCache(
+    max_entries=int(os.getenv('SUGGESTION_CACHE_MAX', '512')),
+    ttl=float(os.getenv('SUGGESTION_CACHE_TTL', '3600')),
+)
+
+# Seconds Gemini gets to extract keywords before the local skills dictionary answers instead
+KEYWORD_LLM_TIMEOUT = float(os.getenv('KEYWORD_LLM_TIMEOUT', '10'))
+
+# Model backend: 'gemini', or 'fake' for the offline stand-in (load tests, CI; see fake_gemini.py)
+AI_BACKEND = os.getenv('AI_BACKEND', 'gemini')
+
+# One AI analyzer (and genai.Client connection pool) per API key, reused across requests
+analyzer_pool = AnalyzerPool(
+    lambda api_key: create_ai_analyzer(api_key, keyword_cache=keyword_cache, keyword_timeout=KEYWORD_LLM_TIMEOUT,
+                                       suggestion_cache=suggestion_cache, backend=AI_BACKEND),
+    max_entries=int(os.getenv('AI_CLIENT_POOL_MAX', '32')),
+    idle_ttl=float(os.getenv('AI_CLIENT_IDLE_TTL', '900')),
+)
+
+def get_ai_analyzer(api_key=None):
+    """Get the pooled AI analyzer for an API key, falling back to GEMINI_API_KEY"""
+    return analyzer_pool.get(api_key or GEMINI_API_KEY or '')
+
+# Compiled PDF cache (memory LRU + disk tier), keyed by source, engine and .latexmkrc
+LATEX_ENGINE = 'pdflatex'
+LATEXMKRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.latexmkrc')
+LATEXMKRC_EXISTS = os.path.exists(LATEXMKRC_PATH)
+pdf_cache = PDFCache(
+    max_memory_bytes=int(os.getenv('PDF_CACHE_MEMORY_MB', '64')) * 1024 * 1024,
+    disk_dir=os.getenv('PDF_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'latex_resume_pdf_cache')),
+    max_disk_bytes=int(os.getenv('PDF_CACHE_DISK_MB', '512')) * 1024 * 1024,
+)
+
+# rlimits for every TeX process tree, which runs in its own process group that is killed as a whole on timeout.
+# Only Linux can set them on a running process.
+compile_limits = None
+if os.getenv('COMPILE_LIMITS', '1') != '0' and not RLIMITS_SUPPORTED:
+    logger.info("Resource limits for TeX runs are not supported on this platform; running without them")
+elif os.getenv('COMPILE_LIMITS', '1') != '0':
+    compile_limits = ProcessLimits(
+        cpu_seconds=int(os.getenv('COMPILE_CPU_SECONDS', '30')),
+        memory_bytes=int(os.getenv('COMPILE_MEMORY_MB', '2048')) * 1024 * 1024,
+        file_size_bytes=int(os.getenv('COMPILE_FILE_SIZE_MB', '64')) * 1024 * 1024,
+        max_processes=int(os.getenv('COMPILE_MAX_PROCESSES', '512')),
+    )
+
+# Precompiled preamble formats (.fmt), so repeat compiles only typeset the document body
+PDFLATEX_FLAGS = '-interaction=nonstopmode -halt-on-error -file-line-error -shell-escape'
+preamble_cache = None
+if os.getenv('PREAMBLE_FORMAT_CACHE', '1') != '0':
+    preamble_cache = PreambleFormatCache(
+        cache_dir=os.getenv('PREAMBLE_FORMAT_DIR', os.path.join(tempfile.gettempdir(), 'latex_resume_formats')),
+        max_formats=int(os.getenv('PREAMBLE_FORMAT_MAX', '16')),
+        engine=LATEX_ENGINE,
+        limits=compile_limits,
+        failure_backoff=float(os.getenv('PREAMBLE_FORMAT_RETRY_AFTER', '600')),
+    )
+
+# Generated fonts and luaotfload caches, warmed at startup and grown with the fonts compiles generate
+tex_cache = None
+if os.getenv('TEX_CACHE', '1') != '0':
+    tex_cache = SharedTexCache(
+        cache_dir=os.getenv('TEX_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'latex_resume_texmf_var')),
+        limits=compile_limits,
+    )
+    if os.getenv('TEX_CACHE_WARM', '1') != '0':
+        tex_cache.warm_in_background(os.getenv('TEX_CACHE_WARM_ENGINES', LATEX_ENGINE).split(','))
+
+# Persistent per-document workspaces, so latexmk can reuse .aux/.fdb_latexmk between compiles
+workspace_pool = None
+if os.getenv('COMPILE_WORKSPACES', '1') != '0':
+    workspace_pool = WorkspacePool(
+        root_dir=os.getenv('COMPILE_WORKSPACE_DIR', os.path.join(tempfile.gettempdir(), 'latex_resume_workspaces')),
+        max_workspaces=int(os.getenv('COMPILE_WORKSPACE_MAX', '32')),
+        max_disk_bytes=int(os.getenv('COMPILE_WORKSPACE_DISK_MB', '256')) * 1024 * 1024,
+        idle_ttl=float(os.getenv('COMPILE_WORKSPACE_TTL', '1800')),
+    )
+
+# Bounds how many latexmk process trees run at once, with a fair, bounded queue in front
+COMPILE_WORKERS = int(os.getenv('COMPILE_WORKERS', str(os.cpu_count() or 2)))
+compile_scheduler = CompileScheduler(
+    max_workers=COMPILE_WORKERS,
+    max_queue=int(os.getenv('COMPILE_QUEUE_MAX', '32')),
+    max_per_client=int(os.getenv('COMPILE_QUEUE_PER_CLIENT', '8')),
+)
+
+# Ready, RAM-backed (/dev/shm) directories for compiles without a workspace, emptied off the request path
+scratch_pool = ScratchPool(
+    root_dir=os.getenv('COMPILE_SCRATCH_DIR') or None,
+    size=int(os.getenv('COMPILE_SCRATCH_POOL', str(COMPILE_WORKERS))),
+    budget_bytes=int(os.getenv('COMPILE_SCRATCH_BUDGET_MB', '64')) * 1024 * 1024,
+)
+
+# Optional draft-mode compile check of AI suggestions ("verify_compile" in the suggestion requests),
+# run on the compile scheduler's workers so it shares their bound
+suggestion_verifier = SuggestionVerifier(
+    max_workers=int(os.getenv('SUGGESTION_VERIFY_WORKERS', str(min(4, os.cpu_count() or 2)))),
+    budget=float(os.getenv('SUGGESTION_VERIFY_BUDGET', '8')),
+    engine=LATEX_ENGINE,
+    preamble_cache=preamble_cache,
+    scratch_pool=scratch_pool,
+    limits=compile_limits,
+    scheduler=compile_scheduler,
+)
+VERIFY_MODES = (None, 'drop', 'flag')
+
+# latexmk announces every engine run it makes
+LATEXMK_PASS_RE = re.compile(r"Run number \d+ of rule '(?:pdf)?latex'")
+
+# Recent final (latexmk) compile times, the baseline for reporting what previews save
+full_compile_durations = deque(maxlen=50)
+PREVIEW_PNG_DPI = int(os.getenv('PREVIEW_PNG_DPI', '50'))
+
+# Background compiles for POST /compile-jobs; finished PDFs are kept for COMPILE_JOB_TTL seconds,
+# or until COMPILE_JOB_MAX newer jobs push them out
+compile_jobs = CompileJobManager(
+    max_workers=int(os.getenv('COMPILE_JOB_WORKERS', str(os.cpu_count() or 2))),
+    ttl=float(os.getenv('COMPILE_JOB_TTL', '600')),
+    max_pending=int(os.getenv('COMPILE_JOB_QUEUE_MAX', '32')),
+    max_jobs=int(os.getenv('COMPILE_JOB_MAX', '128')),
+)
+
+# Sampled request traces (spans per stage) for GET /traces; X-Trace: 1 traces a request regardless
+trace_buffer = TraceBuffer(
+    max_traces=int(os.getenv('TRACE_BUFFER_SIZE', '200')),
+    sample_rate=float(os.getenv('TRACE_SAMPLE_RATE', '0.01')),
+)
+
+@app.before_request
+def begin_request():
+    """Assign the request id and, if sampled, start a trace"""
+    g.request_id = new_request_id(request.headers.get('X-Request-Id'))
+    g.trace = None
+    if trace_buffer.should_sample(request.headers.get('X-Trace') == '1'):
+        g.trace = RequestTrace(g.request_id, request.method, request.path)
+    g.request_tokens = start_request(g.request_id, g.trace)
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def finish_request(response):
+    """Tag the response with its request id and keep the finished trace"""
+    response.headers['X-Request-Id'] = g.request_id
+    if g.trace is not None:
+        g.trace.finish(response.status_code)
+        trace_buffer.add(g.trace)
+    logger.debug("%s %s -> %d in %.1f ms", request.method, request.path, response.status_code,
+                 (time.perf_counter() - g.request_start) * 1000)
+    return response
+
+@app.teardown_request
+def clear_request(error=None):
+    tokens = g.pop('request_tokens', None)
+    if tokens is not None:
+        try:
+            end_request(tokens)
+        except ValueError:
+            pass  # torn down from a different context than it started in
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -40,57 +227,264 @@ def convert_latex_to_pdf():
     
     Expected JSON payload:
     {
-        "latex_content": "\\documentclass{article}\\begin{document}Hello World\\end{document}"
+        "latex_content": "\\documentclass{article}\\begin{document}Hello World\\end{document}",
+        "document_id": "resume",  (optional, reuses a warm compile workspace)
+        "mode": "final",  (optional, "final" or "preview" for a single fast pdflatex pass)
+        "response_format": "pdf"  (optional, "pdf", "base64" or "png")
     }
     
     Returns:
-    - PDF file as bytes if successful
+    - application/pdf body with X-Compile-* headers if successful ("pdf", the default)
+    - JSON with pdf_base64 if successful ("base64")
+    - image/png of the first page, low resolution, if successful ("png")
     - JSON error message if failed
     """
-    print(f"[DEBUG] /convert-latex endpoint called")
-    print(f"[DEBUG] Request method: {request.method}")
-    print(f"[DEBUG] Request headers: {dict(request.headers)}")
-    
     try:
         # Get LaTeX content from request
         data = request.get_json()
-        print(f"[DEBUG] Request data received: {data is not None}")
         
         if not data or 'latex_content' not in data:
-            print(f"[DEBUG] Missing latex_content in request")
             return jsonify({'error': 'Missing latex_content in request'}), 400
         
         latex_content = data['latex_content']
-        print(f"[DEBUG] LaTeX content received, length: {len(latex_content)}")
         
         if not latex_content.strip():
-            print(f"[DEBUG] LaTeX content is empty")
             return jsonify({'error': 'LaTeX content cannot be empty'}), 400
         
-        print(f"[DEBUG] Calling convert_latex_to_pdf_bytes...")
+        document_id = data.get('document_id')
+        response_format = data.get('response_format', 'pdf')
+        if response_format not in ('pdf', 'base64', 'png'):
+            return jsonify({'error': 'response_format must be "pdf", "base64" or "png"'}), 400
+        mode = data.get('mode', 'final')
+        if mode not in ('final', 'preview'):
+            return jsonify({'error': 'mode must be "final" or "preview"'}), 400
+        
         # Convert to PDF using LuaLaTeX
-        pdf_bytes = convert_latex_to_pdf_bytes(latex_content)
+        try:
+            compile_result = compile_latex(latex_content, document_id=document_id, client_id=get_client_id(),
+                                           preview=(mode == 'preview'))
+        except SchedulerFullError as e:
+            logger.info("Compile rejected: %s", e)
+            return scheduler_full_response(e)
+        pdf_bytes = compile_result['pdf_bytes']
         
-        if pdf_bytes:
-            print(f"[DEBUG] PDF generation successful, size: {len(pdf_bytes)} bytes")
+        if pdf_bytes and response_format == 'pdf':
+            with compile_stage('serialize', format=response_format):
+                return pdf_response(compile_result)
+        elif pdf_bytes and response_format == 'png':
+            png_bytes = render_first_page_png(pdf_bytes)
+            if png_bytes is None:
+                return jsonify({'error': 'Failed to render PNG preview (is pdftoppm installed?)'}), 500
+            response = send_file(io.BytesIO(png_bytes), mimetype='image/png', download_name='page1.png')
+            return add_compile_headers(response, compile_result)
+        elif pdf_bytes:
             # Return PDF as base64 encoded string
-            pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-            print(f"[DEBUG] Base64 encoding successful, length: {len(pdf_base64)}")
-            return jsonify({
+            with compile_stage('base64', pdf_bytes=len(pdf_bytes)):
+                pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
+            response = {
                 'success': True,
                 'pdf_base64': pdf_base64,
-                'message': 'PDF generated successfully'
-            })
+                'message': 'PDF generated successfully',
+                'diagnostics': compile_result['diagnostics'] or [],
+                'resource_usage': compile_result['resource_usage'],
+            }
+            if mode == 'preview':
+                response.update({'mode': mode, 'time_saved_ms': compile_result.get('time_saved_ms')})
+            with compile_stage('serialize', format=response_format):
+                return jsonify(response)
         else:
-            print(f"[DEBUG] PDF generation failed")
-            return jsonify({'error': 'Failed to generate PDF'}), 500
+            return jsonify({
+                'error': 'Failed to generate PDF',
+                'diagnostics': compile_result['diagnostics'] or [],
+                'resource_usage': compile_result['resource_usage'],
+            }), 500
             
     except Exception as e:
-        print(f"[DEBUG] Exception in /convert-latex: {str(e)}")
-        import traceback
-        print(f"[DEBUG] Full traceback: {traceback.format_exc()}")
+        logger.exception("Exception in /convert-latex")
         return jsonify({'error': f'Error processing LaTeX: {str(e)}'}), 500
 
+def pdf_response(compile_result):
+    """
+    Send a compiled PDF as application/pdf without base64 or JSON wrapping.
+    
+    Streams straight from the disk cache file when there is one, otherwise from
+    the in-memory bytes. Compile metadata goes in X-Compile-* headers.
+    """
+    pdf_path = pdf_cache.disk_path(compile_result['cache_key'])
+    response = None
+    if pdf_path:
+        try:
+            response = send_file(pdf_path, mimetype='application/pdf', download_name='document.pdf')
+        except OSError:
+            # Evicted between lookup and open
+            response = None
+    if response is None:
+        response = send_file(io.BytesIO(compile_result['pdf_bytes']), mimetype='application/pdf',
+                             download_name='document.pdf')
+    return add_compile_headers(response, compile_result)
+
+def add_compile_headers(response, compile_result):
+    """Attach X-Compile-* metadata headers to a PDF or PNG response"""
+    response.headers['X-Compile-Duration-Ms'] = f"{compile_result['duration_ms']:.1f}"
+    response.headers['X-Compile-Cache'] = compile_result['cache_status']
+    response.headers['X-Compile-Mode'] = compile_result.get('mode', 'final')
+    response.headers['X-Compile-Queue-Wait-Ms'] = f"{compile_result.get('queue_wait_ms', 0.0):.1f}"
+    if compile_result['warnings'] is not None:
+        response.headers['X-Compile-Warnings'] = str(compile_result['warnings'])
+    if compile_result.get('resource_usage') and compile_result['resource_usage']['cpu_user_ms'] is not None:
+        usage = compile_result['resource_usage']
+        response.headers['X-Compile-Cpu-Ms'] = f"{usage['cpu_user_ms'] + usage['cpu_system_ms']:.1f}"
+        response.headers['X-Compile-Max-Rss-Kb'] = str(usage['max_rss_kb'])
+    if compile_result.get('time_saved_ms') is not None:
+        response.headers['X-Compile-Time-Saved-Ms'] = f"{compile_result['time_saved_ms']:.1f}"
+    return response
+
+def render_first_page_png(pdf_bytes, dpi=PREVIEW_PNG_DPI):
+    """Render page 1 of a PDF to PNG bytes with pdftoppm (poppler-utils), or None if unavailable"""
+    try:
+        result = subprocess.run(
+            ['pdftoppm', '-png', '-r', str(dpi), '-f', '1', '-l', '1', '-singlefile', '-'],
+            input=pdf_bytes,
+            capture_output=True,
+            timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning("PNG preview rendering failed: %s", e)
+        return None
+    if result.returncode != 0 or not result.stdout:
+        logger.warning("PNG preview rendering failed: %s", result.stderr[-500:])
+        return None
+    return result.stdout
+
+@app.route('/compile-jobs', methods=['POST'])
+def create_compile_job():
+    """
+    Start a background compile and return its job id immediately
+    
+    Expected JSON payload:
+    {
+        "latex_content": "\\documentclass{article}\\begin{document}Hello World\\end{document}",
+        "document_id": "resume",  (optional, reuses a warm compile workspace)
+        "mode": "final"  (optional, "final" or "preview")
+    }
+    
+    Returns:
+    - 202 with the job id and URLs for status, events and the PDF
+    """
+    data = request.get_json(silent=True)
+    if not data or 'latex_content' not in data:
+        return jsonify({'error': 'Missing latex_content in request'}), 400
+    
+    latex_content = data['latex_content']
+    if not latex_content.strip():
+        return jsonify({'error': 'LaTeX content cannot be empty'}), 400
+    
+    # Shed load up front rather than queueing jobs that would only fail later
+    if compile_scheduler.is_saturated():
+        return scheduler_full_response(
+            SchedulerFullError('Compile queue is full', 503, compile_scheduler.retry_after()))
+    
+    try:
+        job_id = compile_jobs.submit(compile_latex, latex_content, document_id=data.get('document_id'),
+                                     client_id=get_client_id(), preview=(data.get('mode') == 'preview'))
+    except SchedulerFullError as e:
+        return scheduler_full_response(e)
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('get_compile_job', job_id=job_id),
+        'events_url': url_for('compile_job_events', job_id=job_id),
+        'pdf_url': url_for('get_compile_job_pdf', job_id=job_id),
+        'timestamp': datetime.now().isoformat()
+    }), 202
+
+@app.route('/compile-jobs/<job_id>', methods=['GET'])
+def get_compile_job(job_id):
+    """Return the status of a compile job"""
+    job = compile_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify({'success': True, **compile_jobs.describe(job)})
+
+@app.route('/compile-jobs/<job_id>/events', methods=['GET'])
+def compile_job_events(job_id):
+    """Stream compile job progress as server-sent events, ending when the job finishes"""
+    if compile_jobs.get(job_id) is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    def stream():
+        for event in compile_jobs.events(job_id):
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            job = compile_jobs.get(job_id)
+            payload = compile_jobs.describe(job) if job else {'job_id': job_id}
+            yield f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/compile-jobs/<job_id>/pdf', methods=['GET'])
+def get_compile_job_pdf(job_id):
+    """Return the PDF of a finished compile job"""
+    job = compile_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    if job['status'] == 'failed':
+        diagnostics = (job['result'] or {}).get('diagnostics') or []
+        return jsonify({'error': job['error'], 'diagnostics': diagnostics}), 500
+    if job['status'] != 'succeeded':
+        return jsonify({'error': 'Job has not finished', 'status': job['status']}), 409
+    return pdf_response(job['result'])
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Per-stage compile and Gemini call metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/traces', methods=['GET'])
+def list_traces():
+    """
+    Recent sampled request traces, newest first
+    
+    Query parameters: limit (default 50), min_duration_ms, path
+    """
+    try:
+        limit = int(request.args.get('limit', 50))
+        min_duration_ms = float(request.args.get('min_duration_ms', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and min_duration_ms must be numbers'}), 400
+    return jsonify({
+        'traces': trace_buffer.recent(limit, min_duration_ms, request.args.get('path')),
+        'stats': trace_buffer.stats(),
+    })
+
+@app.route('/traces/<request_id>', methods=['GET'])
+def get_trace(request_id):
+    """One request's trace by request id (404 if it was not sampled or has been evicted)"""
+    trace = trace_buffer.get(request_id)
+    if trace is None:
+        return jsonify({'error': 'Trace not found'}), 404
+    return jsonify(trace)
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """Return PDF cache, preamble format, TeX cache, workspace, scratch, compile queue, keyword/suggestion cache and AI client pool counters"""
+    return jsonify({
+        'success': True,
+        'pdf_cache': pdf_cache.stats(),
+        'preamble_formats': preamble_cache.stats() if preamble_cache else None,
+        'workspaces': workspace_pool.stats() if workspace_pool else None,
+        'tex_cache': tex_cache.stats() if tex_cache else None,
+        'scratch': scratch_pool.stats(),
+        'scheduler': compile_scheduler.stats(),
+        'keyword_cache': keyword_cache.stats(),
+        'suggestion_cache': suggestion_cache.stats(),
+        'suggestion_verifier': suggestion_verifier.stats(),
+        'ai_clients': analyzer_pool.stats(),
+        'timestamp': datetime.now().isoformat()
+    })
+
 @app.route('/ai-parse', methods=['POST'])
 def ai_parse():
     """
@@ -120,7 +514,8 @@ def ai_parse():
             return jsonify({'error': 'Document content cannot be empty'}), 400
         
         # Generate AI analysis
-        ai_response = ai_analyzer.generate_ai_analysis(document_content, job_posting, document_type)
+        analyzer = get_ai_analyzer(data.get('api_key'))
+        ai_response = analyzer.generate_ai_analysis(document_content, job_posting, document_type)
         
         return jsonify({
             'success': True,
@@ -138,11 +533,12 @@ def extract_keywords():
     
     Expected JSON payload:
     {
-        "job_posting": "Job posting text here"
+        "job_posting": "Job posting text here",
+        "mode": "ai" (default) or "fast" (local skills dictionary only, no Gemini call)
     }
     
     Returns:
-    - JSON with extracted keywords list
+    - JSON with extracted keywords list ("source": "local" in fast mode)
     """
     try:
         # Get request data
@@ -155,9 +551,16 @@ def extract_keywords():
         if not job_posting.strip():
             return jsonify({'error': 'Job posting content cannot be empty'}), 400
         
+        if data.get('mode') == 'fast':
+            return jsonify({
+                'success': True,
+                'keywords': extract_skill_keywords(job_posting),
+                'source': 'local',
+                'timestamp': datetime.now().isoformat()
+            })
+        
         # Get API key from request, fallback to env
-        api_key = data.get('api_key') or GEMINI_API_KEY
-        analyzer = create_ai_analyzer(api_key)
+        analyzer = get_ai_analyzer(data.get('api_key'))
 
         # Extract keywords using AI
         keywords = analyzer.extract_job_keywords(job_posting)
@@ -186,7 +589,8 @@ def suggest_resume_edits():
     {
         "document_content": "LaTeX content with line numbers",
         "selected_keywords": ["Python", "SQL", "Machine Learning"],
-        "document_type": "resume"
+        "document_type": "resume",
+        "verify_compile": "drop"  (optional, "drop" or "flag" suggestions that break compilation)
     }
     
     Returns:
@@ -207,25 +611,30 @@ def suggest_resume_edits():
         if not selected_keywords:
             return jsonify({'error': 'No keywords selected'}), 400
         
+        verify_mode = data.get('verify_compile')
+        if verify_mode not in VERIFY_MODES:
+            return jsonify({'error': 'verify_compile must be "drop" or "flag"'}), 400
+        
         # Get API key from request, fallback to env
-        api_key = data.get('api_key') or GEMINI_API_KEY
-        analyzer = create_ai_analyzer(api_key)
+        analyzer = get_ai_analyzer(data.get('api_key'))
 
         # Generate suggestions using AI
-        print(f"[DEBUG] Generating suggestions for keywords: {selected_keywords}")
+        logger.debug("Generating suggestions for keywords: %s", selected_keywords)
         suggestions = analyzer.generate_resume_suggestions(document_content, selected_keywords)
-
-        print(f"[DEBUG] Raw suggestions from AI: {suggestions}")
         suggestion_list = suggestions.get('suggestions', [])
-        print(f"[DEBUG] Suggestion list length: {len(suggestion_list)}")
+        logger.debug("%d resume suggestions", len(suggestion_list))
 
-        for i, suggestion in enumerate(suggestion_list):
-            print(f"[DEBUG] Suggestion {i+1}: {suggestion}")
+        compile_verification = None
+        if verify_mode:
+            suggestion_list, compile_verification = verify_suggestion_compiles(document_content, suggestion_list,
+                                                                               verify_mode)
 
         return jsonify({
             'success': True,
             'suggestions': suggestion_list,
             'selected_keywords': selected_keywords,
+            'prompt_stats': suggestions.get('prompt_stats'),
+            'compile_verification': compile_verification,
             'timestamp': datetime.now().isoformat()
         })
         
@@ -241,7 +650,8 @@ def suggest_cover_letter_edits():
     {
         "document_content": "LaTeX content with line numbers",
         "selected_keywords": ["Python", "SQL", "Machine Learning"],
-        "document_type": "coverLetter"
+        "document_type": "coverLetter",
+        "verify_compile": "drop"  (optional, "drop" or "flag" suggestions that break compilation)
     }
     
     Returns:
@@ -262,74 +672,328 @@ def suggest_cover_letter_edits():
         if not selected_keywords:
             return jsonify({'error': 'No keywords selected'}), 400
         
-        # Get AI analyzer
-        analyzer = get_ai_analyzer()
+        verify_mode = data.get('verify_compile')
+        if verify_mode not in VERIFY_MODES:
+            return jsonify({'error': 'verify_compile must be "drop" or "flag"'}), 400
+        
+        # Get API key from request, fallback to env
+        analyzer = get_ai_analyzer(data.get('api_key'))
         
         # Generate suggestions using AI
         suggestions = analyzer.generate_cover_letter_suggestions(document_content, selected_keywords)
+        suggestion_list = suggestions.get('suggestions', [])
+        
+        compile_verification = None
+        if verify_mode:
+            suggestion_list, compile_verification = verify_suggestion_compiles(document_content, suggestion_list,
+                                                                               verify_mode)
         
         return jsonify({
             'success': True,
-            'suggestions': suggestions.get('suggestions', []),
+            'suggestions': suggestion_list,
             'selected_keywords': selected_keywords,
+            'prompt_stats': suggestions.get('prompt_stats'),
+            'compile_verification': compile_verification,
             'timestamp': datetime.now().isoformat()
         })
         
     except Exception as e:
         return jsonify({'error': f'Error generating cover letter suggestions: {str(e)}'}), 500
 
+def verify_suggestion_compiles(document_content, suggestions, mode):
+    """
+    Compile-check each suggestion against the document and attach the outcome as compile_check.
+    
+    With mode 'drop', suggestions that fail to compile are removed; with
+    'flag' they are kept. Suggestions that could not be checked in time, or
+    whose document does not compile even without them, are always kept.
+    
+    Returns:
+        Tuple of (kept suggestions, summary with counts per status, dropped,
+        baseline status, duration_ms and budget_ms)
+    """
+    verification = suggestion_verifier.verify(document_content, suggestions, client_id=get_client_id())
+    kept = []
+    counts = {}
+    for suggestion, result in zip(suggestions, verification['results']):
+        suggestion['compile_check'] = {'status': result['status'], 'error': result['error']}
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+        if mode == 'drop' and result['status'] == 'failed':
+            logger.debug("Dropping suggestion %s: %s", suggestion.get('id'), result['error'])
+            continue
+        kept.append(suggestion)
+    
+    return kept, {
+        'mode': mode,
+        'counts': counts,
+        'dropped': len(suggestions) - len(kept),
+        'baseline': verification['baseline'],
+        'duration_ms': verification['duration_ms'],
+        'budget_ms': verification['budget_ms'],
+    }
 
-def convert_latex_to_pdf_bytes(latex_content):
-    """Convert LaTeX content to PDF bytes using pdfLaTeX"""
-    print(f"[DEBUG] Starting LaTeX to PDF conversion...")
-    print(f"[DEBUG] Input LaTeX content length: {len(latex_content)} characters")
-    print(f"[DEBUG] LaTeX content preview: {latex_content[:200]}...")
+
+@app.route('/suggest-resume-edits/stream', methods=['POST'])
+def suggest_resume_edits_stream():
+    """
+    Stream resume editing suggestions as server-sent events while the model generates them
+    
+    Expected JSON payload: same as /suggest-resume-edits
     
+    Events:
+    - suggestion: one validated suggestion, sent as soon as the model finishes it
+    - skipped: id of a suggestion that failed LaTeX validation or whose target is not in the document
+    - done: counts, timings (time_to_first_ms, duration_ms) and prompt_stats
+    - error: the model call failed part way through
+    """
+    return stream_suggestions_response('resume')
+
+@app.route('/suggest-cover-letter-edits/stream', methods=['POST'])
+def suggest_cover_letter_edits_stream():
+    """Stream cover letter editing suggestions as server-sent events (see /suggest-resume-edits/stream)"""
+    return stream_suggestions_response('cover_letter')
+
+
+def stream_suggestions_response(document_type):
+    """Validate the request and return an SSE response streaming suggestions for the document type"""
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    document_content = data.get('document_content', '')
+    selected_keywords = data.get('selected_keywords', [])
+    
+    if not document_content.strip():
+        return jsonify({'error': 'Document content cannot be empty'}), 400
+    
+    if not selected_keywords:
+        return jsonify({'error': 'No keywords selected'}), 400
+    
+    analyzer = get_ai_analyzer(data.get('api_key'))
+    prompt_stats = {}
+    if document_type == 'resume':
+        suggestions = analyzer.stream_resume_suggestions(document_content, selected_keywords, prompt_stats)
+    else:
+        suggestions = analyzer.stream_cover_letter_suggestions(document_content, selected_keywords, prompt_stats)
+    
+    def stream():
+        start_time = time.perf_counter()
+        time_to_first_ms = None
+        sent = skipped = 0
+        try:
+            for suggestion, valid in suggestions:
+                if not valid:
+                    skipped += 1
+                    yield f"event: skipped\ndata: {json.dumps({'id': suggestion.get('id')})}\n\n"
+                    continue
+                if time_to_first_ms is None:
+                    time_to_first_ms = (time.perf_counter() - start_time) * 1000
+                sent += 1
+                yield f"event: suggestion\ndata: {json.dumps(suggestion)}\n\n"
+        except Exception as e:
+            logger.warning("Error streaming %s suggestions: %s", document_type, e)
+            yield f"event: error\ndata: {json.dumps({'error': f'Error generating suggestions: {str(e)}'})}\n\n"
+        
+        done = {
+            'suggestions': sent,
+            'skipped': skipped,
+            'selected_keywords': selected_keywords,
+            'time_to_first_ms': time_to_first_ms,
+            'duration_ms': (time.perf_counter() - start_time) * 1000,
+            'prompt_stats': prompt_stats or None,
+        }
+        yield f"event: done\ndata: {json.dumps(done)}\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/apply-suggestions', methods=['POST'])
+def apply_suggestions_endpoint():
+    """
+    Apply edit suggestions to a document on the server
+    
+    Expected JSON payload:
+    {
+        "document_content": "LaTeX content the suggestions were generated for",
+        "suggestions": [{"id": "...", "type": "replace", "target_text": "...", "replacement_text": "..."}],
+        "compile": false,  (optional, also compile the edited document)
+        "document_id": "resume"  (optional, warm compile workspace when compiling)
+    }
+    
+    Returns:
+    - JSON with the edited document_content, the applied edits (character and
+      line ranges in the original document), the skipped suggestions with a
+      reason ('invalid', 'not_found' or 'overlap') and, when compiling,
+      pdf_base64 and diagnostics
+    """
     try:
-        # Create temporary directory for LaTeX processing
-        with tempfile.TemporaryDirectory() as temp_dir:
-            print(f"[DEBUG] Created temporary directory: {temp_dir}")
-            
-            # Create LaTeX file in memory
-            tex_file_path = os.path.join(temp_dir, 'document.tex')
-            print(f"[DEBUG] Writing LaTeX file to: {tex_file_path}")
-            
-            # Write the original LaTeX content to file (no modifications needed for pdfLaTeX)
-            with open(tex_file_path, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        document_content = data.get('document_content', '')
+        suggestions = data.get('suggestions', [])
+        
+        if not document_content.strip():
+            return jsonify({'error': 'Document content cannot be empty'}), 400
+        if not isinstance(suggestions, list):
+            return jsonify({'error': 'suggestions must be a list'}), 400
+        
+        result = apply_suggestions(document_content, suggestions)
+        logger.debug("Applied %d suggestions, skipped %d", len(result['applied']), len(result['skipped']))
+        response = {
+            'success': True,
+            'document_content': result['content'],
+            'applied': result['applied'],
+            'skipped': result['skipped'],
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        if data.get('compile'):
+            try:
+                compile_result = compile_latex(result['content'], document_id=data.get('document_id'),
+                                               client_id=get_client_id())
+            except SchedulerFullError as e:
+                logger.info("Compile rejected: %s", e)
+                return scheduler_full_response(e)
+            pdf_bytes = compile_result['pdf_bytes']
+            response.update({
+                'compiled': pdf_bytes is not None,
+                'pdf_base64': base64.b64encode(pdf_bytes).decode('utf-8') if pdf_bytes else None,
+                'diagnostics': compile_result['diagnostics'] or [],
+            })
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({'error': f'Error applying suggestions: {str(e)}'}), 500
 
+
+@contextmanager
+def compile_stage(name, **attributes):
+    """Time a compile stage into latex_compile_stage_seconds and, for sampled requests, the request trace"""
+    with COMPILE_STAGE_SECONDS.time(name), span(name, **attributes) as span_attributes:
+        yield span_attributes
+
+
+def count_latex_passes(latexmk_output):
+    """Number of pdflatex runs latexmk reports ("Run number N of rule 'pdflatex'")"""
+    return len(LATEXMK_PASS_RE.findall(latexmk_output))
+
+
+def convert_latex_to_pdf_bytes(latex_content, document_id=None):
+    """Convert LaTeX content to PDF bytes using pdfLaTeX"""
+    try:
+        return compile_latex(latex_content, document_id=document_id)['pdf_bytes']
+    except SchedulerFullError as e:
+        logger.info("Compile rejected: %s", e)
+        return None
+
+
+def get_client_id():
+    """Identify the caller for fair queuing: X-Client-Id header, else the remote address"""
+    return request.headers.get('X-Client-Id') or request.remote_addr or 'anonymous'
+
+
+def scheduler_full_response(error):
+    """429/503 with Retry-After for a compile the scheduler could not admit"""
+    response = jsonify({'error': str(error), 'retry_after': error.retry_after})
+    response.status_code = error.status_code
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def compile_latex(latex_content, document_id=None, client_id='anonymous', preview=False):
+    """
+    Compile LaTeX content to PDF using pdfLaTeX, going through the PDF cache.
+    
+    Cache misses are queued on the compile scheduler. With preview=True a
+    single pdflatex pass is run instead of latexmk (no reruns, no bibliography),
+    which is enough for interactive editing but may leave references unresolved.
+    
+    Returns:
+        Dict with pdf_bytes (None on failure), cache_key, cache_status
+        ('memory', 'disk' or 'miss'), mode ('final' or 'preview'), duration_ms,
+        queue_wait_ms, warnings and diagnostics from the .log and resource_usage
+        of the TeX run (None when the PDF came from the cache) and, for previews, time_saved_ms compared with
+        recent final compiles
+    
+    Raises:
+        SchedulerFullError: If the compile queue cannot take the request
+    """
+    logger.debug("Compiling %d characters of LaTeX (%s)", len(latex_content), 'preview' if preview else 'final')
+    
+    start_time = time.perf_counter()
+    compile_result = {
+        'pdf_bytes': None,
+        'cache_key': make_cache_key(latex_content, LATEX_ENGINE, LATEXMKRC_PATH,
+                                    variant='preview' if preview else 'final'),
+        'cache_status': 'miss',
+        'mode': 'preview' if preview else 'final',
+        'duration_ms': 0.0,
+        'queue_wait_ms': 0.0,
+        'warnings': None,
+        'diagnostics': None,
+        'resource_usage': None,
+    }
+    cache_key = compile_result['cache_key']
+    # Workspaces belong to one client: the same document_id from different clients must not share .aux state or a lock
+    workspace_key = f'{client_id}:{document_id}' if document_id else None
+    
+    # Identical documents (auto-save, tab switch) skip latexmk entirely
+    with span('pdf_cache_lookup') as attributes:
+        cached_pdf, cache_status = pdf_cache.lookup(cache_key)
+        attributes['status'] = cache_status
+    if cached_pdf is not None:
+        logger.debug("PDF cache hit (%s): %s, %d bytes", cache_status, cache_key[:12], len(cached_pdf))
+        compile_result.update({
+            'pdf_bytes': cached_pdf,
+            'cache_status': cache_status,
+            'duration_ms': (time.perf_counter() - start_time) * 1000,
+        })
+    else:
+        try:
+            with span('compile', mode=compile_result['mode']):
+                compile_scheduler.run(client_id, run_latexmk, latex_content, compile_result, start_time,
+                                      document_id=workspace_key, preview=preview)
+        except SchedulerFullError:
+            COMPILES_TOTAL.inc(compile_result['mode'], 'miss', 'rejected')
+            raise
+    COMPILES_TOTAL.inc(compile_result['mode'], compile_result['cache_status'],
+                       'success' if compile_result['pdf_bytes'] else 'failure')
+    
+    if preview and compile_result['pdf_bytes'] and full_compile_durations:
+        full_compile_ms = sum(full_compile_durations) / len(full_compile_durations)
+        compile_result['time_saved_ms'] = max(0.0, full_compile_ms - compile_result['duration_ms'])
+    return compile_result
+
+
+def run_latexmk(latex_content, compile_result, start_time, use_preamble_format=True, document_id=None,
+                preview=False):
+    """Run latexmk (or one pdflatex pass for previews) for a cache miss and fill in compile_result"""
+    compile_result['queue_wait_ms'] = (time.perf_counter() - start_time) * 1000
+    COMPILE_STAGE_SECONDS.observe(compile_result['queue_wait_ms'] / 1000, 'queue_wait')
+    record_span('queue_wait', compile_result['queue_wait_ms'] / 1000)
+    cache_key = compile_result['cache_key']
+    
+    try:
+        stage_start = time.perf_counter()
+        # Reuse the document's warm workspace when the client sent an id, else a pooled scratch dir
+        if document_id and workspace_pool is not None:
+            workspace = workspace_pool.acquire(str(document_id))
+        else:
+            workspace = scratch_pool.acquire()
+        
+        with workspace as temp_dir:
+            COMPILE_STAGE_SECONDS.observe(time.perf_counter() - stage_start, 'temp_dir')
+            record_span('temp_dir', time.perf_counter() - stage_start, workspace=bool(document_id))
+            logger.debug("Using compile directory: %s", temp_dir)
             
-            # Copy latexmkrc to temp directory for Overleaf-like behavior
-            latexmkrc_source = os.path.join(os.path.dirname(__file__), '.latexmkrc')
-            latexmkrc_dest = os.path.join(temp_dir, '.latexmkrc')
-            if os.path.exists(latexmkrc_source):
-                import shutil
-                shutil.copy2(latexmkrc_source, latexmkrc_dest)
-                print(f"[DEBUG] Copied .latexmkrc to temp directory")
-            
-            print(f"[DEBUG] LaTeX file written successfully")
-            print(f"[DEBUG] File size: {os.path.getsize(tex_file_path)} bytes")
-            
-            # Save a copy for debugging (optional)
-            # debug_file = f"debug_latex_{datetime.now().strftime('%Y%m%d_%H%M%S')}.tex"
-            # with open(debug_file, 'w', encoding='utf-8') as f:
-            #     f.write(latex_content)
-            # print(f"[DEBUG] Saved debug copy to: {debug_file}")
-            
-            # Run latexmk to generate PDF (exactly like Overleaf does)
-            print(f"[DEBUG] Running latexmk command...")
-            latexmk_cmd = [
-                'latexmk',
-                '-pdf',
-                '-pdflatex',  # Use pdfLaTeX for better compatibility
-                '-interaction=nonstopmode',
-                '-halt-on-error',
-                '-file-line-error',
-                '-shell-escape',  # Overleaf enables shell-escape
-                '-output-directory=' + temp_dir,
-                tex_file_path
-            ]
-            print(f"[DEBUG] Command: {' '.join(latexmk_cmd)}")
+            # A failed compile must not pick up the previous run's PDF from a warm workspace
+            stale_pdf_path = os.path.join(temp_dir, 'document.pdf')
+            if os.path.exists(stale_pdf_path):
+                os.remove(stale_pdf_path)
             
             # Set environment variables to match Overleaf
             env = os.environ.copy()
@@ -341,72 +1005,143 @@ def convert_latex_to_pdf_bytes(latex_content):
                 'error_line': '254',
                 'half_error_line': '238'
             })
+            if tex_cache is not None:
+                # Read font and Lua caches from the shared cache; only new fonts are promoted back from the overlay
+                env.update(tex_cache.compile_env(temp_dir))
+            
+            # Start from a precompiled preamble format when possible, so only the body is typeset
+            preamble, body = split_preamble(latex_content)
+            format_name = None
+            if use_preamble_format and preamble and preamble_cache is not None:
+                with span('preamble_format') as attributes:
+                    format_name = preamble_cache.get_format(preamble, env)
+                    attributes['format'] = format_name
+            if format_name:
+                logger.debug("Using preamble format: %s", format_name)
+                env['TEXFORMATS'] = preamble_cache.cache_dir + os.pathsep
+            
+            # Create LaTeX file in memory
+            tex_file_path = os.path.join(temp_dir, 'document.tex')
+            
+            # Write the original LaTeX content to file, or just the body when the preamble is preloaded
+            with compile_stage('write_source'), open(tex_file_path, 'w', encoding='utf-8') as f:
+                f.write(body if format_name else latex_content)
             
-            result = subprocess.run(
-                latexmk_cmd,
-                capture_output=True,
-                text=True,
-                cwd=temp_dir,
-                env=env,
-                timeout=30  # 30 second timeout like Overleaf
-            )
+            # Run latexmk to generate PDF (exactly like Overleaf does)
+            if preview:
+                # Draft preview: one pdflatex pass, no latexmk reruns or bibliography
+                latexmk_cmd = ['pdflatex']
+                if format_name:
+                    latexmk_cmd.append('-fmt=' + format_name)
+                latexmk_cmd += PDFLATEX_FLAGS.split() + ['-output-directory=' + temp_dir, tex_file_path]
+            else:
+                if format_name:
+                    pdflatex_option = f'-pdflatex=pdflatex -fmt={format_name} {PDFLATEX_FLAGS} %O %S'
+                else:
+                    pdflatex_option = '-pdflatex'  # Use pdfLaTeX for better compatibility
+                # The shared .latexmkrc is read in place (-r) rather than copied into every compile dir
+                latexmk_cmd = ['latexmk'] + (['-r', LATEXMKRC_PATH] if LATEXMKRC_EXISTS else []) + [
+                    '-pdf',
+                    pdflatex_option,
+                    '-interaction=nonstopmode',
+                    '-halt-on-error',
+                    '-file-line-error',
+                    '-shell-escape',  # Overleaf enables shell-escape
+                    '-output-directory=' + temp_dir,
+                    tex_file_path
+                ]
+            logger.debug("Running %s", latexmk_cmd)
             
-            print(f"[DEBUG] pdfLaTeX process completed")
-            print(f"[DEBUG] Return code: {result.returncode}")
-            print(f"[DEBUG] STDOUT length: {len(result.stdout)} characters")
-            print(f"[DEBUG] STDERR length: {len(result.stderr)} characters")
+            with compile_stage('latexmk', mode=compile_result['mode']) as attributes:
+                try:
+                    result, usage = run_limited(
+                        latexmk_cmd,
+                        compile_limits,
+                        timeout=30,  # 30 second timeout like Overleaf
+                        cwd=temp_dir,
+                        env=env,
+                    )
+                except LimitedRunTimeout as e:
+                    compile_result['resource_usage'] = e.usage
+                    record_compile_usage(compile_result['mode'], e.usage)
+                    raise
+                passes = 1 if preview else count_latex_passes(result.stdout + result.stderr)
+                attributes.update(returncode=result.returncode, passes=passes, cpu_ms=usage['cpu_user_ms'],
+                                  max_rss_kb=usage['max_rss_kb'], limit=usage['limit'])
+            COMPILE_PASSES.observe(passes, compile_result['mode'])
+            compile_result['resource_usage'] = usage
+            record_compile_usage(compile_result['mode'], usage)
+            if usage['limit']:
+                logger.warning("%s killed by the %s limit (%s)", latexmk_cmd[0], usage['limit'], usage['signal'])
             
-            if result.stdout:
-                print(f"[DEBUG] STDOUT preview: {result.stdout[:500]}...")
-            if result.stderr:
-                print(f"[DEBUG] STDERR preview: {result.stderr[:500]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s exited with %d: stdout %r, stderr %r", latexmk_cmd[0], result.returncode,
+                             result.stdout[:500], result.stderr[:500])
             
             # Read PDF bytes directly from the generated file (in-memory)
             pdf_file_path = os.path.join(temp_dir, 'document.pdf')
-            print(f"[DEBUG] Checking for PDF file: {pdf_file_path}")
             
             if os.path.exists(pdf_file_path):
-                print(f"[DEBUG] PDF file found! Size: {os.path.getsize(pdf_file_path)} bytes")
-                with open(pdf_file_path, 'rb') as pdf_file:
+                with compile_stage('pdf_read'), open(pdf_file_path, 'rb') as pdf_file:
                     pdf_bytes = pdf_file.read()
-                print(f"[DEBUG] PDF bytes read successfully: {len(pdf_bytes)} bytes")
-                return pdf_bytes
+                pdf_cache.put(cache_key, pdf_bytes)
+                if tex_cache is not None and result.returncode == 0:
+                    with compile_stage('tex_cache_promote'):
+                        tex_cache.promote_fonts(temp_dir)
+                log_report = parse_tex_log(os.path.join(temp_dir, 'document.log'))
+                compile_result.update({
+                    'pdf_bytes': pdf_bytes,
+                    'duration_ms': (time.perf_counter() - start_time) * 1000,
+                    'warnings': log_report['warning_count'] if log_report else None,
+                    'diagnostics': log_report['diagnostics'] if log_report else [],
+                })
+                if not preview:
+                    full_compile_durations.append(compile_result['duration_ms'])
+                return compile_result
             else:
-                print(f"[DEBUG] PDF file not found!")
-                print(f"[DEBUG] Files in temp directory: {os.listdir(temp_dir)}")
-                
-                # Read the log file to see what went wrong
-                log_file_path = os.path.join(temp_dir, 'document.log')
-                if os.path.exists(log_file_path):
-                    print(f"[DEBUG] Reading log file: {log_file_path}")
-                    try:
-                        with open(log_file_path, 'r', encoding='utf-8') as log_file:
-                            log_content = log_file.read()
-                            print(f"[DEBUG] Log file size: {len(log_content)} characters")
-                            print(f"[DEBUG] Log file content (last 1000 chars):")
-                            print(log_content[-1000:])
-                    except Exception as log_error:
-                        print(f"[DEBUG] Error reading log file: {log_error}")
+                # Parse the log file to see what went wrong
+                log_report = parse_tex_log(os.path.join(temp_dir, 'document.log'))
+                if log_report:
+                    compile_result['diagnostics'] = log_report['diagnostics']
+                    errors = [d for d in log_report['diagnostics'] if d['severity'] == 'error']
+                    logger.info("Compile failed with %d errors, %d warnings%s", log_report['error_count'],
+                                log_report['warning_count'],
+                                f": {errors[0]['file']}:{errors[0]['line']}: {errors[0]['message']}" if errors else '')
+                else:
+                    logger.info("Compile failed without a log: %s", result.stderr[-500:])
                 
-                print(f"[DEBUG] pdfLaTeX compilation failed: {result.stderr}")
-                return None
+                # A stale or unloadable format must never break a compile: drop it and retry in full
+                if not (format_name and 'format file' in (result.stdout + result.stderr)):
+                    compile_result['duration_ms'] = (time.perf_counter() - start_time) * 1000
+                    return compile_result
+                logger.warning("Preamble format %s unusable, retrying without it", format_name)
+                preamble_cache.invalidate(preamble)
+        
+        # Retry after leaving the with block, so a warm workspace is released first
+        return run_latexmk(latex_content, compile_result, start_time, use_preamble_format=False,
+                           document_id=document_id, preview=preview)
 
     except subprocess.TimeoutExpired:
-        print(f"[DEBUG] LaTeX compilation timed out (30 seconds)")
-        return None
-    except Exception as e:
-        print(f"[DEBUG] Exception in LaTeX conversion: {str(e)}")
-        print(f"[DEBUG] Exception type: {type(e).__name__}")
-        import traceback
-        print(f"[DEBUG] Full traceback: {traceback.format_exc()}")
-        return None
+        logger.warning("LaTeX compilation timed out (30 seconds), process group killed")
+    except Exception:
+        logger.exception("Exception in LaTeX conversion")
+    
+    compile_result['duration_ms'] = (time.perf_counter() - start_time) * 1000
+    return compile_result
 
 
 if __name__ == '__main__':
     print("Starting LaTeX Resume Editor Backend...")
     print("Available endpoints:")
     print("  - POST /convert-latex - Convert LaTeX to PDF")
+    print("  - POST /compile-jobs - Start a background compile")
+    print("  - GET  /compile-jobs/<id> - Compile job status (/events for SSE, /pdf for the result)")
+    print("  - GET  /cache-stats - Cache and compile queue counters")
+    print("  - GET  /metrics - Prometheus metrics")
+    print("  - GET  /traces - Recent sampled request traces")
     print("  - POST /ai-parse - AI document analysis")
+    print("  - POST /suggest-resume-edits/stream, /suggest-cover-letter-edits/stream - Stream suggestions (SSE)")
+    print("  - POST /apply-suggestions - Apply edit suggestions (optionally compile)")
     print("  - GET  /health - Health check")
     print("\nMake sure to set GEMINI_API_KEY environment variable")
     
@@ -0,0 +1,227 @@
+"""
+ASGI entry point for the backend.
+
+The AI routes (/extract-keywords, /suggest-resume-edits,
+/suggest-cover-letter-edits) are served on the event loop with
+AsyncAIAnalyzer, so a slow Gemini call costs a coroutine rather than a worker
+thread. Every other route is handed to the Flask app through asgiref's
+WsgiToAsgi adapter.
+
+Run with an ASGI server, e.g.:
+    uvicorn asgi:application --host 127.0.0.1 --port 5001
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from ai_async import AIBusyError, AIConcurrencyLimiter, create_async_ai_analyzer
+from analyzer_pool import AnalyzerPool
+from app import (AI_BACKEND, GEMINI_API_KEY, KEYWORD_LLM_TIMEOUT, VERIFY_MODES, app as flask_app, keyword_cache,
+                 suggestion_cache, trace_buffer, verify_suggestion_compiles)
+from skill_extractor import extract_skill_keywords
+from tracing import RequestTrace, end_request, new_request_id, start_request
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # AI routes still work; the Flask routes need asgiref
+    WsgiToAsgi = None
+
+# Caps on concurrent Gemini calls, across all keys and per API key
+ai_limiter = AIConcurrencyLimiter(
+    max_in_flight=int(os.getenv('AI_MAX_IN_FLIGHT', '64')),
+    max_in_flight_per_key=int(os.getenv('AI_MAX_IN_FLIGHT_PER_KEY', '8')),
+    wait_timeout=float(os.getenv('AI_SLOT_TIMEOUT', '30')),
+)
+
+async_analyzer_pool = AnalyzerPool(
+    lambda api_key: create_async_ai_analyzer(api_key, keyword_cache=keyword_cache, limiter=ai_limiter,
+                                             keyword_timeout=KEYWORD_LLM_TIMEOUT, suggestion_cache=suggestion_cache,
+                                             backend=AI_BACKEND),
+    max_entries=int(os.getenv('AI_CLIENT_POOL_MAX', '32')),
+    idle_ttl=float(os.getenv('AI_CLIENT_IDLE_TTL', '900')),
+)
+
+wsgi_application = WsgiToAsgi(flask_app) if WsgiToAsgi is not None else None
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'POST, OPTIONS'),
+    (b'access-control-allow-headers', b'Content-Type, X-Client-Id, X-Request-Id, X-Trace'),
+    (b'access-control-expose-headers', b'Retry-After, X-Request-Id'),
+]
+
+
+def get_async_ai_analyzer(api_key=None):
+    """Get the pooled async AI analyzer for an API key, falling back to GEMINI_API_KEY"""
+    return async_analyzer_pool.get(api_key or GEMINI_API_KEY or '')
+
+
+async def extract_keywords(data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Async counterpart of app.extract_keywords"""
+    job_posting = data.get('job_posting', '')
+    if not job_posting.strip():
+        return 400, {'error': 'Job posting content cannot be empty'}
+
+    if data.get('mode') == 'fast':
+        return 200, {
+            'success': True,
+            'keywords': extract_skill_keywords(job_posting),
+            'source': 'local',
+            'timestamp': datetime.now().isoformat()
+        }
+
+    keywords = await get_async_ai_analyzer(data.get('api_key')).extract_job_keywords(job_posting)
+
+    # Convert to list if it's a dictionary (old format)
+    if isinstance(keywords, dict):
+        keywords_list = list(keywords.keys())
+    else:
+        keywords_list = keywords if isinstance(keywords, list) else []
+
+    return 200, {
+        'success': True,
+        'keywords': keywords_list,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+async def suggest_edits(data: Dict[str, Any], document_type: str) -> Tuple[int, Dict[str, Any]]:
+    """Async counterpart of app.suggest_resume_edits and app.suggest_cover_letter_edits"""
+    document_content = data.get('document_content', '')
+    selected_keywords = data.get('selected_keywords', [])
+
+    if not document_content.strip():
+        return 400, {'error': 'Document content cannot be empty'}
+    if not selected_keywords:
+        return 400, {'error': 'No keywords selected'}
+    verify_mode = data.get('verify_compile')
+    if verify_mode not in VERIFY_MODES:
+        return 400, {'error': 'verify_compile must be "drop" or "flag"'}
+
+    analyzer = get_async_ai_analyzer(data.get('api_key'))
+    if document_type == 'resume':
+        suggestions = await analyzer.generate_resume_suggestions(document_content, selected_keywords)
+    else:
+        suggestions = await analyzer.generate_cover_letter_suggestions(document_content, selected_keywords)
+    suggestion_list = suggestions.get('suggestions', [])
+
+    compile_verification = None
+    if verify_mode:
+        # pdflatex runs block on subprocesses; keep them off the event loop
+        suggestion_list, compile_verification = await asyncio.get_running_loop().run_in_executor(
+            None, verify_suggestion_compiles, document_content, suggestion_list, verify_mode)
+
+    return 200, {
+        'success': True,
+        'suggestions': suggestion_list,
+        'selected_keywords': selected_keywords,
+        'prompt_stats': suggestions.get('prompt_stats'),
+        'compile_verification': compile_verification,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+AI_ROUTES = {
+    '/extract-keywords': ('extracting keywords', extract_keywords),
+    '/suggest-resume-edits': ('generating resume suggestions', lambda data: suggest_edits(data, 'resume')),
+    '/suggest-cover-letter-edits': ('generating cover letter suggestions',
+                                    lambda data: suggest_edits(data, 'cover_letter')),
+}
+
+
+async def read_body(receive) -> bytes:
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def send_json(send, status: int, payload: Dict[str, Any], headers=()):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())] + CORS_HEADERS + list(headers),
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def handle_ai_route(scope, receive, send):
+    action, handler = AI_ROUTES[scope['path']]
+
+    if scope['method'] == 'OPTIONS':
+        await send({'type': 'http.response.start', 'status': 204, 'headers': CORS_HEADERS})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    if scope['method'] != 'POST':
+        await send_json(send, 405, {'error': 'Method not allowed'})
+        return
+
+    try:
+        data = json.loads(await read_body(receive) or b'null')
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not data:
+        await send_json(send, 400, {'error': 'No data provided'})
+        return
+
+    try:
+        status, payload = await handler(data)
+    except AIBusyError as e:
+        await send_json(send, 503, {'error': str(e), 'retry_after': e.retry_after},
+                        [(b'retry-after', str(e.retry_after).encode())])
+        return
+    except Exception as e:
+        status, payload = 500, {'error': f'Error {action}: {str(e)}'}
+    await send_json(send, status, payload)
+
+
+async def handle_traced(handler, scope, receive, send):
+    """Run an async route with a request id and, if sampled, a trace (app.py's request hooks do this for Flask)"""
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+    request_id = new_request_id(headers.get('x-request-id'))
+    trace = None
+    if trace_buffer.should_sample(headers.get('x-trace') == '1'):
+        trace = RequestTrace(request_id, scope['method'], scope['path'])
+    status = None
+
+    async def send_with_request_id(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            message = dict(message, headers=list(message.get('headers', [])) + [(b'x-request-id', request_id.encode())])
+        await send(message)
+
+    tokens = start_request(request_id, trace)
+    try:
+        await handler(scope, receive, send_with_request_id)
+    finally:
+        end_request(tokens)
+        if trace is not None:
+            trace.finish(status)
+            trace_buffer.add(trace)
+
+
+async def application(scope, receive, send):
+    """ASGI application: async AI routes, everything else via the Flask app"""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] == 'http' and scope['path'] in AI_ROUTES:
+        await handle_traced(handle_ai_route, scope, receive, send)
+    elif wsgi_application is not None:
+        await wsgi_application(scope, receive, send)
+    else:
+        await send_json(send, 501, {'error': 'Install asgiref to serve the Flask routes from asgi.py'})
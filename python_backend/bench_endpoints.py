@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the compile and AI endpoints.
+
+Measures /convert-latex latency percentiles for the templates in
+bench_templates/ in three states, throughput at increasing concurrency, and
+the AI endpoints against the offline fake model backend (AI_BACKEND=fake):
+
+    cold     every request is a new document with no document_id
+             (fresh temp dir, PDF cache miss)
+    warm     every request is a new revision of one document_id
+             (warm workspace, PDF cache miss)
+    cached   the same document every time (PDF cache hit)
+
+By default the app runs in-process with fresh, empty cache directories and
+the fake backend, so a run needs no server, key or network. --url benchmarks
+a running server instead (start it with AI_BACKEND=fake for the AI numbers).
+Results are written as JSON; --compare checks them against an earlier run.
+
+    python bench_endpoints.py --iterations 20 --output bench.json
+    python bench_endpoints.py --compare bench-main.json --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_templates')
+
+JOB_POSTING = ("Senior Backend Engineer. You will design REST APIs in Python and Go, run PostgreSQL and Redis "
+               "in production on Kubernetes and AWS, and own CI/CD with Docker and Terraform. Experience with "
+               "Kafka, machine learning pipelines and GraphQL is a plus.")
+KEYWORDS = ['Python', 'PostgreSQL', 'Kubernetes', 'Terraform']
+
+# Latency percentiles reported for every scenario
+PERCENTILES = (50, 90, 95, 99)
+
+
+def load_templates(pattern='*'):
+    """Return {name: LaTeX source} for bench_templates/<pattern>.tex"""
+    templates = {}
+    for path in sorted(glob.glob(os.path.join(TEMPLATE_DIR, pattern + '.tex'))):
+        with open(path, encoding='utf-8') as f:
+            templates[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return templates
+
+
+def revise(latex_content):
+    """A new revision of a document: same output, different source (so the PDF cache misses)"""
+    return latex_content.rstrip('\n') + f'\n% bench revision {uuid.uuid4().hex}\n'
+
+
+def summarize(samples, wall_seconds=None):
+    """
+    Latency statistics for a list of (status, elapsed seconds) samples.
+
+    Percentiles use the nearest-rank method over successful (2xx) requests
+    only; failures are counted by status code.
+    """
+    latencies = sorted(elapsed * 1000 for status, elapsed in samples if 200 <= status < 300)
+    statuses = {}
+    for status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    summary = {'requests': len(samples), 'ok': len(latencies), 'statuses': statuses}
+    if latencies:
+        summary.update({
+            'min_ms': latencies[0],
+            'mean_ms': sum(latencies) / len(latencies),
+            'max_ms': latencies[-1],
+        })
+        for p in PERCENTILES:
+            rank = max(1, -(-p * len(latencies) // 100))
+            summary[f'p{p}_ms'] = latencies[rank - 1]
+    if wall_seconds:
+        summary['wall_s'] = wall_seconds
+        summary['throughput_rps'] = len(samples) / wall_seconds
+        summary['ok_rps'] = len(latencies) / wall_seconds
+    return summary
+
+
+class InProcessTarget:
+    """Sends requests to the Flask app through its test client, one client per thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def _client(self):
+        if not hasattr(self._local, 'client'):
+            self._local.client = self.app.test_client()
+        return self._local.client
+
+    def post(self, path, payload):
+        """POST JSON. Returns (status, elapsed seconds, time to first body chunk in seconds)"""
+        start = time.perf_counter()
+        response = self._client().post(path, json=payload, buffered=False)
+        first = None
+        for chunk in response.response:
+            if first is None and chunk:
+                first = time.perf_counter() - start
+        response.close()
+        return response.status_code, time.perf_counter() - start, first
+
+
+class HttpTarget:
+    """Sends requests to a running server"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def post(self, path, payload):
+        """POST JSON. Returns (status, elapsed seconds, time to first body chunk in seconds)"""
+        request = urllib.request.Request(self.base_url + path, data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'}, method='POST')
+        start = time.perf_counter()
+        first = None
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                status = response.status
+                while True:
+                    chunk = response.read1(65536)
+                    if not chunk:
+                        break
+                    if first is None:
+                        first = time.perf_counter() - start
+        except urllib.error.HTTPError as e:
+            status = e.code
+            e.read()
+        except (urllib.error.URLError, OSError):
+            status = 0  # connection failed
+        return status, time.perf_counter() - start, first
+
+
+def run_requests(target, make_request, count, concurrency=1):
+    """
+    Send count requests, concurrency at a time.
+
+    Args:
+        make_request: Called with the request index, returns (path, payload)
+
+    Returns:
+        Tuple of (samples [(status, elapsed, first_chunk)], wall seconds)
+    """
+    def one(i):
+        path, payload = make_request(i)
+        return target.post(path, payload)
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        samples = [one(i) for i in range(count)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(one, range(count)))
+    return samples, time.perf_counter() - start
+
+
+def bench_convert_latex(target, templates, iterations, response_format, log):
+    """Cold, warm and cached /convert-latex latency per template"""
+    results = {}
+    for name, latex_content in templates.items():
+        document_id = f'bench-{name}-{uuid.uuid4().hex[:8]}'
+        scenarios = {
+            'cold': lambda i: ('/convert-latex', {'latex_content': revise(latex_content),
+                                                  'response_format': response_format}),
+            'warm': lambda i: ('/convert-latex', {'latex_content': revise(latex_content), 'document_id': document_id,
+                                                  'response_format': response_format}),
+            'cached': lambda i: ('/convert-latex', {'latex_content': latex_content,
+                                                    'response_format': response_format}),
+        }
+        results[name] = {}
+        for scenario, make_request in scenarios.items():
+            if scenario != 'cold':
+                run_requests(target, make_request, 1)  # prime the workspace / PDF cache, not measured
+            samples, _ = run_requests(target, make_request, iterations)
+            results[name][scenario] = summarize([(status, elapsed) for status, elapsed, _ in samples])
+            log(f"convert-latex {name:<16} {scenario:<7}", results[name][scenario])
+    return results
+
+
+def bench_throughput(target, templates, levels, requests_per_worker, response_format, log):
+    """Warm-workspace /convert-latex throughput at each concurrency level"""
+    sources = list(templates.values())
+    results = []
+    for concurrency in levels:
+        run_id = uuid.uuid4().hex[:8]
+
+        def make_request(i):
+            # One document per worker slot, so concurrent requests never share a workspace
+            return '/convert-latex', {'latex_content': revise(sources[i % len(sources)]),
+                                      'document_id': f'bench-{run_id}-{i % concurrency}',
+                                      'response_format': response_format}
+
+        samples, wall = run_requests(target, make_request, concurrency * requests_per_worker, concurrency)
+        summary = dict(summarize([(status, elapsed) for status, elapsed, _ in samples], wall),
+                       concurrency=concurrency)
+        results.append(summary)
+        log(f"throughput c={concurrency:<3}", summary)
+    return results
+
+
+def bench_ai(target, templates, iterations, concurrency, log):
+    """AI endpoint latency; every request carries new text so the keyword and suggestion caches miss"""
+    resume = next((source for name, source in templates.items() if 'resume' in name), None)
+    cover_letter = next((source for name, source in templates.items() if 'cover' in name), resume)
+    endpoints = {
+        'extract-keywords': lambda i: ('/extract-keywords', {
+            'job_posting': f'{JOB_POSTING} Requisition {uuid.uuid4().hex}.'}),
+        'extract-keywords-cached': lambda i: ('/extract-keywords', {'job_posting': JOB_POSTING}),
+    }
+    if resume:
+        endpoints.update({
+            'suggest-resume-edits': lambda i: ('/suggest-resume-edits', {
+                'document_content': revise(resume), 'selected_keywords': KEYWORDS, 'document_type': 'resume'}),
+            'suggest-resume-edits/stream': lambda i: ('/suggest-resume-edits/stream', {
+                'document_content': revise(resume), 'selected_keywords': KEYWORDS, 'document_type': 'resume'}),
+            'suggest-cover-letter-edits': lambda i: ('/suggest-cover-letter-edits', {
+                'document_content': revise(cover_letter), 'selected_keywords': KEYWORDS,
+                'document_type': 'coverLetter'}),
+        })
+
+    results = {}
+    for name, make_request in endpoints.items():
+        if name.endswith('-cached'):
+            run_requests(target, make_request, 1)  # prime the keyword cache, not measured
+        samples, wall = run_requests(target, make_request, iterations, concurrency)
+        summary = summarize([(status, elapsed) for status, elapsed, _ in samples], wall)
+        if name.endswith('/stream'):
+            first = sorted(first * 1000 for status, _, first in samples if status == 200 and first is not None)
+            if first:
+                summary['first_chunk_p50_ms'] = first[(len(first) - 1) // 2]
+        results[name] = summary
+        log(f"ai {name:<28}", summary)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print p50/p95 changes against a baseline run.
+
+    Returns:
+        List of (metric path, baseline ms, current ms) that got slower by more than threshold
+    """
+    regressions = []
+
+    def walk(current, previous, path):
+        if not isinstance(current, dict) or not isinstance(previous, dict):
+            return
+        if 'p50_ms' in current and 'p50_ms' in previous:
+            for key in ('p50_ms', 'p95_ms'):
+                before, after = previous.get(key), current.get(key)
+                if not before or after is None:
+                    continue
+                change = (after - before) / before
+                flag = '  REGRESSION' if change > threshold else ''
+                print(f"{'/'.join(path) + ' ' + key:<58} {before:9.1f} -> {after:9.1f} ms ({change:+6.1%}){flag}")
+                if change > threshold:
+                    regressions.append(('/'.join(path) + ' ' + key, before, after))
+            return
+        for key, value in current.items():
+            walk(value, previous.get(key), path + [key])
+
+    walk(results['results'], baseline.get('results', {}), [])
+    # Throughput levels are a list; line them up by concurrency
+    previous_levels = {level['concurrency']: level
+                       for level in baseline.get('results', {}).get('throughput', [])}
+    for level in results['results'].get('throughput', []):
+        walk({f"c={level['concurrency']}": level},
+             {f"c={level['concurrency']}": previous_levels.get(level['concurrency'])}, ['throughput'])
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def make_in_process_target(scratch_dir):
+    """Import the app with AI_BACKEND=fake and empty caches under scratch_dir"""
+    os.environ.setdefault('AI_BACKEND', 'fake')
+    os.environ.setdefault('FAKE_GEMINI_SEED', '0')
+    for name, default in (('PDF_CACHE_DIR', 'pdf'), ('PREAMBLE_FORMAT_DIR', 'formats'),
+                          ('COMPILE_WORKSPACE_DIR', 'workspaces'), ('KEYWORD_CACHE_DB', 'keywords.sqlite3')):
+        os.environ[name] = os.path.join(scratch_dir, default)
+    from app import app
+    return InProcessTarget(app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='benchmark a running server (default: the app in-process)')
+    parser.add_argument('--templates', default='*', help='glob of bench_templates/*.tex to use')
+    parser.add_argument('--iterations', type=int, default=10, help='measured requests per scenario')
+    parser.add_argument('--concurrency', default='1,2,4,8', help='comma-separated throughput levels')
+    parser.add_argument('--requests-per-worker', type=int, default=4, help='throughput requests per worker')
+    parser.add_argument('--ai-concurrency', type=int, default=4, help='concurrent AI requests')
+    parser.add_argument('--format', default='pdf', choices=('pdf', 'base64', 'png'),
+                        help='/convert-latex response_format')
+    parser.add_argument('--skip', default='', help='comma-separated sections to skip: compile,throughput,ai')
+    parser.add_argument('--output', default='bench_results.json', help='JSON results file ("-" for stdout)')
+    parser.add_argument('--compare', help='baseline JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative p50/p95 slowdown reported as a regression (exit code 1)')
+    parser.add_argument('--verbose', action='store_true', help="log the in-process app at DEBUG (default: silent)")
+    args = parser.parse_args()
+
+    templates = load_templates(args.templates)
+    if not templates:
+        parser.error(f'no templates match {args.templates!r} in {TEMPLATE_DIR}')
+    skip = set(filter(None, args.skip.split(',')))
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+
+    def log(label, summary):
+        p50, p95 = summary.get('p50_ms'), summary.get('p95_ms')
+        latency = f"p50 {p50:8.1f} ms  p95 {p95:8.1f} ms" if p50 is not None else 'no successful requests'
+        rate = f"  {summary['throughput_rps']:7.1f} req/s" if 'throughput_rps' in summary else ''
+        print(f"{label} {latency}  ok {summary['ok']}/{summary['requests']}{rate}", file=sys.stderr)
+
+    if not shutil.which('latexmk'):
+        print('warning: latexmk not found; compile numbers only measure the failure path', file=sys.stderr)
+
+    with contextlib.ExitStack() as stack:
+        if args.url:
+            target = HttpTarget(args.url)
+        else:
+            os.environ.setdefault('LOG_LEVEL', 'DEBUG' if args.verbose else 'CRITICAL')
+            target = make_in_process_target(stack.enter_context(tempfile.TemporaryDirectory(prefix='bench-')))
+
+        started = time.time()
+        results = {}
+        if 'compile' not in skip:
+            results['convert_latex'] = bench_convert_latex(target, templates, args.iterations, args.format, log)
+        if 'throughput' not in skip:
+            results['throughput'] = bench_throughput(target, templates, levels, args.requests_per_worker,
+                                                     args.format, log)
+        if 'ai' not in skip:
+            results['ai'] = bench_ai(target, templates, args.iterations, args.ai_concurrency, log)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.fromtimestamp(started).isoformat(),
+            'duration_s': time.time() - started,
+            'target': args.url or 'in-process',
+            'ai_backend': 'server' if args.url else os.environ.get('AI_BACKEND'),
+            'latexmk': shutil.which('latexmk'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'templates': sorted(templates),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    if args.output == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('meta', {}).get('commit')}):")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metrics slower by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
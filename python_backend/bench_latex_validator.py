@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark for LaTeX suggestion validation.
+
+Generates a corpus of resume-style suggestions (bullets, bold keywords,
+itemize blocks, URLs, dollar amounts, some deliberately broken) and times
+the validator against the multi-scan checks it replaced, with and without
+warnings, and checks that both keep and drop the same suggestions.
+
+    python bench_latex_validator.py --count 20000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import time
+
+from latex_validator import has_errors, validate_suggestion, validate_suggestions
+
+KEYWORDS = ['Python', 'Kubernetes', 'PostgreSQL', 'React', 'Terraform', 'Machine Learning', 'CI/CD', 'AWS Lambda']
+
+TEMPLATES = [
+    r'\item Built {n} data pipelines in \textbf{{{kw}}} processing 2TB/day',
+    r'\item Reduced latency by {n}\% using \emph{{{kw}}} and caching',
+    r'\begin{{itemize}}' '\n' r'  \item Led migration to {kw}' '\n' r'  \item Mentored {n} engineers' '\n' r'\end{{itemize}}',
+    r'\textbf{{Skills:}} {kw}, Go, SQL \\ \textit{{Tools:}} Docker, Git',
+    r'\item Saved \${n}K per year by moving batch jobs to {kw}',
+    r'\item Published results at \href{{https://example.com/p?id={n}&lang=en}}{{example.com}}',
+    r'\item R\&D on {kw} with $O(n \log n)$ indexing across {n} shards',
+    # Broken on purpose: unbalanced braces, stray $, unmatched environment, unescaped specials
+    r'\item Improved {kw} throughput by \textbf{{{n}x',
+    r'\item Grew revenue by ${n}M with {kw}',
+    r'\begin{{itemize}}\item {kw} & Go',
+    r'\item{kw}_{n} # of users',
+]
+
+
+def make_corpus(count, seed=0):
+    """Return count suggestions drawn from TEMPLATES; targets repeat, as in real responses."""
+    rng = random.Random(seed)
+    targets = [rf'\item Worked on project {i} with the team' for i in range(max(1, count // 4))]
+    corpus = []
+    for i in range(count):
+        replacement = rng.choice(TEMPLATES).format(kw=rng.choice(KEYWORDS), n=rng.randint(2, 99))
+        corpus.append({
+            'id': f'suggestion_{i}',
+            'type': rng.choice(['replace', 'replace', 'insert_after']),
+            'target_text': rng.choice(targets),
+            'replacement_text': replacement,
+        })
+    return corpus
+
+
+def legacy_validate(suggestion):
+    """The checks validate_latex_suggestion used to run, without the print calls."""
+    target_text = suggestion.get('target_text', '')
+    replacement_text = suggestion.get('replacement_text', '')
+
+    def check_balanced_braces(text):
+        count = 0
+        for char in text:
+            if char == '{':
+                count += 1
+            elif char == '}':
+                count -= 1
+            if count < 0:
+                return False
+        return count == 0
+
+    if not check_balanced_braces(target_text) or not check_balanced_braces(replacement_text):
+        return False
+    warnings = []
+    special_chars = {'&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_', '^': r'\^'}
+    for char, escaped in special_chars.items():
+        if char in replacement_text and escaped not in replacement_text:
+            if char == '&' and ('http' in replacement_text or 'www' in replacement_text):
+                continue
+            warnings.append(char)
+    valid_commands = ['textbf', 'textit', 'emph', 'item', 'section', 'subsection', 'begin', 'end', 'newline', 'linebreak']
+    for cmd, args in re.findall(r'\\([a-zA-Z]+)(\{[^}]*\})?', replacement_text):
+        if cmd not in valid_commands and len(cmd) < 3:
+            warnings.append(cmd)
+    if '\\item' in replacement_text and not re.search(r'\\item\s+', replacement_text):
+        warnings.append('item')
+    return True
+
+
+def timed(label, function, corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(corpus)
+        best = min(best, time.perf_counter() - start)
+    per_item_us = best / len(corpus) * 1e6
+    print(f"{label:<28} {best * 1000:9.1f} ms   {per_item_us:6.2f} us/suggestion")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20000, help='suggestions in the corpus')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per implementation (best is reported)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.count, args.seed)
+    print(f"Corpus: {len(corpus)} suggestions, {sum(len(s['replacement_text']) for s in corpus)} replacement chars")
+
+    legacy = timed('legacy (multi-scan)', lambda items: [legacy_validate(s) for s in items], corpus, args.repeat)
+    single = timed('per suggestion',
+                   lambda items: [not has_errors(validate_suggestion(s)) for s in items], corpus, args.repeat)
+    batch = timed('batch', validate_suggestions, corpus, args.repeat)
+    warned = timed('batch with warnings', lambda items: validate_suggestions(items, warnings=True), corpus,
+                   args.repeat)
+
+    kept = [not has_errors(findings) for findings in batch]
+    print(f"legacy rejected {legacy.count(False)}, validator rejected {kept.count(False)} "
+          f"({sum(bool(findings) and not has_errors(findings) for findings in warned)} kept with warnings); "
+          f"agree with legacy: {single == kept == legacy == [not has_errors(f) for f in warned]}")
+
+
+if __name__ == "__main__":
+    main()
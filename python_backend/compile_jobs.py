@@ -0,0 +1,209 @@
+"""
+Asynchronous compile jobs.
+
+POST /compile-jobs hands the compile to a background executor and returns a
+job id straight away, so slow documents no longer hold a Flask worker for the
+whole latexmk run. Clients poll the job or follow its events over SSE, and
+finished artifacts are kept for a configurable TTL.
+
+Both the jobs waiting or running and the jobs kept are bounded: a job beyond
+max_pending is refused, and past max_jobs the oldest finished jobs (and
+their PDFs) are dropped before their TTL to make room.
+"""
+
+import contextvars
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from compile_scheduler import SchedulerFullError
+
+TERMINAL_STATUSES = ('succeeded', 'failed')
+
+
+class CompileJobManager:
+    def __init__(self, max_workers: int = 2, ttl: float = 600, max_pending: int = 32, max_jobs: int = 128):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers (int): Number of compiles run concurrently in the background
+            ttl (float): Seconds a finished job and its PDF are kept
+            max_pending (int): Number of jobs allowed to be queued or running
+            max_jobs (int): Number of jobs kept, finished ones included
+        """
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_jobs = max(max_jobs, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='compile-job')
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._jobs = {}  # job id -> job dict
+        self._pending = 0
+        self._run_times = deque(maxlen=100)  # seconds, most recent jobs
+        self.rejected = 0
+        self.evicted = 0
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a pending slot frees up. Caller holds the lock."""
+        average_run = sum(self._run_times) / len(self._run_times) if self._run_times else 2.0
+        return max(1, int(average_run * self._pending / self.max_workers + 0.5))
+
+    def submit(self, compile_fn: Callable[..., Dict[str, Any]], *args, **kwargs) -> str:
+        """
+        Queue a compile.
+
+        Args:
+            compile_fn: Function returning a compile result dict (see compile_latex)
+            *args, **kwargs: Arguments for compile_fn
+
+        Returns:
+            The new job id
+
+        Raises:
+            SchedulerFullError: 503 if max_pending jobs are already queued or running
+        """
+        self.expire()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise SchedulerFullError('Compile job queue is full', 503, self._retry_after())
+            if len(self._jobs) >= self.max_jobs:
+                finished = sorted((job['finished_at'], job_id) for job_id, job in self._jobs.items()
+                                  if job['finished_at'])
+                for _, old_id in finished[:len(self._jobs) - self.max_jobs + 1]:
+                    del self._jobs[old_id]
+                    self.evicted += 1
+            self._pending += 1
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'created_at': now,
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                'events': [{'event': 'queued', 'time': now}],
+            }
+        # Runs in a copy of the caller's context, so the job's log lines carry the request id
+        self._executor.submit(contextvars.copy_context().run, self._run, job_id, compile_fn, args, kwargs)
+        return job_id
+
+    def _record(self, job: Dict[str, Any], status: str, **fields):
+        """Update a job and wake up event listeners. Caller holds the lock."""
+        now = time.time()
+        job['status'] = status
+        job.update(fields)
+        job['events'].append({'event': status, 'time': now})
+        self._changed.notify_all()
+
+    def _run(self, job_id: str, compile_fn: Callable[..., Dict[str, Any]], args, kwargs):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                self._pending -= 1
+                return
+            self._record(job, 'running', started_at=time.time())
+
+        try:
+            result = compile_fn(*args, **kwargs)
+            error = None if result.get('pdf_bytes') else 'Failed to generate PDF'
+        except Exception as e:
+            result, error = None, str(e)
+
+        with self._lock:
+            self._pending -= 1
+            self._run_times.append(time.time() - job['started_at'])
+            self._record(job,
+                         'failed' if error else 'succeeded',
+                         finished_at=time.time(),
+                         result=result,
+                         error=error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job dict, or None if unknown or expired."""
+        self.expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the JSON-safe status of a job (no PDF bytes)."""
+        with self._lock:
+            description = {
+                'job_id': job['id'],
+                'status': job['status'],
+                'created_at': job['created_at'],
+                'started_at': job['started_at'],
+                'finished_at': job['finished_at'],
+                'error': job['error'],
+            }
+            result = job['result']
+            if result:
+                description.update({
+                    'duration_ms': result.get('duration_ms'),
+                    'cache_status': result.get('cache_status'),
+                    'warnings': result.get('warnings'),
+                    'diagnostics': result.get('diagnostics'),
+                    'resource_usage': result.get('resource_usage'),
+                    'pdf_size': len(result['pdf_bytes']) if result.get('pdf_bytes') else None,
+                })
+            if job['finished_at']:
+                description['expires_at'] = job['finished_at'] + self.ttl
+            return description
+
+    def events(self, job_id: str, keepalive: float = 15) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Yield a job's events as they happen, ending after a terminal event.
+
+        None is yielded every `keepalive` seconds without news, so SSE
+        streams can send a heartbeat.
+        """
+        sent = 0
+        while True:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if sent == len(job['events']):
+                    self._changed.wait(timeout=keepalive)
+                pending: List[Dict[str, Any]] = job['events'][sent:]
+                sent += len(pending)
+
+            if not pending:
+                yield None
+            for event in pending:
+                yield event
+                if event['event'] in TERMINAL_STATUSES:
+                    return
+
+    def expire(self):
+        """Drop finished jobs (and their PDFs) older than the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['finished_at'] and job['finished_at'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counts by status."""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {
+                'jobs': len(self._jobs),
+                'by_status': counts,
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'max_jobs': self.max_jobs,
+                'rejected': self.rejected,
+                'evicted': self.evicted,
+                'ttl': self.ttl,
+            }
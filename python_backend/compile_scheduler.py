@@ -0,0 +1,170 @@
+"""
+Bounded compile scheduler with admission control.
+
+Every cache miss forks latexmk (and pdflatex/biber under it). Without a limit,
+a burst of requests forks an unbounded number of TeX processes and thrashes
+CPU and memory. The scheduler runs at most one TeX process tree per worker
+(sized to the core count), keeps a bounded queue with per-client round-robin
+so one client cannot starve the rest, and rejects work quickly once full.
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+
+class SchedulerFullError(Exception):
+    """Raised when a compile cannot be admitted to the queue."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code  # 429 for a client over its share, 503 when the queue is full
+        self.retry_after = retry_after
+
+
+class CompileScheduler:
+    def __init__(self, max_workers: int = 2, max_queue: int = 32, max_per_client: int = 8):
+        """
+        Initialize the scheduler and start its workers.
+
+        Args:
+            max_workers (int): Number of compiles run at once
+            max_queue (int): Number of compiles allowed to wait across all clients
+            max_per_client (int): Number of compiles one client may have waiting
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.max_per_client = max_per_client
+
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._queues = OrderedDict()  # client id -> deque of tasks, in round-robin order
+        self._queued = 0
+        self._running = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_times = deque(maxlen=1000)  # seconds, most recent compiles
+        self._run_times = deque(maxlen=1000)
+
+        for i in range(max_workers):
+            threading.Thread(target=self._worker, name=f'compile-worker-{i}', daemon=True).start()
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a queue slot frees up. Caller holds the lock."""
+        average_run = sum(self._run_times) / len(self._run_times) if self._run_times else 2.0
+        return max(1, int(average_run * (self._queued + 1) / self.max_workers + 0.5))
+
+    def submit(self, client_id: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue a compile for a client.
+
+        Args:
+            client_id (str): Identifier used for fair queuing
+            fn: Function that runs the compile
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            Future with the result of fn
+
+        Raises:
+            SchedulerFullError: If the queue or the client's share of it is full
+        """
+        future = Future()
+        with self._lock:
+            queue = self._queues.get(client_id)
+            if self._queued >= self.max_queue:
+                self.rejected += 1
+                raise SchedulerFullError('Compile queue is full', 503, self._retry_after())
+            if queue is not None and len(queue) >= self.max_per_client:
+                self.rejected += 1
+                raise SchedulerFullError('Too many queued compiles for this client', 429, self._retry_after())
+
+            if queue is None:
+                queue = self._queues[client_id] = deque()
+            # The worker runs fn in the caller's context, so its logs and spans keep the request id
+            queue.append((future, fn, args, kwargs, time.perf_counter(), contextvars.copy_context()))
+            self._queued += 1
+            self.submitted += 1
+            self._work_available.notify()
+        return future
+
+    def run(self, client_id: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Queue a compile and wait for its result (see submit)."""
+        return self.submit(client_id, fn, *args, **kwargs).result()
+
+    def is_saturated(self) -> bool:
+        """Return True if new compiles would currently be rejected."""
+        with self._lock:
+            return self._queued >= self.max_queue
+
+    def retry_after(self) -> int:
+        """Return the current Retry-After estimate in seconds."""
+        with self._lock:
+            return self._retry_after()
+
+    def _next_task(self):
+        """Pop the next task, rotating across clients. Caller holds the lock."""
+        client_id, queue = next(iter(self._queues.items()))
+        task = queue.popleft()
+        del self._queues[client_id]
+        if queue:
+            # Client goes to the back of the line
+            self._queues[client_id] = queue
+        self._queued -= 1
+        return task
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                while not self._queued:
+                    self._work_available.wait()
+                future, fn, args, kwargs, enqueued_at, context = self._next_task()
+                started_at = time.perf_counter()
+                self._wait_times.append(started_at - enqueued_at)
+                self._running += 1
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(context.run(fn, *args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+                self._run_times.append(time.perf_counter() - started_at)
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, throughput counters and wait-time percentiles."""
+        with self._lock:
+            wait_times = list(self._wait_times)
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'max_per_client': self.max_per_client,
+                'queue_depth': self._queued,
+                'running': self._running,
+                'clients_waiting': len(self._queues),
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'wait_ms_p50': self._ms(self._percentile(wait_times, 0.5)),
+                'wait_ms_p95': self._ms(self._percentile(wait_times, 0.95)),
+                'wait_ms_max': self._ms(max(wait_times) if wait_times else None),
+            }
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return round(seconds * 1000, 1) if seconds is not None else None
@@ -0,0 +1,226 @@
+"""
+Compile verification of edit suggestions.
+
+The LaTeX validator catches unbalanced braces and environments, but not a
+misspelled command or an \\item dropped into a tabular. SuggestionVerifier
+applies each suggestion on its own to the document and runs one
+pdflatex -draftmode pass per variant (no PDF is written), all in parallel
+and all within one wall-clock budget. The unedited document is checked
+alongside them: if it does not compile either, a failing variant says
+nothing about the suggestion.
+
+With a CompileScheduler, the passes run on its workers under the requesting
+client's id, so they count against the same bound on concurrent TeX runs as
+regular compiles; at most max_workers of one verify() call are queued at a
+time. A pass the scheduler rejects is reported as 'unverified'.
+
+When the preamble's format is already in the PreambleFormatCache, the
+variants that leave the preamble as it is start from it and only the body is
+typeset. A variant that edits the preamble is compiled in full, since the
+format holds the old one. A format is never built here, since that can take
+longer than the whole budget.
+"""
+
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from compile_scheduler import CompileScheduler, SchedulerFullError
+from preamble_cache import PreambleFormatCache, split_preamble
+from process_limits import ProcessLimits, run_limited
+from scratch_pool import ScratchPool
+from suggestion_apply import apply_suggestions
+from tex_log import parse_tex_log
+
+logger = logging.getLogger(__name__)
+
+# AI-written text is compiled without shell escape, unlike the user's own documents
+DRAFT_FLAGS = ['-draftmode', '-interaction=nonstopmode', '-halt-on-error', '-file-line-error', '-no-shell-escape']
+
+
+class SuggestionVerifier:
+    def __init__(self,
+                 max_workers: int = 4,
+                 budget: float = 8.0,
+                 engine: str = 'pdflatex',
+                 preamble_cache: Optional[PreambleFormatCache] = None,
+                 scratch_pool: Optional[ScratchPool] = None,
+                 limits: Optional[ProcessLimits] = None,
+                 scheduler: Optional[CompileScheduler] = None):
+        """
+        Initialize the verifier.
+
+        Args:
+            max_workers (int): pdflatex processes one verify() call runs (or queues on the scheduler) at once
+            budget (float): Seconds one verify() call may take in total
+            engine (str): TeX engine used for the draft passes
+            preamble_cache (PreambleFormatCache): Formats to start the variants from
+            scratch_pool (ScratchPool): Directories to compile the variants in (default: fresh temp dirs)
+            limits (ProcessLimits): Resource limits for each draft pass
+            scheduler (CompileScheduler): Scheduler to run the draft passes on (default: a private thread pool)
+        """
+        self.max_workers = max_workers
+        self.budget = budget
+        self.engine = engine
+        self.preamble_cache = preamble_cache
+        self.scratch_pool = scratch_pool
+        self.limits = limits
+        self.scheduler = scheduler
+        self._executor = None
+        if scheduler is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='suggestion-verify')
+
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.passed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    def verify(self, document: str, suggestions: List[Dict[str, Any]],
+               client_id: str = 'suggestion-verify') -> Dict[str, Any]:
+        """
+        Compile the document once per suggestion, with only that suggestion applied.
+
+        Args:
+            document (str): Full LaTeX document the suggestions were generated for
+            suggestions (List[Dict]): Suggestions to check
+            client_id (str): Client the passes are queued for on the scheduler
+
+        Returns:
+            Dict with results (one per suggestion: status 'passed', 'failed',
+            'timeout', 'not_applicable' or 'unverified', error and duration_ms),
+            baseline (status of the unedited document), duration_ms and budget_ms
+        """
+        start_time = time.perf_counter()
+        deadline = time.monotonic() + self.budget
+
+        env = os.environ.copy()
+        env['max_print_line'] = '10000'
+        preamble, _ = split_preamble(document)
+        format_name = None
+        if preamble and self.preamble_cache is not None:
+            format_name = self.preamble_cache.find_format(preamble)
+            if format_name:
+                env['TEXFORMATS'] = self.preamble_cache.cache_dir + os.pathsep
+
+        # One draft pass per distinct variant; the unedited document is checked alongside
+        variants = {}  # suggestion index -> variant text
+        for i, suggestion in enumerate(suggestions):
+            applied = apply_suggestions(document, [suggestion])
+            if applied['applied']:
+                variants[i] = applied['content']
+        pending = deque(dict.fromkeys([document, *variants.values()]))
+        running = {}  # future -> variant text
+        checks = {}
+        while pending or running:
+            while pending and len(running) < self.max_workers:
+                text = pending.popleft()
+                text_format = format_name if format_name and split_preamble(text)[0] == preamble else None
+                try:
+                    running[self._submit(client_id, text, text_format, env, deadline)] = text
+                except SchedulerFullError as e:
+                    with self._lock:
+                        self.rejected += 1
+                    checks[text] = {'status': 'unverified', 'error': str(e), 'duration_ms': None}
+            if not running:
+                break
+            done, _ = wait(running, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break  # Deadline
+            for future in done:
+                checks[running.pop(future)] = future.result()
+
+        for future, text in running.items():
+            future.cancel()  # Not started before the deadline
+            checks[text] = {'status': 'timeout', 'error': None, 'duration_ms': None}
+        for text in pending:
+            checks[text] = {'status': 'timeout', 'error': None, 'duration_ms': None}
+
+        baseline = checks[document]['status']
+        results = []
+        for i in range(len(suggestions)):
+            if i not in variants:
+                results.append({'status': 'not_applicable', 'error': 'Target text not found', 'duration_ms': None})
+            elif baseline != 'passed' and checks[variants[i]]['status'] == 'failed':
+                results.append(dict(checks[variants[i]], status='unverified'))
+            else:
+                results.append(dict(checks[variants[i]]))
+
+        with self._lock:
+            self.runs += 1
+            self.passed += sum(result['status'] == 'passed' for result in results)
+            self.failed += sum(result['status'] == 'failed' for result in results)
+            self.timed_out += sum(result['status'] == 'timeout' for result in results)
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug("Verified %d suggestions in %.0f ms (baseline %s, format %s)",
+                     len(suggestions), duration_ms, baseline, format_name or 'none')
+        return {
+            'results': results,
+            'baseline': baseline,
+            'duration_ms': duration_ms,
+            'budget_ms': self.budget * 1000,
+        }
+
+    def _submit(self, client_id: str, text: str, format_name: Optional[str], env: Dict[str, str], deadline: float):
+        """Start _check for text on the scheduler, or on the private pool without one."""
+        if self.scheduler is not None:
+            return self.scheduler.submit(client_id, self._check, text, format_name, env, deadline)
+        return self._executor.submit(self._check, text, format_name, env, deadline)
+
+    def _check(self, text: str, format_name: Optional[str], env: Dict[str, str], deadline: float) -> Dict[str, Any]:
+        """Run one draft pass over text. Returns status 'passed', 'failed' or 'timeout' with the first error."""
+        start_time = time.perf_counter()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return {'status': 'timeout', 'error': None, 'duration_ms': None}
+
+        if self.scratch_pool is not None:
+            scratch = self.scratch_pool.acquire()
+        else:
+            scratch = tempfile.TemporaryDirectory(prefix='suggestion-verify-')
+        with scratch as temp_dir:
+            tex_path = os.path.join(temp_dir, 'document.tex')
+            with open(tex_path, 'w', encoding='utf-8') as f:
+                f.write(split_preamble(text)[1] if format_name else text)
+
+            cmd = [self.engine] + (['-fmt=' + format_name] if format_name else []) + DRAFT_FLAGS
+            cmd += ['-output-directory=' + temp_dir, tex_path]
+            try:
+                result, _ = run_limited(cmd, self.limits, timeout=remaining, cwd=temp_dir, env=env)
+            except subprocess.TimeoutExpired:
+                return {'status': 'timeout', 'error': None, 'duration_ms': (time.perf_counter() - start_time) * 1000}
+            except OSError as e:
+                return {'status': 'failed', 'error': f'Could not run {self.engine}: {e}',
+                        'duration_ms': (time.perf_counter() - start_time) * 1000}
+
+            error = None
+            if result.returncode != 0:
+                log_report = parse_tex_log(os.path.join(temp_dir, 'document.log'))
+                errors = [d for d in (log_report or {}).get('diagnostics', []) if d['severity'] == 'error']
+                error = errors[0]['message'] if errors else (result.stdout.strip().splitlines() or ['Compile failed'])[-1]
+        return {
+            'status': 'passed' if result.returncode == 0 else 'failed',
+            'error': error,
+            'duration_ms': (time.perf_counter() - start_time) * 1000,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return verification counters."""
+        with self._lock:
+            return {
+                'runs': self.runs,
+                'passed': self.passed,
+                'failed': self.failed,
+                'timed_out': self.timed_out,
+                'rejected': self.rejected,
+                'max_workers': self.max_workers,
+                'budget': self.budget,
+            }
@@ -0,0 +1,280 @@
+"""
+Offline stand-in for the Gemini client.
+
+FakeGeminiClient implements the part of google-genai's Client that
+AIAnalyzer and AsyncAIAnalyzer use (models.generate_content,
+models.generate_content_stream and aio.models.generate_content), so the AI
+endpoints can be load-tested and exercised in CI without a key or network.
+
+Responses follow the requested schema: keyword requests get a JSON array of
+skills found in the posting (via the local skills dictionary), suggestion
+requests get suggestion objects whose target_text is a line of the document
+in the prompt, so they pass validation and map back onto the document.
+Latency is drawn from a configurable distribution, a configurable fraction
+of calls fail, and streamed responses arrive in chunks spread over the
+sampled latency.
+
+Select it with AI_BACKEND=fake; see FakeGeminiClient.from_env for the knobs.
+"""
+
+import ast
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from skill_extractor import extract_skill_keywords
+
+# Lines following these prompt headers hold the document and the keyword list
+DOCUMENT_HEADER_RE = re.compile(r'^\s*CURRENT (?:RESUME|COVER LETTER) \(LaTeX format[^)]*\):\s*$', re.MULTILINE)
+KEYWORDS_HEADER_RE = re.compile(r'^\s*(?:KEYWORDS YOU NEED TO INCLUDE|JOB REQUIREMENTS KEYWORDS):\s*$', re.MULTILINE)
+JOB_POSTING_RE = re.compile(r'Job Posting:\s*(.*?)\s*Return the keywords', re.DOTALL)
+LATEX_SPECIALS_RE = re.compile(r'([&%$#_])')
+
+FALLBACK_KEYWORDS = ['Python', 'SQL', 'Git', 'Docker', 'REST APIs']
+
+
+class FakeGeminiError(RuntimeError):
+    """Injected failure, shaped like a retryable server error."""
+
+    def __init__(self, message: str = 'Fake Gemini: injected 503 UNAVAILABLE', code: int = 503):
+        super().__init__(message)
+        self.code = code
+
+
+class LatencyModel:
+    def __init__(self, kind: str = 'fixed', *params: float):
+        """
+        A latency distribution in milliseconds.
+
+        Args:
+            kind (str): 'fixed' (ms), 'uniform' (low_ms, high_ms) or
+                'lognormal' (median_ms, sigma)
+            *params: Parameters for the distribution
+        """
+        expected = {'fixed': 1, 'uniform': 2, 'lognormal': 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Latency must be fixed:MS, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA, "
+                             f"got {kind}:{':'.join(str(p) for p in params)}")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: str) -> 'LatencyModel':
+        """Parse 'fixed:500', 'uniform:200:1200' or 'lognormal:800:0.5'."""
+        kind, *params = spec.split(':')
+        return cls(kind.strip().lower(), *(float(p) for p in params))
+
+    def sample(self, rng: random.Random) -> float:
+        """Return one latency in seconds."""
+        if self.kind == 'fixed':
+            ms = self.params[0]
+        elif self.kind == 'uniform':
+            ms = rng.uniform(*self.params)
+        else:
+            median, sigma = self.params
+            ms = rng.lognormvariate(math.log(max(median, 1e-3)), sigma)
+        return max(0.0, ms) / 1000
+
+    def __repr__(self):
+        return f"{self.kind}:{':'.join(f'{p:g}' for p in self.params)}"
+
+
+def _escape_latex(text: str) -> str:
+    return LATEX_SPECIALS_RE.sub(r'\\\1', text)
+
+
+def _prompt_keywords(contents: str) -> List[str]:
+    """The keyword list the analyzer printed into a suggestions prompt."""
+    header = KEYWORDS_HEADER_RE.search(contents)
+    if header:
+        line = contents[header.end():].strip().split('\n', 1)[0]
+        try:
+            keywords = ast.literal_eval(line)
+        except (ValueError, SyntaxError):
+            keywords = None
+        if isinstance(keywords, dict):
+            keywords = list(keywords)
+        if isinstance(keywords, (list, tuple)):
+            return [str(keyword) for keyword in keywords if str(keyword).strip()]
+    return FALLBACK_KEYWORDS[:2]
+
+
+def _prompt_document_lines(contents: str) -> List[str]:
+    """Lines of the document in a suggestions prompt that make good edit targets."""
+    header = DOCUMENT_HEADER_RE.search(contents)
+    end = KEYWORDS_HEADER_RE.search(contents)
+    if not header:
+        return []
+    document = contents[header.end():end.start() if end and end.start() > header.end() else len(contents)]
+    lines = [line.strip() for line in document.split('\n')]
+    items = [line for line in lines if line.startswith('\\item ') and len(line) > 12]
+    prose = [line for line in lines if len(line) > 30 and not line.startswith(('\\', '%'))]
+    return items or prose
+
+
+class _Models:
+    def __init__(self, client: 'FakeGeminiClient'):
+        self._client = client
+
+    def generate_content(self, model: str, contents: Any, config: Any = None):
+        latency, fail = self._client._plan(model, config)
+        time.sleep(latency)
+        if fail:
+            raise FakeGeminiError()
+        return self._client._response(self._client._response_text(contents, config), contents)
+
+    def generate_content_stream(self, model: str, contents: Any, config: Any = None) -> Iterator[Any]:
+        latency, fail = self._client._plan(model, config)
+        text = self._client._response_text(contents, config)
+        chunks = self._client.stream_chunks
+        size = max(1, math.ceil(len(text) / chunks))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or ['']
+        # Time to first chunk is a share of the latency; the rest is spread over the chunks
+        first = latency * self._client.first_chunk_fraction
+        gap = (latency - first) / max(1, len(pieces) - 1)
+        for i, piece in enumerate(pieces):
+            time.sleep(first if i == 0 else gap)
+            if fail and i == len(pieces) // 2:
+                raise FakeGeminiError('Fake Gemini: injected stream interruption')
+            last = i == len(pieces) - 1
+            yield self._client._response(piece, contents if last else None)
+
+
+class _AsyncModels:
+    def __init__(self, client: 'FakeGeminiClient'):
+        self._client = client
+
+    async def generate_content(self, model: str, contents: Any, config: Any = None):
+        latency, fail = self._client._plan(model, config)
+        await asyncio.sleep(latency)
+        if fail:
+            raise FakeGeminiError()
+        return self._client._response(self._client._response_text(contents, config), contents)
+
+
+class FakeGeminiClient:
+    def __init__(self,
+                 keyword_latency: Optional[LatencyModel] = None,
+                 suggestion_latency: Optional[LatencyModel] = None,
+                 error_rate: float = 0.0,
+                 stream_chunks: int = 8,
+                 first_chunk_fraction: float = 0.3,
+                 max_suggestions: int = 5,
+                 seed: Optional[int] = None):
+        """
+        Initialize the fake client.
+
+        Args:
+            keyword_latency (LatencyModel): Latency of keyword requests (default fixed 0 ms)
+            suggestion_latency (LatencyModel): Latency of suggestion requests (default fixed 0 ms)
+            error_rate (float): Fraction of calls that raise FakeGeminiError
+                (streams fail half way through)
+            stream_chunks (int): Chunks a streamed response is split into
+            first_chunk_fraction (float): Share of the latency spent before the first chunk
+            max_suggestions (int): Suggestions returned per request at most
+            seed (int): Seed for latency and error sampling, for repeatable runs
+        """
+        self.keyword_latency = keyword_latency or LatencyModel('fixed', 0)
+        self.suggestion_latency = suggestion_latency or LatencyModel('fixed', 0)
+        self.error_rate = error_rate
+        self.stream_chunks = max(1, stream_chunks)
+        self.first_chunk_fraction = min(1.0, max(0.0, first_chunk_fraction))
+        self.max_suggestions = max_suggestions
+        self.models = _Models(self)
+        self.aio = SimpleNamespace(models=_AsyncModels(self))
+
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> 'FakeGeminiClient':
+        """
+        Build a fake client from FAKE_GEMINI_* environment variables:
+        KEYWORD_LATENCY (default lognormal:600:0.4), SUGGESTION_LATENCY
+        (default lognormal:2500:0.5), ERROR_RATE (0), STREAM_CHUNKS (8) and SEED.
+        """
+        seed = os.getenv('FAKE_GEMINI_SEED')
+        return cls(
+            keyword_latency=LatencyModel.parse(os.getenv('FAKE_GEMINI_KEYWORD_LATENCY', 'lognormal:600:0.4')),
+            suggestion_latency=LatencyModel.parse(os.getenv('FAKE_GEMINI_SUGGESTION_LATENCY', 'lognormal:2500:0.5')),
+            error_rate=float(os.getenv('FAKE_GEMINI_ERROR_RATE', '0')),
+            stream_chunks=int(os.getenv('FAKE_GEMINI_STREAM_CHUNKS', '8')),
+            seed=int(seed) if seed else None,
+        )
+
+    @staticmethod
+    def _wants_suggestions(config: Any) -> bool:
+        schema = getattr(config, 'response_schema', None)
+        return isinstance(schema, dict) and schema.get('items', {}).get('type') == 'OBJECT'
+
+    def _plan(self, model: str, config: Any):
+        """Sample (latency seconds, whether the call fails) for one call."""
+        latency_model = self.suggestion_latency if self._wants_suggestions(config) else self.keyword_latency
+        with self._lock:
+            self.calls += 1
+            latency = latency_model.sample(self._rng)
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return latency, fail
+
+    def _response_text(self, contents: Any, config: Any) -> str:
+        contents = str(contents)
+        if not self._wants_suggestions(config):
+            posting = JOB_POSTING_RE.search(contents)
+            return json.dumps(extract_skill_keywords(posting.group(1) if posting else contents) or FALLBACK_KEYWORDS)
+
+        keywords = _prompt_keywords(contents)
+        targets = _prompt_document_lines(contents)
+        suggestions = []
+        for i, (keyword, target) in enumerate(zip(keywords, targets)):
+            if i >= self.max_suggestions:
+                break
+            escaped = _escape_latex(keyword)
+            if target.startswith('\\item '):
+                suggestion_type, replacement = 'replace', f"{target} using \\textbf{{{escaped}}}"
+            else:
+                suggestion_type, replacement = 'insert_after', f"I have also worked extensively with {escaped}."
+            suggestions.append({
+                'id': f'suggestion_{i + 1}',
+                'type': suggestion_type,
+                'target_text': target,
+                'replacement_text': replacement,
+                'description': f'Mention {keyword}',
+                'keywords_used': [keyword],
+            })
+        return json.dumps(suggestions)
+
+    @staticmethod
+    def _response(text: str, contents: Any = None):
+        """A response object with .text and, when contents is given, usage_metadata."""
+        usage = None
+        if contents is not None:
+            prompt_tokens = (len(str(contents)) + 3) // 4
+            output_tokens = (len(text) + 3) // 4
+            usage = SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens,
+                                    total_token_count=prompt_tokens + output_tokens)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def close(self):
+        """Nothing to release; present so AnalyzerPool can close it like a genai.Client."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call and injected error counters."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'errors': self.errors,
+                'keyword_latency': repr(self.keyword_latency),
+                'suggestion_latency': repr(self.suggestion_latency),
+                'error_rate': self.error_rate,
+            }
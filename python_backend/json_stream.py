@@ -0,0 +1,74 @@
+"""
+Incremental parser for a streamed JSON array of objects.
+
+The suggestions prompt asks Gemini for a JSON array. With
+generate_content_stream the array arrives in arbitrary text chunks, so the
+parser tracks string/escape state and brace depth across chunks and hands
+back each top-level object as soon as its closing brace arrives, instead of
+waiting for the whole array.
+"""
+
+import json
+from typing import Any, List
+
+
+class JSONArrayStreamParser:
+    def __init__(self):
+        self._buffer = []  # characters of the object being read
+        self._depth = 0  # nesting depth inside the current top-level element
+        self._in_string = False
+        self._escaped = False
+        self._started = False  # seen the opening '['
+        self.finished = False  # seen the closing ']'
+        self.errors = 0  # top-level objects that failed to parse
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume the next chunk of text.
+
+        Args:
+            chunk (str): Next piece of the streamed JSON array
+
+        Returns:
+            The top-level elements completed by this chunk
+        """
+        completed = []
+        for char in chunk:
+            if self.finished:
+                break
+
+            if not self._started:
+                if char == '[':
+                    self._started = True
+                continue
+
+            if self._depth == 0:
+                # Between elements: skip whitespace and commas, stop at ']'
+                if char == ']':
+                    self.finished = True
+                elif char in '{[':
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        completed.append(json.loads(''.join(self._buffer)))
+                    except ValueError:
+                        self.errors += 1
+                    self._buffer = []
+        return completed
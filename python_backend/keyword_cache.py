@@ -0,0 +1,168 @@
+"""
+Cache for job-posting keyword extraction.
+
+Many users tailor against the same posting, and extract_job_keywords is
+already near-deterministic (temperature 0.1, fixed seed), so the keyword list
+is cached under a hash of the normalized posting text plus the model name:
+
+1. An in-memory LRU with TTL (microsecond lookups)
+2. An SQLite table that survives restarts and is shared by worker processes
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Lines that vary between copies of the same posting without changing its skills
+BOILERPLATE_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'^(?:apply|apply now|easy apply|save|share|report (?:this )?job|show more|show less|see more)$',
+        r'^(?:posted|reposted|updated) .*\bago\b',
+        r'^\d+\+? (?:applicants|people clicked apply)',
+        r'equal (?:employment )?opportunity employer',
+        r'without regard to (?:race|age|color|religion|sex|gender)',
+        r'reasonable accommodation',
+        r'(?:we|this site) uses? cookies',
+    )
+]
+
+
+def normalize_job_posting(job_posting: str) -> str:
+    """
+    Normalize a posting so trivially different copies hash the same.
+
+    Lowercases, collapses whitespace and drops boilerplate lines (apply
+    buttons, "posted 3 days ago", EEO statements, cookie banners).
+
+    Args:
+        job_posting (str): Raw job posting text
+
+    Returns:
+        Normalized posting text
+    """
+    lines = []
+    for line in job_posting.splitlines():
+        line = ' '.join(line.split()).lower()
+        if not line or any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def make_keyword_key(job_posting: str, model: str) -> str:
+    """Return the cache key for a posting and model."""
+    digest = hashlib.sha256()
+    digest.update(model.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(normalize_job_posting(job_posting).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class KeywordCache:
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 1024, ttl: float = 7 * 24 * 3600):
+        """
+        Initialize the keyword cache.
+
+        Args:
+            db_path (str): SQLite file for the persistent tier (None for memory only)
+            max_entries (int): Size of the in-memory LRU
+            ttl (float): Seconds a cached keyword list stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (expires_at, keywords)
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS keyword_cache ('
+                'key TEXT PRIMARY KEY, model TEXT NOT NULL, keywords TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.execute('DELETE FROM keyword_cache WHERE expires_at < ?', (time.time(),))
+
+    def get(self, job_posting: str, model: str) -> Optional[List[str]]:
+        """
+        Look up cached keywords.
+
+        Args:
+            job_posting (str): Raw job posting text
+            model (str): Model that extracted the keywords
+
+        Returns:
+            The keyword list, or None on a miss
+        """
+        key = make_keyword_key(job_posting, model)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return list(entry[1])
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT keywords, expires_at FROM keyword_cache WHERE key = ? AND expires_at > ?',
+                    (key, now)
+                ).fetchone()
+                if row is not None:
+                    keywords = json.loads(row[0])
+                    self._remember(key, row[1], keywords)
+                    self.db_hits += 1
+                    return list(keywords)
+
+            self.misses += 1
+            return None
+
+    def put(self, job_posting: str, model: str, keywords: List[str]):
+        """
+        Store an extracted keyword list in both tiers.
+
+        Args:
+            job_posting (str): Raw job posting text
+            model (str): Model that extracted the keywords
+            keywords (List[str]): The extracted keywords
+        """
+        key = make_keyword_key(job_posting, model)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, list(keywords))
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO keyword_cache (key, model, keywords, expires_at) VALUES (?, ?, ?, ?)',
+                    (key, model, json.dumps(keywords), expires_at)
+                )
+
+    def _remember(self, key: str, expires_at: float, keywords: List[str]):
+        """Insert into the memory tier. Caller holds the lock."""
+        self._memory[key] = (expires_at, keywords)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit and miss counters."""
+        with self._lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'db_hits': self.db_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+            }
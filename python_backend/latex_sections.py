@@ -0,0 +1,140 @@
+"""
+Section-aware trimming of LaTeX documents for AI prompts.
+
+The suggestion prompts used to include the whole document, preamble and
+macro definitions included, which is thousands of tokens the model never
+edits. trim_latex_document keeps only the document body and, for documents
+split into \\section{...} blocks, only the sections that matter for the
+selected keywords (Skills, Experience, Projects, ... or any section that
+already mentions a keyword).
+
+The kept sections are verbatim slices of the original, so a target_text the
+model copies from the prompt is still a substring of the original document.
+PromptDocument.map_target checks that, and recovers targets whose whitespace
+the model changed.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+BEGIN_DOCUMENT_RE = re.compile(r'\\begin\{document\}')
+END_DOCUMENT_RE = re.compile(r'\\end\{document\}')
+SECTION_RE = re.compile(r'^[ \t]*\\section\*?\{([^}]*)\}', re.MULTILINE)
+
+# Sections where skills and keywords are usually worked in
+RELEVANT_SECTION_TITLES = re.compile(
+    r'skill|experience|employment|work|project|summary|objective|profile|qualification|technolog|expertise',
+    re.IGNORECASE
+)
+
+OMITTED_MARKER = '\n\n% [unrelated sections omitted]\n\n'
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for LaTeX/English text (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _keyword_list(keywords: Any) -> List[str]:
+    """Accept the keyword list or the old {keyword: ...} dict format."""
+    if isinstance(keywords, dict):
+        keywords = keywords.keys()
+    return [str(keyword).lower() for keyword in keywords if str(keyword).strip()]
+
+
+class PromptDocument:
+    def __init__(self, original: str, text: str, sections: List[str], omitted: List[str]):
+        """
+        A trimmed document ready to be put into a prompt.
+
+        Args:
+            original (str): The full LaTeX source
+            text (str): The trimmed text sent to the model
+            sections (List[str]): Titles of the sections kept
+            omitted (List[str]): Titles of the sections left out
+        """
+        self.original = original
+        self.text = text
+        self.sections = sections
+        self.omitted = omitted
+
+    def map_target(self, target_text: str) -> Optional[str]:
+        """
+        Map a target_text from the model back onto the original document.
+
+        Args:
+            target_text (str): Text the model wants to replace or insert after
+
+        Returns:
+            The exact matching slice of the original document (whitespace
+            differences are forgiven), or None if the target does not occur
+        """
+        if not target_text or not target_text.strip():
+            return None
+        if target_text in self.original:
+            return target_text
+
+        words = target_text.split()
+        pattern = r'\s+'.join(re.escape(word) for word in words)
+        match = re.search(pattern, self.original)
+        return match.group(0) if match else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return prompt size before and after trimming."""
+        return {
+            'document_chars': len(self.original),
+            'prompt_document_chars': len(self.text),
+            'estimated_tokens_before': estimate_tokens(self.original),
+            'estimated_tokens_after': estimate_tokens(self.text),
+            'sections_sent': self.sections,
+            'sections_omitted': self.omitted,
+        }
+
+
+def trim_latex_document(latex_content: str, keywords: Iterable[str] = ()) -> PromptDocument:
+    """
+    Drop the preamble and unrelated sections from a LaTeX document.
+
+    Args:
+        latex_content (str): Full LaTeX source
+        keywords: Selected keywords (list, or the old dict format)
+
+    Returns:
+        PromptDocument with the text to send and the mapping back to the original
+    """
+    begin = BEGIN_DOCUMENT_RE.search(latex_content)
+    if not begin:
+        # A fragment without a preamble: nothing to trim safely
+        return PromptDocument(latex_content, latex_content, [], [])
+
+    end = END_DOCUMENT_RE.search(latex_content, begin.end())
+    body_start = begin.end()
+    body_end = end.start() if end else len(latex_content)
+
+    headers = list(SECTION_RE.finditer(latex_content, body_start, body_end))
+    if not headers:
+        # Cover letters and other unsectioned documents: send the whole body
+        return PromptDocument(latex_content, latex_content[body_start:body_end].strip('\n'), [], [])
+
+    keyword_list = _keyword_list(keywords)
+    parts, sections, omitted = [], [], []
+    skipped_since_last = False
+    for i, header in enumerate(headers):
+        start = header.start()
+        stop = headers[i + 1].start() if i + 1 < len(headers) else body_end
+        title = header.group(1).strip()
+        section_text = latex_content[start:stop]
+        lowered = section_text.lower()
+        if RELEVANT_SECTION_TITLES.search(title) or any(keyword in lowered for keyword in keyword_list):
+            if parts:
+                parts.append(OMITTED_MARKER if skipped_since_last else '\n\n')
+            parts.append(section_text.strip('\n').rstrip())
+            sections.append(title)
+            skipped_since_last = False
+        else:
+            omitted.append(title)
+            skipped_since_last = True
+
+    if not sections:
+        return PromptDocument(latex_content, latex_content[body_start:body_end].strip('\n'), [], [])
+    return PromptDocument(latex_content, ''.join(parts), sections, omitted)
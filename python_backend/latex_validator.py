@@ -0,0 +1,228 @@
+"""
+Single-pass LaTeX checks for edit suggestions.
+
+The old AIAnalyzer.validate_latex_suggestion walked each text several times
+(a brace loop, one substring test per special character, a regex compiled on
+every call, a separate \\item search) and only printed its warnings.
+
+validate_suggestion returns findings shaped like the compile diagnostics
+from tex_log:
+
+    {'type': 'unbalanced_braces', 'severity': 'error', 'message': '...',
+     'field': 'replacement_text', 'position': 17}
+
+A suggestion with any 'error' finding is dropped. As before, the only error
+is a brace that does not balance in the target or the replacement, counting
+every { and }; that check only visits the braces. Everything else is a
+'warning', which is reported but never drops a suggestion, so warnings are
+only collected on request: scan_latex tokenizes a text once with a
+precompiled regex and tracks environments, math mode, comments, escapes and
+short commands as it goes. validate_suggestions checks a whole batch and
+looks at each distinct text only once.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+TOKEN_RE = re.compile(r'''
+    (?=[\\%{}$&\#_^])                                      # lets the regex engine skip plain text quickly
+    (?:\\(?:(?P<env>begin|end)\s*\{(?P<env_name>[^{}]*)\}   # environment delimiters
+          | (?:url|href)\s*\{[^{}]*\}                       # URLs may contain & % # _
+          | (?P<command>[A-Za-z@]+)\*?(?=(?P<after>.?))     # control word, peeking at the next character
+          | (?P<symbol>.?))                                 # control symbol: \& \% \\ \( \[ ...
+      | (?P<comment>%[^\n]*)                               # unescaped % comments out the rest of the line
+      | (?P<open>\{)
+      | (?P<close>\})
+      | (?P<math>\$\$?)
+      | (?P<special>[&\#_^]))
+''', re.VERBOSE | re.DOTALL)
+
+BRACE_RE = re.compile(r'[{}]')
+
+# Environments where & is a column separator
+ALIGNMENT_ENVIRONMENTS = re.compile(r'tabular|array|align|matrix|longtable|eqnarray|split|cases|alignat|tabu')
+
+# Short commands that are fine; other one- or two-letter commands are probably typos
+SHORT_COMMANDS = frozenset(['it', 'bf', 'em', 'sc', 'rm', 'tt', 'sf', 'sl', 'hl', 'ss', 'ae', 'oe', 'aa', 'AA',
+                            'AE', 'OE', 'o', 'O', 'l', 'L', 'i', 'j', 'u', 'v', 'c', 'd', 'b', 'H', 't', 'r',
+                            'k', 'P', 'S', 'pm', 'to', 'ln', 'mp'])
+
+
+class LatexScan(NamedTuple):
+    findings: List[Dict[str, Any]]  # errors and warnings found while scanning, without 'field'
+    open_environments: Tuple[str, ...]  # \begin{...} without a matching \end in the text
+    unopened_environments: Tuple[str, ...]  # \end{...} without a \begin in the text
+    math_open: bool  # the text leaves math mode open
+
+
+def _finding(kind: str, severity: str, message: str, position: int) -> Dict[str, Any]:
+    return {'type': kind, 'severity': severity, 'message': message, 'position': position}
+
+
+def scan_latex(text: str) -> LatexScan:
+    """
+    Tokenize LaTeX text once and collect brace, environment, escape and command findings.
+
+    Args:
+        text (str): LaTeX fragment (a suggestion's target or replacement)
+
+    Returns:
+        LatexScan with the findings and the environment/math state left open
+    """
+    findings = []
+    depth = 0
+    environments = []
+    unopened = []
+    math = False
+
+    for token in TOKEN_RE.finditer(text):
+        kind = token.lastgroup
+        position = token.start()
+
+        if kind == 'open':
+            depth += 1
+        elif kind == 'close':
+            if depth == 0:
+                findings.append(_finding('unbalanced_braces', 'error', 'Unmatched }', position))
+            else:
+                depth -= 1
+        elif kind == 'env_name':
+            name = token.group('env_name').strip()
+            if token.group('env') == 'begin':
+                environments.append(name)
+            elif environments and environments[-1] == name:
+                environments.pop()
+            elif environments:
+                findings.append(_finding('environment_mismatch', 'error',
+                                         f'\\end{{{name}}} closes \\begin{{{environments[-1]}}}', position))
+                environments.pop()
+            else:
+                unopened.append(name)
+        elif kind in ('command', 'after'):
+            command = token.group('command')
+            if command == 'item':
+                after = token.group('after')
+                if after and not after.isspace() and after != '[':
+                    findings.append(_finding('item_spacing', 'warning',
+                                             '\\item should be followed by a space', position))
+            elif len(command) < 3 and command not in SHORT_COMMANDS:
+                findings.append(_finding('unknown_command', 'warning',
+                                         f'Potentially invalid command \\{command}', position))
+        elif kind == 'symbol':
+            symbol = token.group('symbol')
+            if symbol in ('(', '['):
+                math = True
+            elif symbol in (')', ']'):
+                math = False
+        elif kind == 'math':
+            math = not math
+        elif kind == 'comment':
+            findings.append(_finding('unescaped_character', 'warning',
+                                     'Unescaped % comments out the rest of the line', position))
+        elif kind == 'special':
+            char = token.group('special')
+            if char in '_^' and math:
+                continue
+            if char == '&' and ('http' in text or 'www' in text
+                                or any(ALIGNMENT_ENVIRONMENTS.search(env) for env in environments)):
+                continue
+            findings.append(_finding('unescaped_character', 'warning', f'Unescaped {char}', position))
+
+    if depth:
+        findings.append(_finding('unbalanced_braces', 'error', f'{depth} unclosed {{', len(text)))
+    return LatexScan(findings, tuple(environments), tuple(unopened), math)
+
+
+def brace_error(text: str) -> Optional[Dict[str, Any]]:
+    """The unbalanced_braces error for text, counting every { and } (escaped ones too), or None."""
+    if '{' not in text and '}' not in text:
+        return None
+    depth = 0
+    for brace in BRACE_RE.finditer(text):
+        if brace.group() == '{':
+            depth += 1
+        elif depth:
+            depth -= 1
+        else:
+            return _finding('unbalanced_braces', 'error', 'Unmatched }', brace.start())
+    return _finding('unbalanced_braces', 'error', f'{depth} unclosed {{', len(text)) if depth else None
+
+
+def validate_suggestion(suggestion: Dict[str, Any],
+                        memo: Optional[Dict[Any, Any]] = None,
+                        warnings: bool = False) -> List[Dict[str, Any]]:
+    """
+    Check that applying a suggestion keeps the document valid LaTeX.
+
+    Braces must balance in both texts. With warnings, the replacement is
+    also scanned: environments and math mode it leaves open should match
+    what the target left open (for insert_after: nothing should be left
+    open), and unescaped special characters, suspicious short commands and
+    \\item without a space are reported.
+
+    Args:
+        suggestion (Dict): Suggestion with type, target_text and replacement_text
+        memo (Dict): Optional per-text results shared across a batch
+        warnings (bool): Also collect warnings, which takes a full scan of both texts
+
+    Returns:
+        List of findings, each with type, severity ('error' or 'warning'),
+        message, field and position
+    """
+    target_text = suggestion.get('target_text', '')
+    replacement_text = suggestion.get('replacement_text', '')
+    if not isinstance(target_text, str) or not isinstance(replacement_text, str):
+        return [{'type': 'invalid', 'severity': 'error', 'message': 'target_text and replacement_text must be text',
+                 'field': None, 'position': None}]
+
+    if memo is None:
+        memo = {}
+    findings = []
+    for field, text in (('target_text', target_text), ('replacement_text', replacement_text)):
+        if text not in memo:
+            memo[text] = brace_error(text)
+        if memo[text] is not None:
+            findings.append(dict(memo[text], field=field))
+    if not warnings:
+        return findings
+
+    for text in (target_text, replacement_text):
+        if ('scan', text) not in memo:
+            memo['scan', text] = scan_latex(text)
+    target, replacement = memo['scan', target_text], memo['scan', replacement_text]
+
+    # Target warnings describe the existing document, not the suggestion; brace errors are counted above
+    findings.extend(dict(finding, severity='warning', field='replacement_text')
+                    for finding in replacement.findings if finding['type'] != 'unbalanced_braces')
+    if suggestion.get('type') == 'insert_after':
+        expected = ((), (), False)
+    else:
+        expected = (target.open_environments, target.unopened_environments, target.math_open)
+    if (replacement.open_environments, replacement.unopened_environments) != expected[:2]:
+        unmatched = ([f'\\begin{{{name}}}' for name in replacement.open_environments]
+                     + [f'\\end{{{name}}}' for name in replacement.unopened_environments])
+        findings.append({'type': 'unbalanced_environment', 'severity': 'warning',
+                         'message': (f'Unmatched {", ".join(unmatched)}' if unmatched
+                                     else 'Drops environment boundaries the target text had'),
+                         'field': 'replacement_text', 'position': None})
+    if replacement.math_open != expected[2]:
+        findings.append({'type': 'unbalanced_math', 'severity': 'warning',
+                         'message': 'Unbalanced $ (escape it as \\$ for a literal dollar sign)',
+                         'field': 'replacement_text', 'position': None})
+    return findings
+
+
+def validate_suggestions(suggestions: List[Dict[str, Any]], warnings: bool = False) -> List[List[Dict[str, Any]]]:
+    """
+    Validate a batch of suggestions, looking at each distinct text once.
+
+    Returns:
+        One findings list per suggestion, in order
+    """
+    memo = {}
+    return [validate_suggestion(suggestion, memo, warnings) for suggestion in suggestions]
+
+
+def has_errors(findings: List[Dict[str, Any]]) -> bool:
+    """Whether any finding is an error (the suggestion would break the document)."""
+    return any(finding['severity'] == 'error' for finding in findings)
@@ -0,0 +1,250 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A small stand-in for prometheus_client: counters and histograms with
+labels, kept in one registry and rendered by GET /metrics. Recording is one
+lock, one bisect and two additions, so instrumenting every compile stage and
+model call costs microseconds against requests that take tens of
+milliseconds or more.
+
+The metrics the backend records are defined at the bottom of this module
+so app.py, ai.py and ai_async.py share them.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds, from sub-millisecond file operations to latexmk runs near the 30 s timeout
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        A monotonically increasing count per label combination.
+
+        Args:
+            name (str): Metric name, ending in _total
+            documentation (str): HELP text
+            labelnames (Sequence[str]): Label names, given positionally to inc()
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}  # label values -> count
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        """Add amount (default 1) to the series for labelvalues."""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f'{self.name}{_label_text(self.labelnames, labelvalues)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Observations counted into fixed buckets per label combination.
+
+        Args:
+            name (str): Metric name (base unit in the name, e.g. _seconds)
+            documentation (str): HELP text
+            labelnames (Sequence[str]): Label names, given positionally to observe()
+            buckets (Sequence[float]): Upper bounds, ascending; +Inf is added
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [per-bucket counts (last is +Inf), sum, count]
+
+    def observe(self, value: float, *labelvalues: str):
+        """Record one observation for labelvalues."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        """Observe the seconds spent in the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def snapshot(self, *labelvalues: str) -> Dict[str, Any]:
+        """Return count and sum for labelvalues (zero if never observed)."""
+        with self._lock:
+            series = self._series.get(labelvalues)
+            return {'count': series[2], 'sum': series[1]} if series else {'count': 0, 'sum': 0.0}
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((labelvalues, (list(counts), total, count))
+                           for labelvalues, (counts, total, count) in self._series.items())
+        for labelvalues, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _label_text(self.labelnames, labelvalues, ('le', _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _label_text(self.labelnames, labelvalues)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Holds metrics in registration order for rendering."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name} is already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# Compile pipeline (app.py)
+COMPILE_STAGE_SECONDS = REGISTRY.histogram(
+    'latex_compile_stage_seconds',
+    'Time spent in each stage of a /convert-latex compile',
+    ['stage'])
+COMPILE_PASSES = REGISTRY.histogram(
+    'latex_compile_passes',
+    'pdflatex runs per compile (0 when latexmk found the output up to date)',
+    ['mode'], buckets=(0, 1, 2, 3, 4, 5, 6, 8))
+COMPILES_TOTAL = REGISTRY.counter(
+    'latex_compiles_total',
+    'Compile requests by mode, cache tier and outcome',
+    ['mode', 'cache', 'outcome'])
+COMPILE_CPU_SECONDS = REGISTRY.histogram(
+    'latex_compile_cpu_seconds',
+    'User plus system CPU time of a latexmk or pdflatex run and the children it waited for',
+    ['mode'])
+COMPILE_MAX_RSS_BYTES = REGISTRY.histogram(
+    'latex_compile_max_rss_bytes',
+    'Peak resident memory of the largest process in a compile (an upper bound: includes the forked server)',
+    ['mode'], buckets=tuple(2 ** n * 1024 * 1024 for n in range(4, 13)))
+COMPILE_LIMIT_KILLS = REGISTRY.counter(
+    'latex_compile_limit_kills_total',
+    'Compiles stopped by the timeout or a resource limit',
+    ['mode', 'limit'])
+
+# Model calls (ai.py, ai_async.py)
+MODEL_CALL_SECONDS = REGISTRY.histogram(
+    'gemini_request_seconds',
+    'Gemini call latency per AIAnalyzer method and model',
+    ['method', 'model'])
+MODEL_CALLS_TOTAL = REGISTRY.counter(
+    'gemini_requests_total',
+    'Gemini calls per AIAnalyzer method and model, by outcome',
+    ['method', 'model', 'outcome'])
+MODEL_TOKENS_TOTAL = REGISTRY.counter(
+    'gemini_tokens_total',
+    'Tokens reported in Gemini usage metadata per AIAnalyzer method and model',
+    ['method', 'model', 'kind'])
+
+
+def record_compile_usage(mode: str, usage: Dict[str, Any]):
+    """
+    Record the resources one compile used, as reported by process_limits.run_limited().
+
+    Args:
+        mode (str): 'final' or 'preview'
+        usage (Dict): wall_ms, cpu_user_ms, cpu_system_ms, max_rss_kb and limit
+    """
+    if usage['cpu_user_ms'] is not None:  # None where the platform cannot report it
+        COMPILE_CPU_SECONDS.observe((usage['cpu_user_ms'] + usage['cpu_system_ms']) / 1000, mode)
+        COMPILE_MAX_RSS_BYTES.observe(usage['max_rss_kb'] * 1024, mode)
+    if usage['limit']:
+        COMPILE_LIMIT_KILLS.inc(mode, usage['limit'])
+
+
+def record_model_call(method: str, model: str, seconds: float, response: Any = None, error: bool = False):
+    """
+    Record one model call: latency, outcome and the token counts in its usage metadata.
+
+    Args:
+        method (str): AIAnalyzer method that made the call
+        model (str): Model name
+        seconds (float): Wall time of the call (for streams, until the last chunk)
+        response: Response (or last stream chunk) carrying usage_metadata, if any
+        error (bool): Whether the call raised
+    """
+    MODEL_CALL_SECONDS.observe(seconds, method, model)
+    MODEL_CALLS_TOTAL.inc(method, model, 'error' if error else 'success')
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None:
+        return
+    for kind, attribute in (('prompt', 'prompt_token_count'), ('output', 'candidates_token_count')):
+        tokens = getattr(usage, attribute, None)
+        if tokens:
+            MODEL_TOKENS_TOTAL.inc(method, model, kind, amount=tokens)
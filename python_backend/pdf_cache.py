@@ -0,0 +1,248 @@
+"""
+Content-addressed cache for compiled PDFs.
+
+The popup resends the same document after auto-saves and tab switches, so the
+backend keeps the PDFs it has already produced:
+
+1. An in-memory LRU bounded by total bytes (fast path, lost on restart)
+2. A disk tier with one file per key and size-based LRU eviction (survives restarts)
+
+Keys are a hash of the LaTeX source plus everything else that changes the
+output (engine, .latexmkrc contents), so a hit can skip latexmk completely.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(latex_content: str,
+                   engine: str = 'pdflatex',
+                   latexmkrc_path: Optional[str] = None,
+                   variant: str = 'final') -> str:
+    """
+    Build the cache key for a compile.
+
+    Args:
+        latex_content (str): Full LaTeX source
+        engine (str): TeX engine used for the compile
+        latexmkrc_path (str): Path to the .latexmkrc applied to the compile, if any
+        variant (str): Compile mode, e.g. 'final' or 'preview'
+
+    Returns:
+        Hex SHA-256 digest identifying the compile output
+    """
+    digest = hashlib.sha256()
+    digest.update(engine.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(variant.encode('utf-8'))
+    digest.update(b'\0')
+    if latexmkrc_path and os.path.exists(latexmkrc_path):
+        with open(latexmkrc_path, 'rb') as f:
+            digest.update(f.read())
+    digest.update(b'\0')
+    digest.update(latex_content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PDFCache:
+    def __init__(self,
+                 max_memory_bytes: int = 64 * 1024 * 1024,
+                 disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the two-tier PDF cache.
+
+        Args:
+            max_memory_bytes (int): Byte budget for the in-memory tier (0 disables it)
+            disk_dir (str): Directory for the disk tier (None disables it)
+            max_disk_bytes (int): Byte budget for the disk tier
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = disk_dir if max_disk_bytes > 0 else None
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> bytes, oldest first
+        self._memory_bytes = 0
+        self._disk = OrderedDict()  # key -> size, oldest first
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + '.pdf')
+
+    def _load_disk_index(self):
+        """Rebuild the disk LRU order from file modification times."""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            if not name.endswith('.pdf'):
+                # Leftover partial write from a crashed process
+                if name.endswith('.tmp'):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _evict_memory(self):
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, data = self._memory.popitem(last=False)
+            self._memory_bytes -= len(data)
+            self.memory_evictions += 1
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def _remember(self, key: str, pdf_bytes: bytes):
+        """Insert into the memory tier. Caller holds the lock."""
+        if len(pdf_bytes) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = pdf_bytes
+        self._memory_bytes += len(pdf_bytes)
+        self._evict_memory()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a compiled PDF.
+
+        Args:
+            key (str): Key from make_cache_key
+
+        Returns:
+            PDF bytes on a hit, None on a miss
+        """
+        return self.lookup(key)[0]
+
+    def lookup(self, key: str) -> Tuple[Optional[bytes], str]:
+        """
+        Look up a compiled PDF and report which tier served it.
+
+        Args:
+            key (str): Key from make_cache_key
+
+        Returns:
+            Tuple of (PDF bytes or None, 'memory', 'disk' or 'miss')
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data, 'memory'
+
+            if key in self._disk:
+                path = self._disk_path(key)
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                    os.utime(path)
+                except OSError:
+                    self._disk_bytes -= self._disk.pop(key)
+                    data = None
+                if data is not None:
+                    self._disk.move_to_end(key)
+                    self.disk_hits += 1
+                    self._remember(key, data)
+                    return data, 'disk'
+
+            self.misses += 1
+            return None, 'miss'
+
+    def disk_path(self, key: str) -> Optional[str]:
+        """
+        Return the disk tier file for a key, so it can be streamed without reading it.
+
+        Args:
+            key (str): Key from make_cache_key
+
+        Returns:
+            Path of the cached PDF, or None if it is not on disk
+        """
+        with self._lock:
+            if key not in self._disk:
+                return None
+            return self._disk_path(key)
+
+    def put(self, key: str, pdf_bytes: bytes):
+        """
+        Store a compiled PDF in both tiers.
+
+        Args:
+            key (str): Key from make_cache_key
+            pdf_bytes (bytes): The compiled PDF
+        """
+        with self._lock:
+            self._remember(key, pdf_bytes)
+
+            if not self.disk_dir or len(pdf_bytes) > self.max_disk_bytes:
+                return
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                return
+
+            # Write to a temp file and rename so readers never see a partial PDF
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(pdf_bytes)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError as e:
+                logger.warning("Failed to write PDF cache entry %s: %s", key, e)
+                return
+
+            self._disk[key] = len(pdf_bytes)
+            self._disk_bytes += len(pdf_bytes)
+            self._evict_disk()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss, eviction and size counters."""
+        with self._lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_evictions': self.memory_evictions,
+                'disk_evictions': self.disk_evictions,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'max_memory_bytes': self.max_memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes if self.disk_dir else 0,
+            }
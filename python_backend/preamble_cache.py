@@ -0,0 +1,254 @@
+"""
+Precompiled preamble format files.
+
+Resume templates spend most of their compile time loading the same
+\\usepackage preamble. Everything before \\begin{document} is dumped once
+into a .fmt file keyed by its hash, and later compiles start from that
+format so only the document body has to be typeset.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from process_limits import ProcessLimits, run_limited
+
+logger = logging.getLogger(__name__)
+
+BEGIN_DOCUMENT = '\\begin{document}'
+
+
+def split_preamble(latex_content: str) -> Tuple[str, str]:
+    """
+    Split a LaTeX document into preamble and body.
+
+    The body keeps one blank line per preamble line, so -file-line-error
+    line numbers still match the original document.
+
+    Args:
+        latex_content (str): Full LaTeX source
+
+    Returns:
+        Tuple of (preamble, padded body). The preamble is empty if the
+        document has no \\begin{document}.
+    """
+    index = latex_content.find(BEGIN_DOCUMENT)
+    if index < 0:
+        return '', latex_content
+
+    # Ignore a \begin{document} that is commented out on its line
+    line_start = latex_content.rfind('\n', 0, index) + 1
+    if '%' in latex_content[line_start:index]:
+        return '', latex_content
+
+    preamble = latex_content[:line_start]
+    body = '\n' * preamble.count('\n') + latex_content[line_start:]
+    return preamble, body
+
+
+class PreambleFormatCache:
+    def __init__(self, cache_dir: str, max_formats: int = 16, engine: str = 'pdflatex',
+                 limits: Optional[ProcessLimits] = None, failure_backoff: float = 600.0,
+                 max_failures: int = 1024):
+        """
+        Initialize the preamble format cache.
+
+        Args:
+            cache_dir (str): Directory that holds the .fmt files
+            max_formats (int): Number of formats kept before LRU eviction
+            engine (str): TeX engine the formats are built for
+            limits (ProcessLimits): Resource limits for the format builds
+            failure_backoff (float): Seconds before a preamble whose build failed is tried again
+            max_failures (int): Failed preambles remembered; the oldest are forgotten first
+        """
+        self.cache_dir = cache_dir
+        self.max_formats = max_formats
+        self.engine = engine
+        self.limits = limits
+        self.failure_backoff = failure_backoff
+        self.max_failures = max_failures
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._build_locks = {}  # format name -> lock, so each preamble is dumped once
+        self._failed = OrderedDict()  # format name -> time its build failed; compile normally until the backoff ends
+
+        self.hits = 0
+        self.builds = 0
+        self.build_failures = 0
+        self.evictions = 0
+
+        # Formats are only valid for the binary that wrote them
+        engine_path = shutil.which(engine) or engine
+        try:
+            engine_stamp = f"{engine_path}:{os.path.getmtime(engine_path)}"
+        except OSError:
+            engine_stamp = engine_path
+        self._engine_stamp = engine_stamp
+
+    def format_name(self, preamble: str) -> str:
+        """Return the format name (file stem) for a preamble."""
+        digest = hashlib.sha256()
+        digest.update(self._engine_stamp.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(preamble.encode('utf-8'))
+        return 'preamble-' + digest.hexdigest()[:32]
+
+    def _format_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name + '.fmt')
+
+    def find_format(self, preamble: str) -> Optional[str]:
+        """
+        Return the format name for a preamble if it is already built, without building it.
+
+        Args:
+            preamble (str): Everything before \\begin{document}
+        """
+        name = self.format_name(preamble)
+        if os.path.exists(self._format_path(name)):
+            with self._lock:
+                self.hits += 1
+            return name
+        return None
+
+    def get_format(self, preamble: str, env: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Return the format name for a preamble, building it on first use.
+
+        Args:
+            preamble (str): Everything before \\begin{document}
+            env (Dict): Environment for the format build
+
+        Returns:
+            Format name to pass as -fmt (with TEXFORMATS pointing at cache_dir),
+            or None if the preamble cannot be precompiled
+        """
+        name = self.format_name(preamble)
+        path = self._format_path(name)
+
+        with self._lock:
+            failed_at = self._failed.get(name)
+            if failed_at is not None:
+                if time.monotonic() - failed_at < self.failure_backoff:
+                    return None
+                del self._failed[name]  # Backoff over, a transient failure (timeout, load) gets another try
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+
+        try:
+            with build_lock:
+                if os.path.exists(path):
+                    try:
+                        os.utime(path)  # bump LRU position
+                    except OSError:
+                        pass
+                    with self._lock:
+                        self.hits += 1
+                    return name
+
+                if not self._build_format(name, preamble, env):
+                    with self._lock:
+                        self._failed[name] = time.monotonic()
+                        self._failed.move_to_end(name)
+                        while len(self._failed) > self.max_failures:
+                            self._failed.popitem(last=False)
+                        self.build_failures += 1
+                    return None
+
+                with self._lock:
+                    self.builds += 1
+        finally:
+            # Drop the lock once nobody holds it, so the dict does not grow with every preamble seen
+            with self._lock:
+                if self._build_locks.get(name) is build_lock and not build_lock.locked():
+                    del self._build_locks[name]
+        self._evict()
+        return name
+
+    def invalidate(self, preamble: str):
+        """
+        Drop the format for a preamble so the next compile rebuilds it.
+
+        Args:
+            preamble (str): Everything before \\begin{document}
+        """
+        name = self.format_name(preamble)
+        try:
+            os.remove(self._format_path(name))
+        except OSError:
+            pass
+
+    def _build_format(self, name: str, preamble: str, env: Optional[Dict[str, str]]) -> bool:
+        """Dump the preamble into <cache_dir>/<name>.fmt. Returns True on success."""
+        logger.info("Building preamble format %s", name)
+        with tempfile.TemporaryDirectory() as build_dir:
+            with open(os.path.join(build_dir, name + '.tex'), 'w', encoding='utf-8') as f:
+                f.write(preamble)
+
+            cmd = [
+                self.engine,
+                '-ini',
+                '-interaction=nonstopmode',
+                '-halt-on-error',
+                '-shell-escape',
+                '-jobname=' + name,
+                f'&{self.engine} {name}.tex\\dump',
+            ]
+            try:
+                result, _ = run_limited(cmd, self.limits, timeout=60, cwd=build_dir, env=env)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning("Preamble format build failed: %s", e)
+                return False
+
+            built = os.path.join(build_dir, name + '.fmt')
+            if result.returncode != 0 or not os.path.exists(built):
+                logger.warning("Preamble format build failed (code %s): %s", result.returncode, result.stdout[-500:])
+                return False
+
+            # Atomic rename so concurrent compiles never load a half-written format
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            os.close(fd)
+            shutil.copyfile(built, tmp_path)
+            os.replace(tmp_path, self._format_path(name))
+        return True
+
+    def _evict(self):
+        """Remove least recently used formats beyond max_formats."""
+        formats = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.fmt'):
+                try:
+                    formats.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+
+        formats.sort()
+        recent = time.time() - 60
+        for mtime, path in formats[:max(0, len(formats) - self.max_formats)]:
+            if mtime > recent:
+                # May be loading in a running compile right now
+                continue
+            try:
+                os.remove(path)
+                with self._lock:
+                    self.evictions += 1
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, build and eviction counters."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'builds': self.builds,
+                'build_failures': self.build_failures,
+                'failed_preambles': len(self._failed),
+                'evictions': self.evictions,
+                'max_formats': self.max_formats,
+            }
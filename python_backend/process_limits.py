@@ -0,0 +1,233 @@
+"""
+Process-group isolation and resource limits for TeX runs.
+
+subprocess.run(..., timeout=30) kills only the process it started: latexmk
+dies, while the pdflatex, biber or -shell-escape children it spawned keep
+running. Nothing bounds their CPU time, memory or output either, so one
+pathological document can starve every other compile on the host.
+
+run_limited() starts the command as the leader of a new session and process
+group and sets rlimits on it with prlimit(), which its children inherit.
+The limits are set right after exec rather than in a preexec_fn, which is
+unsafe in a threaded server (and would stop CPython from spawning with vfork);
+latexmk takes far longer to start pdflatex than that window.
+
+- RLIMIT_CPU: CPU seconds per process (SIGXCPU, then SIGKILL a second later)
+- RLIMIT_AS: address space per process, so runaway allocations fail
+- RLIMIT_FSIZE: largest file a process may write (SIGXFSZ), which bounds
+  runaway .log and .pdf output
+- RLIMIT_NPROC: processes and threads of the user, which stops fork bombs.
+  Linux counts every process of the user, including the server's own
+  threads, and does not enforce it for root.
+
+On timeout, the whole group is killed, not just its leader. After a normal
+exit, anything the run left behind in its group is killed as well. Usage is
+read from wait4(), which covers the command and the children it waited for
+(latexmk waits for each pdflatex run). Linux carries the server's own peak
+resident set over into the child it spawns, so max_rss_kb is an upper bound:
+it only tells the TeX run's peak apart once that exceeds the server's.
+
+The rlimits need resource.prlimit(), which only Linux has; elsewhere
+RLIMITS_SUPPORTED is False and ProcessLimits sets nothing. Without
+os.waitid() (macOS) the run is reaped with wait4() before its leftover
+children are killed. Without os.wait4() and os.killpg() (Windows) the
+command is waited for and killed like subprocess.run(timeout=...) does, so
+its children are not killed with it, and cpu and max_rss usage are None.
+"""
+
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RLIMITS_SUPPORTED = hasattr(resource, 'prlimit')
+_WAIT_WITHOUT_REAP = hasattr(os, 'waitid') and hasattr(os, 'WNOWAIT')
+_PROCESS_GROUPS = hasattr(os, 'killpg') and hasattr(os, 'wait4')
+
+# Signals that mean the kernel enforced a limit
+LIMIT_SIGNALS = {getattr(signal, name): limit for name, limit in (
+    ('SIGXCPU', 'cpu'),
+    ('SIGXFSZ', 'file_size'),
+) if hasattr(signal, name)}
+
+
+class ProcessLimits:
+    def __init__(self,
+                 cpu_seconds: int = 30,
+                 memory_bytes: int = 2 * 1024 * 1024 * 1024,
+                 file_size_bytes: int = 64 * 1024 * 1024,
+                 max_processes: int = 512):
+        """
+        Resource limits applied to each process of a run. 0 leaves a limit unset,
+        and none are set where RLIMITS_SUPPORTED is False.
+
+        Args:
+            cpu_seconds (int): CPU seconds per process (RLIMIT_CPU)
+            memory_bytes (int): Address space per process (RLIMIT_AS)
+            file_size_bytes (int): Largest file a process may write (RLIMIT_FSIZE)
+            max_processes (int): Processes and threads of the user (RLIMIT_NPROC)
+        """
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.file_size_bytes = file_size_bytes
+        self.max_processes = max_processes
+        self._rlimits = []
+        if RLIMITS_SUPPORTED:
+            # The CPU hard limit is a second past the soft one, so SIGXCPU (not SIGKILL) says which limit it was.
+            self._rlimits = [(limit, (soft, hard)) for limit, soft, hard in (
+                (resource.RLIMIT_CPU, cpu_seconds, cpu_seconds + 1),
+                (resource.RLIMIT_AS, memory_bytes, memory_bytes),
+                (resource.RLIMIT_FSIZE, file_size_bytes, file_size_bytes),
+                (resource.RLIMIT_NPROC, max_processes, max_processes),
+            ) if soft]
+
+    def apply(self, pid: int):
+        """Set the limits on process pid."""
+        for limit, values in self._rlimits:
+            current_hard = resource.prlimit(pid, limit)[1]
+            if current_hard != resource.RLIM_INFINITY:
+                # An unprivileged process cannot raise its hard limit
+                values = (min(values[0], current_hard), min(values[1], current_hard))
+            resource.prlimit(pid, limit, values)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            'cpu_seconds': self.cpu_seconds,
+            'memory_bytes': self.memory_bytes,
+            'file_size_bytes': self.file_size_bytes,
+            'max_processes': self.max_processes,
+        }
+
+
+class LimitedRunTimeout(subprocess.TimeoutExpired):
+    """The run timed out and its whole process group was killed; usage holds what it used."""
+
+    def __init__(self, cmd, timeout, output=None, stderr=None, usage=None):
+        super().__init__(cmd, timeout, output=output, stderr=stderr)
+        self.usage = usage
+
+
+def _kill_group(process: subprocess.Popen):
+    """Kill the process group led by process, or just process where there are no process groups."""
+    if not _PROCESS_GROUPS:
+        process.kill()
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _wait(process: subprocess.Popen) -> Tuple[int, Optional[Any]]:
+    """Wait for process to exit, kill what is left of its group and reap it. Returns (returncode, rusage)."""
+    rusage = None
+    try:
+        if _WAIT_WITHOUT_REAP:
+            # Wait without reaping, so the group id cannot be reused before the stragglers are killed
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+        elif _PROCESS_GROUPS:
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        else:
+            process.wait()
+    finally:
+        _kill_group(process)  # Leftover children, or everything if the wait was interrupted
+        if process.returncode is None:
+            if _PROCESS_GROUPS:
+                _, status, rusage = os.wait4(process.pid, 0)
+                process.returncode = os.waitstatus_to_exitcode(status)
+            else:
+                process.wait()
+    return process.returncode, rusage
+
+
+def _signal_name(signum: int) -> str:
+    try:
+        return signal.Signals(signum).name
+    except ValueError:
+        return str(signum)
+
+
+def _read_output(file) -> str:
+    file.seek(0)
+    return file.read().decode('utf-8', errors='replace')
+
+
+def run_limited(cmd: List[str],
+                limits: Optional[ProcessLimits],
+                timeout: float,
+                cwd: Optional[str] = None,
+                env: Optional[Dict[str, str]] = None) -> Tuple[subprocess.CompletedProcess, Dict[str, Any]]:
+    """
+    Run cmd in its own process group with limits applied, like subprocess.run(capture_output=True, text=True).
+
+    Output goes to unnamed temp files in cwd rather than pipes, so nothing has
+    to drain them while waiting, and RLIMIT_FSIZE bounds them too.
+
+    Args:
+        cmd (List[str]): Command to run
+        limits (ProcessLimits): Limits for the command and its children, or None for none
+        timeout (float): Seconds before the whole process group is killed
+        cwd (str): Working directory
+        env (Dict): Environment
+
+    Returns:
+        (CompletedProcess, usage) where usage has wall_ms, cpu_user_ms, cpu_system_ms,
+        max_rss_kb (None where there is no os.wait4), signal (name, if killed by one)
+        and limit ('cpu', 'file_size', 'timeout' or None)
+
+    Raises:
+        LimitedRunTimeout: If the run took longer than timeout
+        OSError: If the command could not be started
+    """
+    with tempfile.TemporaryFile(dir=cwd) as stdout_file, tempfile.TemporaryFile(dir=cwd) as stderr_file:
+        start = time.perf_counter()
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=stdout_file, stderr=stderr_file,
+                                   cwd=cwd, env=env, start_new_session=True)
+        if limits is not None:
+            try:
+                limits.apply(process.pid)
+            except ProcessLookupError:
+                pass  # Exited already
+            except BaseException:
+                _kill_group(process)
+                process.wait()
+                raise
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            _kill_group(process)
+
+        timer = threading.Timer(timeout, on_timeout)
+        timer.daemon = True
+        timer.start()
+        try:
+            _, rusage = _wait(process)
+        finally:
+            timer.cancel()
+        wall = time.perf_counter() - start
+
+        killed_by = -process.returncode if process.returncode < 0 else None
+        usage = {
+            'wall_ms': wall * 1000,
+            'cpu_user_ms': rusage.ru_utime * 1000 if rusage else None,
+            'cpu_system_ms': rusage.ru_stime * 1000 if rusage else None,
+            'max_rss_kb': rusage.ru_maxrss if rusage else None,
+            'signal': _signal_name(killed_by) if killed_by else None,
+            'limit': 'timeout' if timed_out.is_set() else LIMIT_SIGNALS.get(killed_by),
+        }
+        stdout = _read_output(stdout_file)
+        stderr = _read_output(stderr_file)
+
+    if timed_out.is_set():
+        raise LimitedRunTimeout(cmd, timeout, output=stdout, stderr=stderr, usage=usage)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr), usage
@@ -0,0 +1,185 @@
+"""
+Preallocated scratch directories for throwaway compiles.
+
+A compile without a document id used to create a temp dir on the default
+filesystem, write the .tex, copy .latexmkrc in, read the PDF back and delete
+the whole tree, all on the request path. ScratchPool keeps a fixed set of
+empty directories under a RAM-backed root (/dev/shm when it is available),
+hands one out per compile and empties it on a background thread afterwards,
+so a compile neither waits for directory setup nor for the rmtree.
+
+/dev/shm is only used when it has room for every pooled directory at its
+per-compile budget: Docker's default /dev/shm is 64 MB, which a few compiles
+writing font caches would fill, failing with ENOSPC.
+
+Each process gets its own subdirectory of the root, named after its pid, so
+several server workers can share one root. Subdirectories left behind by
+processes that are no longer running are removed at startup.
+"""
+
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DIR_PREFIX = 'latex_resume_scratch-'
+
+
+def default_scratch_root(required_bytes: int = 0) -> str:
+    """/dev/shm when it is a writable directory with required_bytes free, else the system temp dir."""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK | os.X_OK):
+        stat = os.statvfs('/dev/shm')
+        free_bytes = stat.f_bavail * stat.f_frsize
+        if free_bytes >= required_bytes:
+            return '/dev/shm'
+        logger.warning("/dev/shm has %d MB free, less than the %d MB the scratch pool needs; using %s instead",
+                       free_bytes // (1024 * 1024), required_bytes // (1024 * 1024), tempfile.gettempdir())
+    return tempfile.gettempdir()
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Someone else's process
+    return True
+
+
+def _empty_directory(path: str):
+    """Remove everything inside path, keeping path itself."""
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+class ScratchPool:
+    def __init__(self, root_dir: Optional[str] = None, size: int = 4,
+                 budget_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the pool and preallocate its directories.
+
+        Args:
+            root_dir (str): Directory to create scratch space in (default: /dev/shm if it has room, else the temp dir)
+            size (int): Empty directories kept ready; more are made on demand when all are in use
+            budget_bytes (int): Space one compile may need, font cache overlay included; with the
+                default root, /dev/shm must have size * budget_bytes free
+        """
+        self.root_dir = root_dir or default_scratch_root(size * budget_bytes)
+        self.size = size
+        self.budget_bytes = budget_bytes
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._remove_orphans()
+        self.base_dir = os.path.join(self.root_dir, f'{DIR_PREFIX}{os.getpid()}')
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+        os.makedirs(self.base_dir)
+
+        self._lock = threading.Lock()
+        self._free = deque()
+        self._next_index = 0
+        self.in_use = 0
+        self.reused = 0
+        self.overflows = 0
+        self.cleanup_errors = 0
+
+        for _ in range(size):
+            self._free.append(self._new_directory())
+
+        self._cleanup_queue = queue.Queue()
+        self._cleaner = threading.Thread(target=self._cleanup_loop, name='scratch-cleanup', daemon=True)
+        self._cleaner.start()
+
+    def _remove_orphans(self):
+        """Delete scratch trees of processes that exited without cleaning up."""
+        for entry in os.scandir(self.root_dir):
+            pid = entry.name[len(DIR_PREFIX):]
+            if entry.is_dir() and entry.name.startswith(DIR_PREFIX) and pid.isdigit() and not _pid_running(int(pid)):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _new_directory(self) -> str:
+        with self._lock:
+            self._next_index += 1
+            index = self._next_index
+        path = os.path.join(self.base_dir, str(index))
+        os.mkdir(path)
+        return path
+
+    @contextmanager
+    def acquire(self) -> Iterator[str]:
+        """
+        Check out an empty scratch directory for one compile.
+
+        The directory is emptied in the background after the with block and
+        then handed out again.
+
+        Yields:
+            Path of the scratch directory
+        """
+        with self._lock:
+            path = self._free.popleft() if self._free else None
+            self.in_use += 1
+            if path is not None:
+                self.reused += 1
+            else:
+                self.overflows += 1
+        if path is None:
+            path = self._new_directory()
+
+        try:
+            yield path
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._cleanup_queue.put(path)
+
+    def _cleanup_loop(self):
+        while True:
+            path = self._cleanup_queue.get()
+            try:
+                with self._lock:
+                    keep = len(self._free) < self.size
+                if keep:
+                    _empty_directory(path)
+                    with self._lock:
+                        self._free.append(path)
+                else:
+                    shutil.rmtree(path, ignore_errors=True)  # An overflow directory past the pool size
+            except OSError:
+                logger.exception("Could not clean scratch directory %s", path)
+                with self._lock:
+                    self.cleanup_errors += 1
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._cleanup_queue.task_done()
+
+    def wait_for_cleanup(self):
+        """Block until every released directory has been emptied."""
+        self._cleanup_queue.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, directories ready and in use, and reuse counters."""
+        with self._lock:
+            return {
+                'root_dir': self.root_dir,
+                'size': self.size,
+                'ready': len(self._free),
+                'in_use': self.in_use,
+                'pending_cleanup': self._cleanup_queue.unfinished_tasks,
+                'reused': self.reused,
+                'overflows': self.overflows,
+                'cleanup_errors': self.cleanup_errors,
+            }
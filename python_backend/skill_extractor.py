@@ -0,0 +1,299 @@
+"""
+Local, deterministic keyword extraction from job postings.
+
+extract_job_keywords depends on a Gemini round trip and comes back empty when
+the API is slow or down. SkillExtractor finds skills from a curated
+dictionary (canonical name -> synonyms) without any network call:
+
+1. The posting is lowercased and split into tokens with one regex
+   ("c++", "c#", ".net" and "node.js" stay whole; "/" and "-" split words)
+2. An Aho-Corasick automaton over token sequences finds every synonym in a
+   single pass, longest match first at each position
+3. Skills are ranked by how often they are mentioned, then by first mention
+
+A typical posting takes well under a millisecond, so the result can be shown
+instantly while Gemini refines the list, and used when Gemini fails.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r'\.?[a-z0-9](?:[a-z0-9+#.]*[a-z0-9+#])?')
+
+# Canonical name -> synonyms (matched case-insensitively, on whole tokens). The
+# canonical name is not matched by itself, so ambiguous words ("go", "r",
+# "excel", "rest", "express") are only listed in unambiguous phrases.
+SKILLS: Dict[str, List[str]] = {
+    # Languages
+    'Python': ['python', 'python3'],
+    'Java': ['java'],
+    'JavaScript': ['javascript', 'js', 'ecmascript', 'es6'],
+    'TypeScript': ['typescript', 'ts'],
+    'C++': ['c++', 'cpp'],
+    'C#': ['c#', 'csharp', 'c sharp'],
+    'C': ['c programming', 'ansi c', 'embedded c'],
+    'Go': ['golang', 'go language', 'go lang'],
+    'Rust': ['rust'],
+    'Ruby': ['ruby'],
+    'PHP': ['php'],
+    'Kotlin': ['kotlin'],
+    'Swift': ['swift', 'swiftui'],
+    'Objective-C': ['objective-c', 'objective c', 'objc'],
+    'Scala': ['scala'],
+    'R': ['r programming', 'r language', 'rstudio'],
+    'MATLAB': ['matlab'],
+    'Perl': ['perl'],
+    'Haskell': ['haskell'],
+    'Elixir': ['elixir'],
+    'Dart': ['dart'],
+    'Lua': ['lua'],
+    'Bash': ['bash', 'shell scripting', 'shell script', 'shell scripts'],
+    'PowerShell': ['powershell'],
+    'SQL': ['sql'],
+    'HTML': ['html', 'html5'],
+    'CSS': ['css', 'css3'],
+    'Sass': ['sass', 'scss'],
+    'Solidity': ['solidity'],
+    'Verilog': ['verilog', 'systemverilog'],
+    'VHDL': ['vhdl'],
+    # Frontend
+    'React': ['react', 'react.js', 'reactjs', 'react js'],
+    'React Native': ['react native'],
+    'Angular': ['angular', 'angularjs', 'angular.js'],
+    'Vue.js': ['vue', 'vue.js', 'vuejs'],
+    'Next.js': ['next.js', 'nextjs'],
+    'Svelte': ['svelte', 'sveltekit'],
+    'Redux': ['redux'],
+    'Tailwind CSS': ['tailwind', 'tailwindcss', 'tailwind css'],
+    'Bootstrap': ['bootstrap'],
+    'jQuery': ['jquery'],
+    'Webpack': ['webpack'],
+    'Flutter': ['flutter'],
+    # Backend
+    'Node.js': ['node.js', 'nodejs', 'node js'],
+    'Express': ['express.js', 'expressjs'],
+    'Django': ['django'],
+    'Flask': ['flask'],
+    'FastAPI': ['fastapi'],
+    'Spring Boot': ['spring boot', 'springboot'],
+    'Spring': ['spring framework', 'spring mvc'],
+    'Ruby on Rails': ['ruby on rails', 'rails'],
+    '.NET': ['.net', 'dotnet', '.net core', 'asp.net'],
+    'Laravel': ['laravel'],
+    'GraphQL': ['graphql'],
+    'REST APIs': ['restful', 'rest api', 'rest apis', 'restful api', 'restful apis'],
+    'gRPC': ['grpc'],
+    'Microservices': ['microservices', 'microservice', 'micro services'],
+    # Data stores
+    'PostgreSQL': ['postgresql', 'postgres'],
+    'MySQL': ['mysql'],
+    'SQLite': ['sqlite'],
+    'Microsoft SQL Server': ['sql server', 'mssql', 't-sql', 'tsql'],
+    'Oracle Database': ['oracle database', 'oracle db', 'pl/sql', 'plsql'],
+    'MongoDB': ['mongodb', 'mongo'],
+    'Redis': ['redis'],
+    'Cassandra': ['cassandra'],
+    'DynamoDB': ['dynamodb'],
+    'Elasticsearch': ['elasticsearch', 'elastic search', 'opensearch'],
+    'Snowflake': ['snowflake'],
+    'BigQuery': ['bigquery', 'big query'],
+    'Redshift': ['redshift'],
+    'NoSQL': ['nosql'],
+    # Cloud and infrastructure
+    'AWS': ['aws', 'amazon web services'],
+    'Azure': ['azure', 'microsoft azure'],
+    'Google Cloud': ['gcp', 'google cloud', 'google cloud platform'],
+    'Docker': ['docker', 'dockerfile', 'containerization', 'containerized'],
+    'Kubernetes': ['kubernetes', 'k8s', 'eks', 'gke', 'aks'],
+    'Terraform': ['terraform'],
+    'Ansible': ['ansible'],
+    'Helm': ['helm'],
+    'Linux': ['linux', 'unix'],
+    'Serverless': ['serverless', 'aws lambda', 'lambda functions', 'cloud functions'],
+    'CI/CD': ['ci/cd', 'ci cd', 'cicd', 'continuous integration', 'continuous delivery', 'continuous deployment'],
+    'Jenkins': ['jenkins'],
+    'GitHub Actions': ['github actions'],
+    'GitLab CI': ['gitlab ci', 'gitlab'],
+    'Git': ['git', 'github', 'version control'],
+    'Nginx': ['nginx'],
+    'Kafka': ['kafka', 'apache kafka'],
+    'RabbitMQ': ['rabbitmq'],
+    'Prometheus': ['prometheus'],
+    'Grafana': ['grafana'],
+    'Datadog': ['datadog'],
+    # Data and machine learning
+    'Machine Learning': ['machine learning', 'ml'],
+    'Deep Learning': ['deep learning', 'neural networks', 'neural network'],
+    'Artificial Intelligence': ['artificial intelligence', 'ai'],
+    'Natural Language Processing': ['natural language processing', 'nlp'],
+    'Computer Vision': ['computer vision', 'opencv'],
+    'Large Language Models': ['large language models', 'large language model', 'llm', 'llms', 'generative ai', 'genai'],
+    'TensorFlow': ['tensorflow'],
+    'PyTorch': ['pytorch', 'torch'],
+    'Keras': ['keras'],
+    'scikit-learn': ['scikit-learn', 'sklearn', 'scikit learn'],
+    'Pandas': ['pandas'],
+    'NumPy': ['numpy'],
+    'Spark': ['spark', 'apache spark', 'pyspark'],
+    'Hadoop': ['hadoop', 'hdfs'],
+    'Airflow': ['airflow', 'apache airflow'],
+    'dbt': ['dbt'],
+    'ETL': ['etl', 'elt', 'data pipelines', 'data pipeline'],
+    'Data Analysis': ['data analysis', 'data analytics'],
+    'Data Visualization': ['data visualization', 'data visualisation'],
+    'Statistics': ['statistics', 'statistical analysis', 'statistical modeling'],
+    'Tableau': ['tableau'],
+    'Power BI': ['power bi', 'powerbi'],
+    'Excel': ['microsoft excel', 'ms excel', 'excel spreadsheets', 'advanced excel'],
+    'A/B Testing': ['a/b testing', 'ab testing', 'a/b tests', 'experimentation'],
+    # Practices
+    'Agile': ['agile', 'agile methodology', 'agile methodologies'],
+    'Scrum': ['scrum'],
+    'Kanban': ['kanban'],
+    'Test-Driven Development': ['test-driven development', 'test driven development', 'tdd'],
+    'Unit Testing': ['unit testing', 'unit tests', 'automated testing', 'test automation'],
+    'Object-Oriented Programming': ['object-oriented programming', 'object oriented programming', 'oop',
+                                    'object-oriented design', 'object oriented design'],
+    'Data Structures and Algorithms': ['data structures', 'algorithms'],
+    'System Design': ['system design', 'distributed systems', 'scalable systems'],
+    'DevOps': ['devops'],
+    'Site Reliability Engineering': ['site reliability engineering', 'sre'],
+    'Infrastructure as Code': ['infrastructure as code', 'iac'],
+    'Security': ['cybersecurity', 'application security', 'security engineering', 'owasp'],
+    'OAuth': ['oauth', 'oauth2', 'openid connect', 'oidc'],
+    'Accessibility': ['accessibility', 'wcag', 'a11y'],
+    'UI/UX Design': ['ui/ux', 'ux design', 'ui design', 'user experience'],
+    'Figma': ['figma'],
+    'Jira': ['jira'],
+    'Selenium': ['selenium'],
+    'Cypress': ['cypress'],
+    'Jest': ['jest'],
+    'pytest': ['pytest'],
+    'Android': ['android'],
+    'iOS': ['ios'],
+    'Embedded Systems': ['embedded systems', 'embedded software', 'firmware'],
+    'Blockchain': ['blockchain', 'web3'],
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split lowercased text into skill tokens."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillExtractor:
+    def __init__(self, skills: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        Build the Aho-Corasick automaton over the skill synonyms.
+
+        Args:
+            skills (Dict): Canonical name -> synonyms (defaults to SKILLS)
+        """
+        skills = SKILLS if skills is None else skills
+
+        # Node 0 is the root. goto[node] maps a token to the next node, fail[node]
+        # is the longest proper suffix that is also a trie node, and output[node]
+        # is the (length, canonical name) of the longest synonym ending there.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[Tuple[int, str]]] = [None]
+
+        for canonical, synonyms in skills.items():
+            for synonym in synonyms:
+                tokens = tokenize(synonym)
+                if tokens:
+                    self._add(tokens, canonical)
+        self._link()
+
+    def _add(self, tokens: List[str], canonical: str):
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            node = next_node
+        if self._output[node] is None:
+            self._output[node] = (len(tokens), canonical)
+
+    def _link(self):
+        """Compute failure links breadth first, and inherit outputs along them."""
+        queue = deque(self._goto[0].values())  # children of the root fail back to the root
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
+
+    def matches(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Find skill mentions in one pass.
+
+        Args:
+            text (str): Job posting text
+
+        Returns:
+            List of (token position, canonical name); overlapping mentions keep the longest
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}  # start position -> (length, canonical)
+        node = 0
+        for position, token in enumerate(tokenize(text)):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            match = output[node]
+            if match is not None:
+                start = position - match[0] + 1
+                if start not in found or found[start][0] < match[0]:
+                    found[start] = match
+
+        # Leftmost-longest, without overlaps ("react" inside "react native" is not a second mention)
+        results = []
+        covered_until = -1
+        for start in sorted(found):
+            length, canonical = found[start]
+            if start <= covered_until:
+                continue
+            results.append((start, canonical))
+            covered_until = start + length - 1
+        return results
+
+    def extract(self, job_posting: str, max_keywords: int = 10) -> List[str]:
+        """
+        Extract the most mentioned skills from a posting.
+
+        Args:
+            job_posting (str): Job posting text
+            max_keywords (int): Maximum number of skills returned
+
+        Returns:
+            Canonical skill names, most frequent first (ties: first mentioned first)
+        """
+        counts = {}
+        first_seen = {}
+        for position, canonical in self.matches(job_posting):
+            counts[canonical] = counts.get(canonical, 0) + 1
+            first_seen.setdefault(canonical, position)
+        ranked = sorted(counts, key=lambda canonical: (-counts[canonical], first_seen[canonical]))
+        return ranked[:max_keywords]
+
+
+_default_extractor = None
+
+
+def extract_skill_keywords(job_posting: str, max_keywords: int = 10) -> List[str]:
+    """Extract skills with the shared default extractor (built on first use)."""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = SkillExtractor()
+    return _default_extractor.extract(job_posting, max_keywords)
@@ -0,0 +1,188 @@
+"""
+Server-side application of edit suggestions.
+
+Suggestions are target_text / replacement_text pairs. Applying them one at a
+time with str.replace rescans and copies the whole document per suggestion,
+and a suggestion whose target was already rewritten by an earlier one
+silently lands somewhere else (or nowhere).
+
+DocumentIndex scans the document once: line start offsets for mapping
+character offsets to line numbers, and (on first use) a whitespace-collapsed
+copy with an offset map so targets whose spacing or line breaks differ from
+the document are still found. apply_suggestions resolves every suggestion to a character
+range, rejects ranges that overlap an edit already accepted, and builds the
+result in a single pass over the sorted ranges.
+
+A target means its first occurrence, as with str.replace in the popup. Only
+when that occurrence is taken and a later one sits on an identical line, so
+the target never pointed at either, does the suggestion move there.
+"""
+
+import bisect
+import re
+from typing import Any, Dict, Iterator, List, Tuple
+
+SUPPORTED_TYPES = ('replace', 'insert_after')
+
+NEWLINE_RE = re.compile(r'\n')
+WORD_RE = re.compile(r'\S+')
+
+
+class DocumentIndex:
+    def __init__(self, content: str):
+        """
+        Index a document for target lookups.
+
+        Args:
+            content (str): The LaTeX source the suggestions refer to
+        """
+        self.content = content
+        self.line_starts = [0] + [match.end() for match in NEWLINE_RE.finditer(content)]
+        self._collapsed = None  # built on the first whitespace-insensitive lookup
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def lines_around(self, start: int, end: int) -> str:
+        """The whole lines that [start, end) touches, without surrounding whitespace."""
+        last_line = self.line_of(max(start, end - 1))
+        line_end = self.line_starts[last_line] if last_line < len(self.line_starts) else len(self.content)
+        return self.content[self.line_starts[self.line_of(start) - 1]:line_end].strip()
+
+    def _collapsed_index(self) -> Tuple[str, List[int], List[int]]:
+        """The document with whitespace runs collapsed to one space, and where each word starts in both texts."""
+        if self._collapsed is None:
+            words = list(WORD_RE.finditer(self.content))
+            collapsed_starts, position = [], 0
+            for match in words:
+                collapsed_starts.append(position)
+                position += len(match.group(0)) + 1
+            self._collapsed = (' '.join(match.group(0) for match in words),
+                               collapsed_starts,
+                               [match.start() for match in words])
+        return self._collapsed
+
+    def occurrences(self, target: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (start, end, match) for every occurrence of target, in document order.
+
+        Exact occurrences come first (match='exact'); if there are none, the
+        whitespace-insensitive ones (match='whitespace').
+        """
+        found = False
+        position = self.content.find(target)
+        while position != -1:
+            found = True
+            yield position, position + len(target), 'exact'
+            position = self.content.find(target, position + 1)
+        if found:
+            return
+
+        collapsed, collapsed_starts, starts = self._collapsed_index()
+        collapsed_target = ' '.join(target.split())
+        position = collapsed.find(collapsed_target)
+        while position != -1:
+            # Both ends of the match fall inside words, which are verbatim in the original
+            first = bisect.bisect_right(collapsed_starts, position) - 1
+            last_char = position + len(collapsed_target) - 1
+            last = bisect.bisect_right(collapsed_starts, last_char) - 1
+            yield (starts[first] + position - collapsed_starts[first],
+                   starts[last] + last_char - collapsed_starts[last] + 1,
+                   'whitespace')
+            position = collapsed.find(collapsed_target, position + 1)
+
+
+def _overlaps(accepted: List[Tuple[int, int]], start: int, end: int) -> bool:
+    """
+    Whether [start, end) overlaps an accepted range.
+
+    accepted is sorted and non-overlapping, so its end offsets are sorted too
+    and only the last range starting before end needs checking. Insertions
+    are empty ranges: they only conflict with a replacement that strictly
+    contains them.
+    """
+    i = bisect.bisect_left(accepted, (end,))
+    return i > 0 and accepted[i - 1][1] > start
+
+
+def apply_suggestions(content: str, suggestions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply edit suggestions to a document.
+
+    Suggestions are considered in the given order and apply to the first
+    occurrence of their target. One whose occurrence overlaps an edit already
+    accepted is skipped, unless a later occurrence on an identical line is
+    free, since such a target never singled out one of them. insert_after inserts a newline followed by the
+    replacement text, as the popup does.
+
+    Args:
+        content (str): Document the suggestions were generated for
+        suggestions (List[Dict]): Suggestions with id, type, target_text and replacement_text
+
+    Returns:
+        Dict with the edited content, the applied edits (id, type, match,
+        start/end offsets and start/end lines in the original document) in
+        document order, and the skipped suggestions with a reason
+        ('invalid', 'not_found' or 'overlap')
+    """
+    index = DocumentIndex(content)
+    accepted = []  # sorted (start, end) ranges
+    edits = []  # (start, end, order, text)
+    applied, skipped = [], []
+
+    for order, suggestion in enumerate(suggestions):
+        suggestion_id = suggestion.get('id', order) if isinstance(suggestion, dict) else order
+        edit = _resolve(index, accepted, suggestion)
+        if isinstance(edit, str):
+            skipped.append({'id': suggestion_id, 'reason': edit})
+            continue
+
+        start, end, match = edit
+        if suggestion['type'] == 'insert_after':
+            edit_range, text = (end, end), '\n' + suggestion['replacement_text']
+        else:
+            edit_range, text = (start, end), suggestion['replacement_text']
+        bisect.insort(accepted, edit_range)
+        edits.append((*edit_range, order, text))
+        applied.append({
+            'id': suggestion_id,
+            'type': suggestion['type'],
+            'match': match,
+            'start': start,
+            'end': end,
+            'start_line': index.line_of(start),
+            'end_line': index.line_of(max(start, end - 1)),
+        })
+
+    edits.sort()
+    parts, position = [], 0
+    for start, end, _, text in edits:
+        parts.append(content[position:start])
+        parts.append(text)
+        position = end
+    parts.append(content[position:])
+
+    applied.sort(key=lambda edit: (edit['start'], edit['end']))
+    return {'content': ''.join(parts), 'applied': applied, 'skipped': skipped}
+
+
+def _resolve(index: DocumentIndex, accepted: List[Tuple[int, int]],
+             suggestion: Any) -> Any:
+    """Return (start, end, match) for the occurrence of a suggestion's target to edit, or a skip reason."""
+    if (not isinstance(suggestion, dict) or suggestion.get('type') not in SUPPORTED_TYPES
+            or not isinstance(suggestion.get('replacement_text'), str)
+            or not isinstance(suggestion.get('target_text'), str) or not suggestion['target_text'].strip()):
+        return 'invalid'
+
+    meant_lines = None
+    for start, end, match in index.occurrences(suggestion['target_text']):
+        lines = index.lines_around(start, end)
+        if meant_lines is None:
+            meant_lines = lines
+        elif lines != meant_lines:
+            continue  # Another place the model did not point at
+        point = (end, end) if suggestion['type'] == 'insert_after' else (start, end)
+        if not _overlaps(accepted, *point):
+            return start, end, match
+    return 'not_found' if meant_lines is None else 'overlap'
@@ -0,0 +1,86 @@
+"""
+Cache for per-keyword edit suggestions.
+
+Resume suggestions are generated with one Gemini call per selected keyword
+(see AIAnalyzer.generate_resume_suggestions), and each call's validated
+suggestions are cached under a hash of the document, the keyword and the
+model. Re-running with one keyword added or removed then costs at most one
+new call; everything else is served from memory.
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+def make_suggestion_key(document_content: str, keyword: str, model: str, document_type: str = 'resume') -> str:
+    """Return the cache key for one keyword's suggestions on a document."""
+    digest = hashlib.sha256()
+    for part in (model, document_type, keyword.strip().lower()):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(document_content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SuggestionCache:
+    def __init__(self, max_entries: int = 512, ttl: float = 3600):
+        """
+        Initialize the suggestion cache.
+
+        Args:
+            max_entries (int): Number of (document, keyword) results kept
+            ttl (float): Seconds a cached result stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, suggestions)
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document_content: str, keyword: str, model: str,
+            document_type: str = 'resume') -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up the suggestions generated for one keyword.
+
+        Returns:
+            A copy of the cached suggestion list, or None on a miss
+        """
+        key = make_suggestion_key(document_content, keyword, model, document_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, document_content: str, keyword: str, model: str,
+            suggestions: List[Dict[str, Any]], document_type: str = 'resume'):
+        """Store the validated suggestions generated for one keyword."""
+        key = make_suggestion_key(document_content, keyword, model, document_type)
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, copy.deepcopy(suggestions))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit and miss counters."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+            }
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio AI analyzer and its concurrency limiter.
+"""
+
+import asyncio
+
+from ai_async import AIBusyError, AIConcurrencyLimiter, AsyncAIAnalyzer
+from keyword_cache import KeywordCache
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeAsyncModels:
+    def __init__(self, text, delay=0.05):
+        self.text = text
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content(self, model, contents, config):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return FakeResponse(self.text)
+
+
+def make_analyzer(api_key, models, limiter=None, keyword_cache=None):
+    analyzer = AsyncAIAnalyzer(api_key, keyword_cache=keyword_cache, limiter=limiter)
+    analyzer.client = type('FakeClient', (), {'aio': type('FakeAio', (), {'models': models})()})()
+    return analyzer
+
+
+def test_per_key_and_global_caps():
+    """In-flight calls never exceed the per-key or the global cap."""
+    async def run():
+        limiter = AIConcurrencyLimiter(max_in_flight=3, max_in_flight_per_key=2)
+        models_a = FakeAsyncModels('["Python"]')
+        models_b = FakeAsyncModels('["SQL"]')
+        a = make_analyzer('key-a', models_a, limiter)
+        b = make_analyzer('key-b', models_b, limiter)
+        results = await asyncio.gather(*[a.extract_job_keywords(f"a {i}") for i in range(6)],
+                                       *[b.extract_job_keywords(f"b {i}") for i in range(6)])
+        assert results[0] == ['Python'] and results[-1] == ['SQL']
+        assert models_a.peak <= 2 and models_b.peak <= 2
+        stats = limiter.stats()
+        assert stats['peak_in_flight'] <= 3
+        assert stats['completed'] == 12 and stats['in_flight'] == 0 and stats['active_keys'] == 0
+
+    asyncio.run(run())
+
+
+def test_slot_timeout_raises_busy():
+    """Calls that cannot get a slot in time raise AIBusyError instead of returning {}."""
+    async def run():
+        limiter = AIConcurrencyLimiter(max_in_flight=1, max_in_flight_per_key=1, wait_timeout=0.01)
+        analyzer = make_analyzer('key', FakeAsyncModels('["Python"]', delay=0.2), limiter)
+        results = await asyncio.gather(analyzer.extract_job_keywords('one'),
+                                       analyzer.extract_job_keywords('two'),
+                                       return_exceptions=True)
+        assert results[0] == ['Python']
+        assert isinstance(results[1], AIBusyError)
+        assert limiter.stats()['rejected'] == 1
+        assert limiter.stats()['active_keys'] == 0
+
+    asyncio.run(run())
+
+
+def test_shared_keyword_cache():
+    """The async analyzer reads and fills the same keyword cache as the sync one."""
+    async def run():
+        models = FakeAsyncModels('["Python"]')
+        analyzer = make_analyzer('key', models, keyword_cache=KeywordCache())
+        assert await analyzer.extract_job_keywords('posting') == ['Python']
+        assert await analyzer.extract_job_keywords('posting') == ['Python']
+        assert models.calls == 1
+
+    asyncio.run(run())
+
+
+def test_suggestions_are_validated():
+    """Suggestions from the async client go through the same LaTeX validation."""
+    async def run():
+        models = FakeAsyncModels('[{"id": "a", "type": "replace", "target_text": "x", '
+                                 '"replacement_text": "\\\\textbf{y", "description": "d", "keywords_used": []}]')
+        analyzer = make_analyzer('key', models)
+        result = await analyzer.generate_resume_suggestions('resume', ['Python'])
+        assert result['suggestions'] == []
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_per_key_and_global_caps()
+    test_slot_timeout_raises_busy()
+    test_shared_keyword_cache()
+    test_suggestions_are_validated()
+    print("✅ Async AI tests passed!")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-API-key analyzer pool.
+"""
+
+import time
+
+from analyzer_pool import AnalyzerPool, hash_api_key
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAnalyzer:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.client = FakeClient()
+
+
+def test_reuse_per_key():
+    """The same key gets the same analyzer; different keys get their own."""
+    pool = AnalyzerPool(FakeAnalyzer)
+    first = pool.get('key-a')
+    assert pool.get('key-a') is first
+    assert pool.get('key-b') is not first
+    stats = pool.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 2 and stats['analyzers'] == 2
+
+
+def test_keys_are_hashed():
+    """Raw API keys are not kept as pool keys."""
+    pool = AnalyzerPool(FakeAnalyzer)
+    pool.get('secret-key')
+    assert list(pool._analyzers) == [hash_api_key('secret-key')]
+
+
+def test_lru_eviction_closes_client():
+    """The least recently used analyzer is evicted and its client closed."""
+    pool = AnalyzerPool(FakeAnalyzer, max_entries=2)
+    a = pool.get('a')
+    pool.get('b')
+    pool.get('a')
+    pool.get('c')
+    assert pool.stats()['evictions'] == 1
+    assert pool.get('a') is a
+    assert pool.stats()['analyzers'] == 2
+
+
+def test_idle_expiry():
+    """Idle analyzers are dropped and rebuilt on next use."""
+    pool = AnalyzerPool(FakeAnalyzer, idle_ttl=0.05)
+    a = pool.get('a')
+    time.sleep(0.1)
+    assert pool.get('a') is not a
+    assert a.client.closed
+    assert pool.stats()['expirations'] == 1
+
+
+if __name__ == "__main__":
+    test_reuse_per_key()
+    test_keys_are_hashed()
+    test_lru_eviction_closes_client()
+    test_idle_expiry()
+    print("✅ Analyzer pool tests passed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the background compile job manager.
+"""
+
+import threading
+import time
+
+from compile_jobs import CompileJobManager
+from compile_scheduler import SchedulerFullError
+
+
+def fake_compile(latex_content, document_id=None, release=None):
+    """Stand-in for compile_latex that returns a result dict."""
+    if release is not None:
+        release.wait(timeout=5)
+    if 'BROKEN' in latex_content:
+        return {'pdf_bytes': None, 'duration_ms': 1.0, 'cache_status': 'miss', 'warnings': None}
+    return {'pdf_bytes': b'%PDF-1.5', 'duration_ms': 1.0, 'cache_status': 'miss', 'warnings': 0}
+
+
+def wait_for(manager, job_id):
+    for event in manager.events(job_id, keepalive=0.1):
+        if event and event['event'] in ('succeeded', 'failed'):
+            return manager.get(job_id)
+    return manager.get(job_id)
+
+
+def test_job_lifecycle():
+    """A job moves through queued, running and succeeded, and its events are streamed in order."""
+    manager = CompileJobManager(max_workers=1)
+    release = threading.Event()
+    job_id = manager.submit(fake_compile, 'Hello', release=release)
+    assert manager.get(job_id)['status'] in ('queued', 'running')
+
+    release.set()
+    events = [event['event'] for event in manager.events(job_id, keepalive=0.1) if event]
+    assert events == ['queued', 'running', 'succeeded']
+
+    description = manager.describe(manager.get(job_id))
+    assert description['status'] == 'succeeded'
+    assert description['pdf_size'] == len(b'%PDF-1.5')
+    assert 'pdf_bytes' not in description
+
+
+def test_failed_job():
+    """A compile without a PDF or with an exception marks the job failed."""
+    manager = CompileJobManager(max_workers=1)
+    job = wait_for(manager, manager.submit(fake_compile, 'BROKEN'))
+    assert job['status'] == 'failed'
+    assert job['error'] == 'Failed to generate PDF'
+
+    def raising_compile(latex_content):
+        raise RuntimeError('latexmk not found')
+
+    job = wait_for(manager, manager.submit(raising_compile, 'Hello'))
+    assert job['status'] == 'failed'
+    assert job['error'] == 'latexmk not found'
+
+
+def test_finished_jobs_expire():
+    """Finished jobs are dropped once their TTL has passed."""
+    manager = CompileJobManager(max_workers=1, ttl=0.05)
+    job_id = manager.submit(fake_compile, 'Hello')
+    wait_for(manager, job_id)
+    time.sleep(0.1)
+    assert manager.get(job_id) is None
+
+
+def test_full_queue_is_rejected():
+    """Jobs past max_pending are refused with 503 and Retry-After; room frees up once they finish."""
+    manager = CompileJobManager(max_workers=1, max_pending=2)
+    release = threading.Event()
+    running = [manager.submit(fake_compile, 'Hello', release=release) for _ in range(2)]
+    try:
+        manager.submit(fake_compile, 'Hello')
+        assert False, 'the job should be rejected'
+    except SchedulerFullError as e:
+        assert e.status_code == 503 and e.retry_after >= 1
+    assert manager.stats()['rejected'] == 1
+
+    release.set()
+    for job_id in running:
+        wait_for(manager, job_id)
+    assert wait_for(manager, manager.submit(fake_compile, 'Hello'))['status'] == 'succeeded'
+
+
+def test_oldest_finished_jobs_are_evicted():
+    """Past max_jobs, the oldest finished jobs and their PDFs are dropped before their TTL."""
+    manager = CompileJobManager(max_workers=1, max_pending=1, max_jobs=2)
+    job_ids = []
+    for _ in range(3):
+        job_ids.append(manager.submit(fake_compile, 'Hello'))
+        wait_for(manager, job_ids[-1])
+    assert manager.get(job_ids[0]) is None
+    assert manager.get(job_ids[1]) is not None and manager.get(job_ids[2]) is not None
+    assert manager.stats()['evicted'] == 1
+
+
+if __name__ == "__main__":
+    test_job_lifecycle()
+    test_failed_job()
+    test_finished_jobs_expire()
+    test_full_queue_is_rejected()
+    test_oldest_finished_jobs_are_evicted()
+    print("✅ Compile job tests passed!")
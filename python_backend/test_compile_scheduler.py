@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded compile scheduler.
+"""
+
+import threading
+
+from compile_scheduler import CompileScheduler, SchedulerFullError
+
+
+def test_runs_work_and_records_waits():
+    """Compiles run on the workers and wait times are recorded."""
+    scheduler = CompileScheduler(max_workers=2)
+    assert scheduler.run('client', lambda x: x * 2, 21) == 42
+
+    stats = scheduler.stats()
+    assert stats['completed'] == 1
+    assert stats['queue_depth'] == 0
+    assert stats['wait_ms_p50'] is not None
+
+
+def test_admission_control():
+    """A full queue answers 503 and a greedy client answers 429, both with Retry-After."""
+    scheduler = CompileScheduler(max_workers=1, max_queue=3, max_per_client=2)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(timeout=5)
+
+    running = scheduler.submit('a', blocker)
+    started.wait(timeout=5)
+
+    scheduler.submit('a', lambda: None)
+    scheduler.submit('a', lambda: None)
+    try:
+        scheduler.submit('a', lambda: None)
+        assert False, 'expected 429'
+    except SchedulerFullError as e:
+        assert e.status_code == 429
+        assert e.retry_after >= 1
+
+    scheduler.submit('b', lambda: None)
+    assert scheduler.is_saturated()
+    try:
+        scheduler.submit('c', lambda: None)
+        assert False, 'expected 503'
+    except SchedulerFullError as e:
+        assert e.status_code == 503
+
+    release.set()
+    running.result(timeout=5)
+    assert scheduler.stats()['rejected'] == 2
+
+
+def test_fair_queuing():
+    """Waiting clients are served round-robin, not first-come-first-served."""
+    scheduler = CompileScheduler(max_workers=1, max_queue=10, max_per_client=10)
+    release = threading.Event()
+    started = threading.Event()
+    order = []
+
+    def blocker():
+        started.set()
+        release.wait(timeout=5)
+
+    scheduler.submit('warmup', blocker)
+    started.wait(timeout=5)
+
+    futures = [scheduler.submit('a', order.append, 'a1'),
+               scheduler.submit('a', order.append, 'a2'),
+               scheduler.submit('a', order.append, 'a3'),
+               scheduler.submit('b', order.append, 'b1')]
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+
+    assert order == ['a1', 'b1', 'a2', 'a3']
+
+
+if __name__ == "__main__":
+    test_runs_work_and_records_waits()
+    test_admission_control()
+    test_fair_queuing()
+    print("✅ Compile scheduler tests passed!")
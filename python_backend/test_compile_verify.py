@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for compile verification of suggestions, using a stand-in pdflatex.
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import time
+
+from compile_scheduler import CompileScheduler
+from compile_verify import SuggestionVerifier
+
+# Fails on \badcommand, hangs on \slowmacro, otherwise "compiles"
+FAKE_ENGINE = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+assert '-draftmode' in args and '-no-shell-escape' in args
+out_dir = next(a.split('=', 1)[1] for a in args if a.startswith('-output-directory='))
+text = open(args[-1]).read()
+if '\\\\slowmacro' in text:
+    time.sleep(5)
+if '\\\\badcommand' in text:
+    with open(os.path.join(out_dir, 'document.log'), 'w') as log:
+        log.write('./document.tex:3: Undefined control sequence.\\n')
+    sys.exit(1)
+"""
+
+DOCUMENT = r"""\documentclass{article}
+\begin{document}
+\item Built data pipelines
+\item Wrote internal tools
+\end{document}
+"""
+
+
+def suggestion(id, target, replacement):
+    return {'id': id, 'type': 'replace', 'target_text': target, 'replacement_text': replacement}
+
+
+def make_verifier(temp_dir, budget=3.0):
+    engine = os.path.join(temp_dir, 'fake-pdflatex')
+    with open(engine, 'w') as f:
+        f.write(FAKE_ENGINE.format(python=sys.executable))
+    os.chmod(engine, os.stat(engine).st_mode | stat.S_IEXEC)
+    return SuggestionVerifier(max_workers=4, budget=budget, engine=engine)
+
+
+def test_failing_suggestions_are_reported():
+    """Each suggestion is compiled on its own; the failing one carries the first log error."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        verifier = make_verifier(temp_dir)
+        report = verifier.verify(DOCUMENT, [
+            suggestion('ok', 'Built data pipelines', 'Built \\textbf{Python} data pipelines'),
+            suggestion('bad', 'Wrote internal tools', 'Wrote \\badcommand tools'),
+            suggestion('gone', 'Not in the document', 'x'),
+        ])
+        assert report['baseline'] == 'passed'
+        assert [r['status'] for r in report['results']] == ['passed', 'failed', 'not_applicable']
+        assert report['results'][1]['error'] == 'Undefined control sequence.'
+        assert verifier.stats()['failed'] == 1
+
+
+def test_budget_bounds_total_time():
+    """Variants still running at the deadline are reported as timeouts, not failures."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        verifier = make_verifier(temp_dir, budget=1.0)
+        start = time.monotonic()
+        report = verifier.verify(DOCUMENT, [
+            suggestion('slow', 'Built data pipelines', 'Built \\slowmacro pipelines'),
+            suggestion('ok', 'Wrote internal tools', 'Wrote Go tools'),
+        ])
+        assert time.monotonic() - start < 2.5
+        assert [r['status'] for r in report['results']] == ['timeout', 'passed']
+
+
+def test_broken_document_leaves_suggestions_unverified():
+    """If the document fails without any edit, failures are not blamed on the suggestions."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        verifier = make_verifier(temp_dir)
+        broken = DOCUMENT.replace('Wrote internal tools', 'Wrote \\badcommand tools')
+        report = verifier.verify(broken, [suggestion('a', 'Built data pipelines', 'Built Go pipelines')])
+        assert report['baseline'] == 'failed'
+        assert report['results'][0]['status'] == 'unverified'
+
+
+def test_preamble_edits_are_not_compiled_against_the_cached_format():
+    """Variants that change the preamble are compiled in full, the rest start from the cached format."""
+    class FormatCache:
+        cache_dir = '/nonexistent-formats'
+
+        def find_format(self, preamble):
+            return 'cached-preamble'
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        verifier = make_verifier(temp_dir)
+        verifier.preamble_cache = FormatCache()
+        commands = []
+        check = verifier._check
+        verifier._check = lambda text, format_name, env, deadline: (
+            commands.append((text, format_name)) or check(text, format_name, env, deadline))
+        report = verifier.verify(DOCUMENT, [
+            suggestion('body', 'Built data pipelines', 'Built Go pipelines'),
+            suggestion('preamble', '\\documentclass{article}', '\\documentclass{article}\n\\badcommand'),
+        ])
+        formats = {format_name for text, format_name in commands if '\\badcommand' not in text}
+        assert formats == {'cached-preamble'}
+        assert [format_name for text, format_name in commands if '\\badcommand' in text] == [None]
+        assert [r['status'] for r in report['results']] == ['passed', 'failed']
+
+
+def test_passes_run_on_the_compile_scheduler():
+    """With a scheduler, draft passes take its worker slots, and passes it rejects are left unverified."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        verifier = make_verifier(temp_dir)
+        verifier.scheduler = CompileScheduler(max_workers=1, max_queue=32, max_per_client=8)
+        report = verifier.verify(DOCUMENT, [
+            suggestion('ok', 'Built data pipelines', 'Built Go pipelines'),
+            suggestion('bad', 'Wrote internal tools', 'Wrote \\badcommand tools'),
+        ], client_id='client-a')
+        assert [r['status'] for r in report['results']] == ['passed', 'failed']
+        assert verifier.scheduler.stats()['completed'] == 3
+
+        verifier.scheduler = CompileScheduler(max_workers=1, max_queue=1, max_per_client=1)
+        report = verifier.verify(DOCUMENT, [suggestion('a', 'Built data pipelines', 'Built Go pipelines'),
+                                            suggestion('b', 'Wrote internal tools', 'Wrote Go tools')])
+        statuses = [r['status'] for r in report['results']]
+        assert 'unverified' in statuses and verifier.stats()['rejected'] >= 1
+
+
+if __name__ == "__main__":
+    test_failing_suggestions_are_reported()
+    test_budget_bounds_total_time()
+    test_broken_document_leaves_suggestions_unverified()
+    test_preamble_edits_are_not_compiled_against_the_cached_format()
+    test_passes_run_on_the_compile_scheduler()
+    print("✅ Compile verification tests passed!")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline fake Gemini backend.
+"""
+
+import asyncio
+import random
+import time
+
+from ai import AIAnalyzer
+from ai_async import AsyncAIAnalyzer
+from fake_gemini import FakeGeminiClient, FakeGeminiError, LatencyModel
+from suggestion_apply import apply_suggestions
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+\begin{itemize}
+  \item Built data pipelines for the analytics team
+  \item Wrote internal tools for release automation
+\end{itemize}
+\end{document}
+"""
+
+POSTING = "We are hiring a backend engineer with Python, PostgreSQL and Kubernetes experience."
+
+
+def test_keywords_follow_the_posting():
+    """Keyword requests return a JSON array of the skills in the posting."""
+    analyzer = AIAnalyzer('fake', client=FakeGeminiClient())
+    assert analyzer.extract_job_keywords(POSTING) == ['Python', 'PostgreSQL', 'Kubernetes']
+
+
+def test_suggestions_validate_and_apply():
+    """Suggestions are schema-valid, pass LaTeX validation and target text that exists in the document."""
+    analyzer = AIAnalyzer('fake', client=FakeGeminiClient())
+    result = analyzer.generate_resume_suggestions(RESUME, ['C#', 'SQL'])
+    suggestions = result['suggestions']
+    assert [s['keywords_used'] for s in suggestions] == [['C#'], ['SQL']]
+    assert 'C\\#' in suggestions[0]['replacement_text']
+    assert result['prompt_stats']['prompt_tokens'] > 0
+    applied = apply_suggestions(RESUME, suggestions)
+    assert len(applied['applied']) == 2 and applied['skipped'] == []
+
+
+def test_streaming_and_interruptions():
+    """Streams arrive in chunks over the sampled latency; injected errors cut them off part way."""
+    client = FakeGeminiClient(suggestion_latency=LatencyModel('fixed', 100), stream_chunks=4)
+    analyzer = AIAnalyzer('fake', client=client)
+    prompt_stats = {}
+    start = time.monotonic()
+    streamed = list(analyzer.stream_resume_suggestions(RESUME, ['Go'], prompt_stats))
+    assert time.monotonic() - start >= 0.09
+    assert [valid for _, valid in streamed] == [True]
+    assert prompt_stats['prompt_tokens'] > 0
+
+    client.error_rate = 1.0
+    try:
+        list(analyzer.stream_resume_suggestions(RESUME, ['Go']))
+        assert False, 'expected an interrupted stream'
+    except FakeGeminiError as e:
+        assert e.code == 503
+
+
+def test_error_rate_and_fallbacks():
+    """Failed calls go through the analyzer's normal fallbacks."""
+    client = FakeGeminiClient(error_rate=1.0)
+    analyzer = AIAnalyzer('fake', client=client)
+    assert analyzer.extract_job_keywords(POSTING) == ['Python', 'PostgreSQL', 'Kubernetes']  # local extractor
+    assert analyzer.generate_resume_suggestions(RESUME, ['Go'])['suggestions'] == []
+    assert client.stats()['errors'] == 2
+
+
+def test_latency_models():
+    """Latency specs parse, sample in range and repeat with the same seed."""
+    assert LatencyModel.parse('fixed:250').sample(random.Random()) == 0.25
+    uniform = LatencyModel.parse('uniform:100:200')
+    assert all(0.1 <= uniform.sample(random.Random(i)) <= 0.2 for i in range(20))
+    lognormal = LatencyModel.parse('lognormal:800:0.5')
+    assert lognormal.sample(random.Random(7)) == lognormal.sample(random.Random(7))
+    samples = sorted(lognormal.sample(random.Random(i)) for i in range(501))
+    assert 0.6 < samples[250] < 1.0
+    try:
+        LatencyModel.parse('gamma:1')
+        assert False, 'expected ValueError'
+    except ValueError:
+        pass
+
+
+def test_async_client():
+    """The aio surface sleeps without blocking the event loop."""
+    async def run():
+        client = FakeGeminiClient(keyword_latency=LatencyModel('fixed', 100))
+        analyzer = AsyncAIAnalyzer('fake', client=client)
+        start = time.monotonic()
+        results = await asyncio.gather(*[analyzer.extract_job_keywords(f"{POSTING} #{i}") for i in range(10)])
+        assert time.monotonic() - start < 0.5
+        assert results[0] == ['Python', 'PostgreSQL', 'Kubernetes']
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_keywords_follow_the_posting()
+    test_suggestions_validate_and_apply()
+    test_streaming_and_interruptions()
+    test_error_rate_and_fallbacks()
+    test_latency_models()
+    test_async_client()
+    print("✅ Fake Gemini tests passed!")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental JSON array parser used for streamed suggestions.
+"""
+
+import json
+
+from json_stream import JSONArrayStreamParser
+
+SUGGESTIONS = [
+    {"id": "a", "target_text": "\\textbf{Skills}: C++ \\\\", "replacement_text": "} { ] [ \" tricky", "keywords_used": ["C++"]},
+    {"id": "b", "target_text": "\\item Built \\{x\\}", "replacement_text": "\\item Built with \\textbf{Python}", "keywords_used": []},
+]
+
+
+def feed_in_chunks(text, size):
+    parser = JSONArrayStreamParser()
+    results = []
+    for i in range(0, len(text), size):
+        results.append(parser.feed(text[i:i + size]))
+    return parser, results
+
+
+def test_any_chunk_size():
+    """Objects come out intact whatever the chunk boundaries, including inside strings and escapes."""
+    text = json.dumps(SUGGESTIONS, indent=2)
+    for size in (1, 2, 3, 7, 64, len(text)):
+        parser, results = feed_in_chunks(text, size)
+        assert [item for chunk in results for item in chunk] == SUGGESTIONS
+        assert parser.finished and parser.errors == 0
+
+
+def test_objects_emitted_as_soon_as_closed():
+    """The first object is returned before the rest of the array arrives."""
+    first = json.dumps(SUGGESTIONS[0])
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[' + first[:-1]) == []
+    assert parser.feed('}, {"id": ') == [SUGGESTIONS[0]]
+    assert parser.feed('"b"}]') == [{"id": "b"}]
+
+
+def test_leading_text_and_bad_objects():
+    """Text before the array is ignored and malformed objects are counted, not fatal."""
+    parser = JSONArrayStreamParser()
+    assert parser.feed('```json\n[{"id": 1,}, {"id": 2}]```') == [{"id": 2}]
+    assert parser.errors == 1 and parser.finished
+
+
+if __name__ == "__main__":
+    test_any_chunk_size()
+    test_objects_emitted_as_soon_as_closed()
+    test_leading_text_and_bad_objects()
+    print("✅ JSON stream parser tests passed!")
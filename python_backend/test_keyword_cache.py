@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the job-posting keyword cache.
+"""
+
+import os
+import tempfile
+import time
+
+from keyword_cache import KeywordCache, make_keyword_key, normalize_job_posting
+
+POSTING = """Senior Backend Engineer
+
+We use Python, PostgreSQL and Kubernetes.
+Posted 3 days ago
+Apply now
+Acme is an equal opportunity employer.
+"""
+
+
+def test_normalization():
+    """Whitespace, case and boilerplate lines do not change the key."""
+    noisy = "  senior   BACKEND engineer\n\n\nWe use Python,  PostgreSQL and Kubernetes.\nReposted 1 week ago\n"
+    assert normalize_job_posting(POSTING) == normalize_job_posting(noisy)
+    assert make_keyword_key(POSTING, 'm') == make_keyword_key(noisy, 'm')
+    assert make_keyword_key(POSTING, 'm') != make_keyword_key(POSTING + 'Go', 'm')
+
+
+def test_model_in_key():
+    """Keywords from one model are not served for another."""
+    cache = KeywordCache()
+    cache.put(POSTING, 'model-a', ['Python'])
+    assert cache.get(POSTING, 'model-a') == ['Python']
+    assert cache.get(POSTING, 'model-b') is None
+
+
+def test_memory_lru():
+    """The memory tier keeps at most max_entries lists."""
+    cache = KeywordCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"posting {i}", 'm', [str(i)])
+    assert cache.get("posting 0", 'm') is None
+    assert cache.get("posting 2", 'm') == ['2']
+    assert cache.stats()['memory_entries'] == 2
+
+
+def test_sqlite_persistence():
+    """A new cache instance reads entries written by an earlier one."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'keywords.sqlite3')
+        KeywordCache(db_path).put(POSTING, 'm', ['Python', 'Kubernetes'])
+
+        cache = KeywordCache(db_path)
+        assert cache.get(POSTING, 'm') == ['Python', 'Kubernetes']
+        assert cache.get(POSTING, 'm') == ['Python', 'Kubernetes']
+        stats = cache.stats()
+        assert stats['db_hits'] == 1 and stats['memory_hits'] == 1
+
+
+def test_ttl_expiry():
+    """Expired entries are misses in both tiers."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'keywords.sqlite3')
+        cache = KeywordCache(db_path, ttl=0.05)
+        cache.put(POSTING, 'm', ['Python'])
+        time.sleep(0.1)
+        assert cache.get(POSTING, 'm') is None
+        assert KeywordCache(db_path).get(POSTING, 'm') is None
+
+
+if __name__ == "__main__":
+    test_normalization()
+    test_model_in_key()
+    test_memory_lru()
+    test_sqlite_persistence()
+    test_ttl_expiry()
+    print("✅ Keyword cache tests passed!")
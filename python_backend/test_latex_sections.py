@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for section-aware prompt trimming.
+"""
+
+from latex_sections import OMITTED_MARKER, trim_latex_document
+
+RESUME = r"""\documentclass[letterpaper,11pt]{article}
+\usepackage{titlesec}
+\newcommand{\resumeItem}[1]{\item\small{#1}}
+\begin{document}
+\begin{center}
+  \textbf{Jane Doe} -- jane@example.com
+\end{center}
+
+\section{Education}
+\textbf{State University} -- B.S. Computer Science
+
+\section{Experience}
+\begin{itemize}
+  \resumeItem{Built data pipelines in Java}
+  \resumeItem{Maintained   REST APIs}
+\end{itemize}
+
+\section{Awards}
+Dean's list, used Kubernetes in a hackathon
+
+\section{Interests}
+Chess
+
+\section{Technical Skills}
+\textbf{Languages}: Java, C++ \\
+\end{document}
+"""
+
+
+def test_preamble_and_unrelated_sections_dropped():
+    """Only relevant sections, or ones mentioning a keyword, are sent."""
+    document = trim_latex_document(RESUME, ['Kubernetes'])
+    assert document.sections == ['Experience', 'Awards', 'Technical Skills']
+    assert document.omitted == ['Education', 'Interests']
+    assert '\\usepackage' not in document.text and '\\newcommand' not in document.text
+    assert 'Jane Doe' not in document.text and 'Chess' not in document.text
+    assert OMITTED_MARKER in document.text
+    stats = document.stats()
+    assert stats['estimated_tokens_after'] < stats['estimated_tokens_before']
+
+
+def test_kept_text_maps_back():
+    """Every line sent to the model is found verbatim in the original."""
+    document = trim_latex_document(RESUME, ['Python'])
+    for line in document.text.splitlines():
+        if line and not line.startswith('%'):
+            assert document.map_target(line) == line
+
+
+def test_whitespace_drift_is_recovered():
+    """Targets with altered whitespace map to the exact original text; invented ones do not."""
+    document = trim_latex_document(RESUME, ['Python'])
+    assert document.map_target(r"\resumeItem{Maintained REST APIs}") == r"\resumeItem{Maintained   REST APIs}"
+    assert document.map_target(r"\resumeItem{Wrote Python}") is None
+    assert document.map_target("Java}" + OMITTED_MARKER) is None
+
+
+def test_unsectioned_documents_keep_body():
+    """Cover letters lose only the preamble; fragments are sent unchanged."""
+    letter = "\\documentclass{letter}\n\\begin{document}\nDear team,\n\nI build APIs.\n\\end{document}\n"
+    document = trim_latex_document(letter, ['Python'])
+    assert document.text == "Dear team,\n\nI build APIs."
+    assert trim_latex_document("\\item Built APIs", []).text == "\\item Built APIs"
+
+
+if __name__ == "__main__":
+    test_preamble_and_unrelated_sections_dropped()
+    test_kept_text_maps_back()
+    test_whitespace_drift_is_recovered()
+    test_unsectioned_documents_keep_body()
+    print("✅ Prompt trimming tests passed!")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass LaTeX suggestion validator.
+"""
+
+from bench_latex_validator import legacy_validate, make_corpus
+from latex_validator import has_errors, scan_latex, validate_suggestion, validate_suggestions
+
+
+def suggestion(replacement, target='x', type='replace'):
+    return {'id': 'test', 'type': type, 'target_text': target, 'replacement_text': replacement}
+
+
+def warnings(suggestion):
+    return validate_suggestion(suggestion, warnings=True)
+
+
+def types(findings):
+    return [(finding['type'], finding['severity']) for finding in findings]
+
+
+def test_braces():
+    """Unbalanced braces in either text are errors, and the only ones."""
+    assert types(validate_suggestion(suggestion('\\textbf{Python'))) == [('unbalanced_braces', 'error')]
+    assert types(validate_suggestion(suggestion('Python}'))) == [('unbalanced_braces', 'error')]
+    assert types(validate_suggestion(suggestion('ok', target='a}'))) == [('unbalanced_braces', 'error')]
+    assert validate_suggestion(suggestion('\\textbf{Python} and \\{literal\\}')) == []
+    assert validate_suggestion(suggestion('Grew revenue by $5M & 50% \\begin{itemize}')) == []
+
+
+def test_same_results_as_legacy_checks():
+    """The validator keeps and drops exactly the suggestions the old checks did."""
+    corpus = make_corpus(2000, seed=1)
+    legacy = [legacy_validate(s) for s in corpus]
+    assert [not has_errors(findings) for findings in validate_suggestions(corpus)] == legacy
+    assert [not has_errors(findings) for findings in validate_suggestions(corpus, warnings=True)] == legacy
+    assert legacy.count(False) > 0
+
+
+def test_environments_should_match_target():
+    """A replacement should leave open what its target left open, and insertions nothing; these are warnings."""
+    target = '\\begin{itemize}\n\\item Java'
+    assert warnings(suggestion('\\begin{itemize}\n\\item Java, Python', target)) == []
+    assert types(warnings(suggestion('\\item Java, Python', target))) == [('unbalanced_environment', 'warning')]
+    assert types(warnings(suggestion('\\begin{itemize}\\item Go', type='insert_after'))) == \
+        [('unbalanced_environment', 'warning')]
+    assert types(warnings(suggestion('\\begin{itemize}\\item Go\\end{enumerate}'))) == \
+        [('environment_mismatch', 'warning')]
+
+
+def test_math_and_specials():
+    """Unescaped $ and other specials are warnings, except in math, URLs or tables."""
+    assert types(warnings(suggestion('Grew revenue by $5M'))) == [('unbalanced_math', 'warning')]
+    assert warnings(suggestion('Grew revenue by \\$5M, $O(n^2)$ and $x_i$')) == []
+    assert types(warnings(suggestion('MySQL & PostgreSQL'))) == [('unescaped_character', 'warning')]
+    assert warnings(suggestion('\\href{https://x.io/?a=1&b_c=2}{site} R\\&D')) == []
+    assert warnings(suggestion('\\begin{tabular}{ll} a & b \\end{tabular}')) == []
+    findings = warnings(suggestion('{Improved 50% of builds'))
+    assert types(findings) == [('unbalanced_braces', 'error'), ('unescaped_character', 'warning')]
+
+
+def test_commands():
+    """Suspicious short commands and \\item without a space are warnings."""
+    assert types(warnings(suggestion('\\itemPython'))) == []
+    assert types(warnings(suggestion('\\item{Python}'))) == [('item_spacing', 'warning')]
+    assert warnings(suggestion('\\item[--] Python \\\\ \\it{Go}')) == []
+    assert types(warnings(suggestion('\\zz Python'))) == [('unknown_command', 'warning')]
+    assert validate_suggestion(suggestion('\\zz Python')) == []  # Only scanned for on request
+
+
+def test_batch_scans_each_text_once():
+    """Batch validation returns one findings list per suggestion and reuses scans of repeated texts."""
+    batch = [suggestion('\\textbf{A}', target='\\item X'), suggestion('B {', target='\\item X')]
+    results = validate_suggestions(batch)
+    assert [has_errors(findings) for findings in results] == [False, True]
+    assert results[1][0]['field'] == 'replacement_text' and results[1][0]['position'] == 3
+    assert scan_latex('\\begin{itemize}').open_environments == ('itemize',)
+
+
+if __name__ == "__main__":
+    test_braces()
+    test_same_results_as_legacy_checks()
+    test_environments_should_match_target()
+    test_math_and_specials()
+    test_commands()
+    test_batch_scans_each_text_once()
+    print("✅ LaTeX validator tests passed!")
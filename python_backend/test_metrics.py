@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the Prometheus metrics registry and model call instrumentation.
+"""
+
+import asyncio
+import time
+
+from ai import AIAnalyzer
+from ai_async import AsyncAIAnalyzer
+from fake_gemini import FakeGeminiClient
+from metrics import MODEL_CALL_SECONDS, MODEL_CALLS_TOTAL, MODEL_TOKENS_TOTAL, MetricsRegistry
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\begin{itemize}
+  \item Built data pipelines for the analytics team
+\end{itemize}
+\end{document}
+"""
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative, le is inclusive, and label values are escaped."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('stage_seconds', 'Stage time', ['stage'], buckets=(0.1, 1.0))
+    histogram.observe(0.1, 'latexmk')
+    histogram.observe(0.5, 'latexmk')
+    histogram.observe(3.0, 'latexmk')
+    histogram.observe(0.01, 'say "hi"')
+    counter = registry.counter('compiles_total', 'Compiles', ['outcome'])
+    counter.inc('success')
+    counter.inc('success', amount=2)
+
+    text = registry.render()
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="latexmk",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="latexmk",le="1"} 2' in text
+    assert 'stage_seconds_bucket{stage="latexmk",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="latexmk"} 3' in text
+    assert 'stage_seconds_sum{stage="latexmk"} 3.6' in text
+    assert 'stage_seconds_count{stage="say \\"hi\\""} 1' in text
+    assert 'compiles_total{outcome="success"} 3' in text
+    assert text.endswith('\n')
+
+    try:
+        registry.counter('compiles_total', 'Again')
+        assert False, 'duplicate metric names must be rejected'
+    except ValueError:
+        pass
+
+
+def test_observe_overhead_is_negligible():
+    """Recording stays in the microseconds, far below a compile or model call."""
+    histogram = MetricsRegistry().histogram('overhead_seconds', 'Overhead', ['stage'])
+    count = 20000
+    start = time.perf_counter()
+    for i in range(count):
+        histogram.observe(0.003, 'temp_dir')
+    per_call_us = (time.perf_counter() - start) / count * 1e6
+    assert per_call_us < 50, per_call_us
+
+
+def test_model_calls_are_recorded_per_method():
+    """Latency, outcome and tokens are recorded per AIAnalyzer method and model, sync and async."""
+    analyzer = AIAnalyzer('fake', client=FakeGeminiClient())
+    model = analyzer.suggestions_model
+    calls_before = MODEL_CALLS_TOTAL.value('generate_resume_suggestions', model, 'success')
+    tokens_before = MODEL_TOKENS_TOTAL.value('generate_resume_suggestions', model, 'prompt')
+
+    analyzer.generate_resume_suggestions(RESUME, ['Python'])
+    assert MODEL_CALLS_TOTAL.value('generate_resume_suggestions', model, 'success') == calls_before + 1
+    assert MODEL_TOKENS_TOTAL.value('generate_resume_suggestions', model, 'prompt') > tokens_before
+    assert MODEL_CALL_SECONDS.snapshot('generate_resume_suggestions', model)['count'] >= 1
+
+    # Injected failures count as errors; the analyzer still falls back
+    failing = AIAnalyzer('fake', client=FakeGeminiClient(error_rate=1.0))
+    errors_before = MODEL_CALLS_TOTAL.value('extract_job_keywords', failing.keyword_model, 'error')
+    assert failing.extract_job_keywords('Python and Docker experience required') == ['Python', 'Docker']
+    assert MODEL_CALLS_TOTAL.value('extract_job_keywords', failing.keyword_model, 'error') == errors_before + 1
+
+    # Streams are recorded once, when the last chunk arrives
+    stream_before = MODEL_CALLS_TOTAL.value('stream_resume_suggestions', model, 'success')
+    list(analyzer.stream_resume_suggestions(RESUME, ['Python']))
+    assert MODEL_CALLS_TOTAL.value('stream_resume_suggestions', model, 'success') == stream_before + 1
+
+    async_analyzer = AsyncAIAnalyzer('fake', client=FakeGeminiClient())
+    async_before = MODEL_CALLS_TOTAL.value('generate_cover_letter_suggestions', model, 'success')
+    asyncio.run(async_analyzer.generate_cover_letter_suggestions(RESUME, ['Python']))
+    assert MODEL_CALLS_TOTAL.value('generate_cover_letter_suggestions', model, 'success') == async_before + 1
+
+
+if __name__ == "__main__":
+    test_histogram_renders_cumulative_buckets()
+    test_observe_overhead_is_negligible()
+    test_model_calls_are_recorded_per_method()
+    print("✅ Metrics tests passed!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the content-addressed PDF cache.
+"""
+
+import os
+import tempfile
+
+from pdf_cache import PDFCache, make_cache_key
+
+
+def test_cache_key():
+    """Keys change with the source, the engine and the .latexmkrc contents."""
+    source = "\\documentclass{article}\\begin{document}Hi\\end{document}"
+    base = make_cache_key(source, 'pdflatex')
+
+    assert base == make_cache_key(source, 'pdflatex')
+    assert base != make_cache_key(source + ' ', 'pdflatex')
+    assert base != make_cache_key(source, 'lualatex')
+    assert base != make_cache_key(source, 'pdflatex', variant='preview')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rc_path = os.path.join(temp_dir, '.latexmkrc')
+        with open(rc_path, 'w') as f:
+            f.write("$pdf_mode = 1;\n")
+        with_rc = make_cache_key(source, 'pdflatex', rc_path)
+        with open(rc_path, 'w') as f:
+            f.write("$pdf_mode = 4;\n")
+        assert with_rc != base
+        assert with_rc != make_cache_key(source, 'pdflatex', rc_path)
+
+
+def test_memory_lru_eviction():
+    """The memory tier evicts least recently used entries past its byte budget."""
+    cache = PDFCache(max_memory_bytes=10, disk_dir=None, max_disk_bytes=0)
+    cache.put('a', b'11111')
+    cache.put('b', b'22222')
+    assert cache.get('a') == b'11111'  # 'a' is now most recent
+    cache.put('c', b'33333')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'11111'
+    assert cache.get('c') == b'33333'
+
+    stats = cache.stats()
+    assert stats['memory_evictions'] == 1
+    assert stats['memory_hits'] == 3
+    assert stats['misses'] == 1
+    assert stats['memory_bytes'] == 10
+
+
+def test_disk_tier_survives_restart():
+    """Entries written to disk are found again by a fresh cache instance."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PDFCache(max_memory_bytes=1024, disk_dir=temp_dir, max_disk_bytes=1024)
+        cache.put('doc', b'%PDF-1.5 test')
+
+        restarted = PDFCache(max_memory_bytes=1024, disk_dir=temp_dir, max_disk_bytes=1024)
+        assert restarted.lookup('doc') == (b'%PDF-1.5 test', 'disk')
+        assert restarted.stats()['disk_hits'] == 1
+
+        # Second lookup is served from memory
+        assert restarted.lookup('doc') == (b'%PDF-1.5 test', 'memory')
+        assert restarted.stats()['memory_hits'] == 1
+
+        assert restarted.disk_path('doc') == os.path.join(temp_dir, 'doc.pdf')
+        assert restarted.disk_path('missing') is None
+
+
+def test_disk_size_eviction():
+    """The disk tier removes the oldest files once over its byte budget."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PDFCache(max_memory_bytes=0, disk_dir=temp_dir, max_disk_bytes=8)
+        cache.put('a', b'aaaa')
+        cache.put('b', b'bbbb')
+        cache.put('c', b'cccc')
+
+        assert not os.path.exists(os.path.join(temp_dir, 'a.pdf'))
+        assert cache.get('a') is None
+        assert cache.get('c') == b'cccc'
+        assert cache.stats()['disk_evictions'] == 1
+        assert cache.stats()['disk_bytes'] == 8
+
+
+if __name__ == "__main__":
+    test_cache_key()
+    test_memory_lru_eviction()
+    test_disk_tier_survives_restart()
+    test_disk_size_eviction()
+    print("✅ PDF cache tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for preamble splitting and format naming.
+"""
+
+import tempfile
+import time
+
+from preamble_cache import PreambleFormatCache, split_preamble
+
+SAMPLE_DOCUMENT = r"""\documentclass{article}
+\usepackage{enumitem}
+\usepackage[hidelinks]{hyperref}
+\begin{document}
+\section{Skills}
+Python
+\end{document}
+"""
+
+
+def test_split_preamble():
+    """The body keeps its original line numbers after the preamble is removed."""
+    preamble, body = split_preamble(SAMPLE_DOCUMENT)
+
+    assert preamble.startswith('\\documentclass{article}')
+    assert '\\begin{document}' not in preamble
+    assert body.lstrip('\n').startswith('\\begin{document}')
+
+    original_lines = SAMPLE_DOCUMENT.split('\n')
+    body_lines = body.split('\n')
+    assert len(original_lines) == len(body_lines)
+    assert body_lines[4] == original_lines[4] == '\\section{Skills}'
+
+
+def test_split_without_document():
+    """Fragments and commented-out \\begin{document} lines are left alone."""
+    assert split_preamble('Hello') == ('', 'Hello')
+
+    commented = "\\documentclass{article}\n% \\begin{document}\n"
+    assert split_preamble(commented) == ('', commented)
+
+
+def test_format_name():
+    """Edited preambles map to a different format."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PreambleFormatCache(temp_dir)
+        preamble, _ = split_preamble(SAMPLE_DOCUMENT)
+
+        assert cache.format_name(preamble) == cache.format_name(preamble)
+        assert cache.format_name(preamble) != cache.format_name(preamble + '\\usepackage{xcolor}\n')
+
+
+def test_failed_builds_are_retried_after_backoff():
+    """A failed build is skipped until the backoff ends, failures are bounded and no locks are left behind."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PreambleFormatCache(temp_dir, engine='not-a-tex-engine', failure_backoff=0.2, max_failures=2)
+        preamble, _ = split_preamble(SAMPLE_DOCUMENT)
+
+        assert cache.get_format(preamble) is None
+        assert cache.get_format(preamble) is None  # Within the backoff: not built again
+        assert cache.stats()['build_failures'] == 1
+
+        time.sleep(0.25)
+        assert cache.get_format(preamble) is None
+        assert cache.stats()['build_failures'] == 2
+
+        for extra in ('\\usepackage{xcolor}\n', '\\usepackage{geometry}\n'):
+            cache.get_format(preamble + extra)
+        assert cache.stats()['failed_preambles'] == 2
+        assert cache._build_locks == {}
+
+        # The hit path releases its lock entry too
+        with open(cache._format_path(cache.format_name('\\relax\n')), 'wb') as f:
+            f.write(b'fmt')
+        assert cache.get_format('\\relax\n') == cache.format_name('\\relax\n')
+        assert cache._build_locks == {}
+
+
+if __name__ == "__main__":
+    test_split_preamble()
+    test_split_without_document()
+    test_format_name()
+    test_failed_builds_are_retried_after_backoff()
+    print("✅ Preamble cache tests passed!")
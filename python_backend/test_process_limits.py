@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for process-group isolation and resource limits of TeX runs.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import process_limits
+from process_limits import LimitedRunTimeout, ProcessLimits, run_limited
+
+# Starts a background child the way latexmk starts pdflatex, and records its pid
+SPAWN_CHILD = 'sleep 30 & echo $! > child.pid; {}'
+
+
+def _child_gone(temp_dir):
+    """True once the child recorded in child.pid has exited (or is an unreaped zombie)."""
+    with open(os.path.join(temp_dir, 'child.pid')) as f:
+        pid = int(f.read())
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                if f.read().rsplit(')', 1)[1].split()[0] == 'Z':
+                    return True
+        except FileNotFoundError:
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_output_and_usage_are_reported():
+    """stdout and stderr are captured like subprocess.run, and usage comes back with the result."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result, usage = run_limited(['sh', '-c', 'echo out; echo err >&2; exit 3'], ProcessLimits(), timeout=5,
+                                    cwd=temp_dir)
+        assert (result.returncode, result.stdout, result.stderr) == (3, 'out\n', 'err\n')
+        assert usage['limit'] is None and usage['signal'] is None
+        assert usage['max_rss_kb'] > 0 and usage['wall_ms'] > 0
+        assert os.listdir(temp_dir) == []  # Output files are unnamed
+
+
+def test_timeout_kills_the_whole_group():
+    """On timeout the children die with the leader, not just the leader."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        try:
+            run_limited(['sh', '-c', SPAWN_CHILD.format('wait')], ProcessLimits(), timeout=0.5, cwd=temp_dir)
+            assert False, 'the run should time out'
+        except LimitedRunTimeout as e:
+            assert e.usage['limit'] == 'timeout' and e.usage['signal'] == 'SIGKILL'
+        assert time.perf_counter() - start < 5
+        assert _child_gone(temp_dir)
+
+
+def test_leftover_children_are_killed():
+    """Background processes still in the group when the leader exits are killed too."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result, _ = run_limited(['sh', '-c', SPAWN_CHILD.format('exit 0')], None, timeout=5, cwd=temp_dir)
+        assert result.returncode == 0
+        assert _child_gone(temp_dir)
+
+
+def test_limits_stop_runaway_processes():
+    """File size and CPU limits end a run with the matching signal."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        limits = ProcessLimits(file_size_bytes=1024 * 1024)
+        result, usage = run_limited(['head', '-c', str(512 * 1024 * 1024), '/dev/zero'], limits, timeout=5,
+                                    cwd=temp_dir)
+        assert result.returncode < 0 and usage['limit'] == 'file_size' and usage['signal'] == 'SIGXFSZ'
+
+        limits = ProcessLimits(cpu_seconds=1, memory_bytes=0)
+        result, usage = run_limited([sys.executable, '-c', 'while True: pass'], limits, timeout=10, cwd=temp_dir)
+        assert usage['limit'] == 'cpu' and usage['signal'] == 'SIGXCPU'
+        assert usage['cpu_user_ms'] + usage['cpu_system_ms'] >= 900
+
+
+def test_fallbacks_without_waitid_or_process_groups():
+    """Without os.waitid (macOS) children are still killed; without process groups (Windows) the run still times out."""
+    saved = process_limits._WAIT_WITHOUT_REAP, process_limits._PROCESS_GROUPS
+    try:
+        process_limits._WAIT_WITHOUT_REAP = False
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result, usage = run_limited(['sh', '-c', SPAWN_CHILD.format('exit 4')], None, timeout=5, cwd=temp_dir)
+            assert result.returncode == 4 and usage['max_rss_kb'] > 0
+            assert _child_gone(temp_dir)
+
+        process_limits._PROCESS_GROUPS = False
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result, usage = run_limited(['sh', '-c', 'echo out'], None, timeout=5, cwd=temp_dir)
+            assert result.stdout == 'out\n' and usage['cpu_user_ms'] is None and usage['max_rss_kb'] is None
+            try:
+                run_limited(['sleep', '30'], None, timeout=0.5, cwd=temp_dir)
+                assert False, 'the run should time out'
+            except LimitedRunTimeout as e:
+                assert e.usage['limit'] == 'timeout'
+    finally:
+        process_limits._WAIT_WITHOUT_REAP, process_limits._PROCESS_GROUPS = saved
+
+
+if __name__ == "__main__":
+    test_output_and_usage_are_reported()
+    test_timeout_kills_the_whole_group()
+    test_leftover_children_are_killed()
+    test_limits_stop_runaway_processes()
+    test_fallbacks_without_waitid_or_process_groups()
+    print("✅ Process limits tests passed!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the preallocated scratch directory pool.
+"""
+
+import os
+import tempfile
+
+from scratch_pool import DIR_PREFIX, ScratchPool, default_scratch_root
+
+
+def test_directories_are_reused_empty():
+    """Released directories are emptied in the background and handed out again."""
+    with tempfile.TemporaryDirectory() as root:
+        pool = ScratchPool(root, size=2)
+        assert pool.stats()['ready'] == 2
+
+        with pool.acquire() as path:
+            os.makedirs(os.path.join(path, 'sub'))
+            with open(os.path.join(path, 'document.tex'), 'w') as f:
+                f.write('\\relax\n')
+            assert pool.stats()['in_use'] == 1
+        pool.wait_for_cleanup()
+
+        seen = set()
+        for _ in range(3):
+            with pool.acquire() as again:
+                assert os.listdir(again) == []
+                seen.add(again)
+            pool.wait_for_cleanup()
+        assert path in seen and len(seen) <= 2
+
+        stats = pool.stats()
+        assert stats['ready'] == 2 and stats['in_use'] == 0 and stats['pending_cleanup'] == 0
+        assert stats['reused'] == 4 and stats['overflows'] == 0
+
+
+def test_overflow_directories_are_not_kept():
+    """With every directory in use, a new one is made and removed again on release."""
+    with tempfile.TemporaryDirectory() as root:
+        pool = ScratchPool(root, size=1)
+        with pool.acquire() as first, pool.acquire() as second:
+            assert first != second
+        pool.wait_for_cleanup()
+
+        stats = pool.stats()
+        assert stats['overflows'] == 1 and stats['ready'] == 1
+        assert len(os.listdir(pool.base_dir)) == 1
+
+
+def test_orphaned_trees_are_removed():
+    """Scratch trees of exited processes are cleared at startup; live ones are left alone."""
+    with tempfile.TemporaryDirectory() as root:
+        orphan = os.path.join(root, f'{DIR_PREFIX}999999999')
+        os.makedirs(os.path.join(orphan, '1'))
+        live = os.path.join(root, f'{DIR_PREFIX}1')
+        os.makedirs(live)
+        unrelated = os.path.join(root, 'something-else')
+        os.makedirs(unrelated)
+
+        pool = ScratchPool(root, size=1)
+        assert not os.path.exists(orphan)
+        assert os.path.exists(live) and os.path.exists(unrelated)
+        assert pool.base_dir == os.path.join(root, f'{DIR_PREFIX}{os.getpid()}')
+
+
+def test_small_dev_shm_is_not_used():
+    """/dev/shm is skipped when it cannot hold the whole pool at its per-compile budget."""
+    assert default_scratch_root(required_bytes=2 ** 62) == tempfile.gettempdir()
+    if os.access('/dev/shm', os.W_OK | os.X_OK):
+        assert default_scratch_root(required_bytes=0) == '/dev/shm'
+
+
+if __name__ == "__main__":
+    test_directories_are_reused_empty()
+    test_overflow_directories_are_not_kept()
+    test_orphaned_trees_are_removed()
+    test_small_dev_shm_is_not_used()
+    print("✅ Scratch pool tests passed!")
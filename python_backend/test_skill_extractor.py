@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the local skills-dictionary keyword extractor.
+"""
+
+import time
+
+from ai import AIAnalyzer
+from skill_extractor import SkillExtractor, extract_skill_keywords, tokenize
+
+POSTING = """Backend Engineer (Python/Django)
+You will build RESTful APIs in Python on AWS, deploy with Docker and Kubernetes (k8s),
+and store data in Postgres. React Native or React experience helps; Node.js is a plus.
+We value CI/CD, C++ and C#, and .NET. You'll go the extra mile, excel at code review, and rest easy.
+"""
+
+
+def test_tokenizer_keeps_symbols():
+    """Language names with symbols stay whole; slashes and sentence periods split."""
+    assert tokenize("C++, C#, .NET and Node.js. CI/CD") == ['c++', 'c#', '.net', 'and', 'node.js', 'ci', 'cd']
+
+
+def test_synonyms_and_ranking():
+    """Synonyms map to one canonical name, ranked by mentions then first mention."""
+    keywords = extract_skill_keywords(POSTING, max_keywords=20)
+    assert keywords[0] == 'Python'
+    assert {'Django', 'REST APIs', 'AWS', 'Docker', 'Kubernetes', 'PostgreSQL', 'Node.js',
+            'CI/CD', 'C++', 'C#', '.NET'} <= set(keywords)
+    # Ambiguous English words are not skills on their own
+    assert not {'Go', 'Excel'} & set(keywords)
+
+
+def test_longest_match_wins():
+    """Overlapping synonyms report only the longest ("react native" is not also "react")."""
+    extractor = SkillExtractor({'React': ['react'], 'React Native': ['react native'], 'Native': ['native app']})
+    assert [name for _, name in extractor.matches("react native app, react")] == ['React Native', 'React']
+
+
+def test_automaton_failure_links():
+    """Matches that start inside a failed longer candidate are still found."""
+    extractor = SkillExtractor({'Spring Boot': ['spring boot'], 'Boot Camp': ['boot camp']})
+    assert [name for _, name in extractor.matches("spring boot camp")] == ['Spring Boot']
+    assert [name for _, name in extractor.matches("spring camp, spring boot")] == ['Spring Boot']
+    assert [name for _, name in extractor.matches("spring spring boot")] == ['Spring Boot']
+
+
+def test_under_a_millisecond():
+    """A typical posting is processed in well under a millisecond."""
+    extract_skill_keywords(POSTING)
+    start = time.perf_counter()
+    for _ in range(200):
+        extract_skill_keywords(POSTING)
+    assert (time.perf_counter() - start) / 200 < 0.001
+
+
+def test_gemini_failure_falls_back():
+    """extract_job_keywords answers from the dictionary instead of returning {} when Gemini fails."""
+    class FailingModels:
+        def generate_content(self, **kwargs):
+            raise TimeoutError('deadline exceeded')
+
+    analyzer = AIAnalyzer('key')
+    analyzer.client = type('FakeClient', (), {'models': FailingModels()})()
+    assert analyzer.extract_job_keywords(POSTING)[0] == 'Python'
+
+
+if __name__ == "__main__":
+    test_tokenizer_keeps_symbols()
+    test_synonyms_and_ranking()
+    test_longest_match_wins()
+    test_automaton_failure_links()
+    test_under_a_millisecond()
+    test_gemini_failure_falls_back()
+    print("✅ Skill extractor tests passed!")
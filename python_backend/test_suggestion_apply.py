@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for server-side suggestion application.
+"""
+
+from suggestion_apply import DocumentIndex, apply_suggestions
+
+DOCUMENT = r"""\section{Experience}
+\begin{itemize}
+  \item Built   data
+        pipelines
+  \item Wrote internal tools
+  \item Wrote internal tools for QA
+\end{itemize}
+"""
+
+
+def suggestion(id, target, replacement, type='replace'):
+    return {'id': id, 'type': type, 'target_text': target, 'replacement_text': replacement}
+
+
+def test_line_numbers():
+    """Offsets map to 1-based line numbers."""
+    index = DocumentIndex(DOCUMENT)
+    assert index.line_of(0) == 1
+    assert index.line_of(DOCUMENT.index('\\begin')) == 2
+    assert index.line_of(DOCUMENT.index('pipelines')) == 4
+
+
+def test_exact_and_whitespace_matches():
+    """Targets are matched exactly, or with their whitespace collapsed."""
+    result = apply_suggestions(DOCUMENT, [
+        suggestion('a', 'Built data pipelines', 'Built Python data pipelines'),
+        suggestion('b', '\\item Wrote internal tools\n', '\\item Wrote internal Go tools\n'),
+    ])
+    assert result['skipped'] == []
+    assert [(e['id'], e['match']) for e in result['applied']] == [('a', 'whitespace'), ('b', 'exact')]
+    a = result['applied'][0]
+    assert (a['start_line'], a['end_line']) == (3, 4)
+    assert DOCUMENT[a['start']:a['end']] == 'Built   data\n        pipelines'
+    assert 'Built Python data pipelines' in result['content']
+    assert 'Wrote internal Go tools\n  \\item Wrote internal tools for QA' in result['content']
+
+
+def test_overlapping_edits_are_skipped():
+    """An edit overlapping an accepted one is skipped rather than moved to a line it did not point at."""
+    result = apply_suggestions(DOCUMENT, [
+        suggestion('a', 'Wrote internal tools', 'Wrote internal Go tools'),
+        suggestion('b', 'Wrote internal tools', 'Wrote internal Rust tools'),
+        suggestion('c', 'internal tools for QA', 'internal QA tools'),
+        suggestion('d', 'nowhere', 'x'),
+        suggestion('e', 'x', 'y', type='delete'),
+    ])
+    assert [e['id'] for e in result['applied']] == ['a', 'c']
+    assert result['skipped'] == [{'id': 'b', 'reason': 'overlap'}, {'id': 'd', 'reason': 'not_found'},
+                                 {'id': 'e', 'reason': 'invalid'}]
+    assert 'Go tools\n' in result['content'] and 'Wrote internal QA tools\n' in result['content']
+    assert 'Rust' not in result['content']
+
+
+def test_identical_lines_take_the_next_free_occurrence():
+    """A target on several identical lines never meant one of them, so a taken one gives way to the next."""
+    document = '\\item Python\n  \\item Python\n\\item Python 3\n'
+    result = apply_suggestions(document, [
+        suggestion('a', '\\item Python', '\\item Python 3.12'),
+        suggestion('b', '\\item Python', '\\item Python and Go'),
+        suggestion('c', '\\item Python', '\\item Rust'),
+    ])
+    assert [(e['id'], e['start_line']) for e in result['applied']] == [('a', 1), ('b', 2)]
+    assert result['skipped'] == [{'id': 'c', 'reason': 'overlap'}]
+    assert result['content'] == '\\item Python 3.12\n  \\item Python and Go\n\\item Python 3\n'
+
+
+def test_inserts_next_to_replacements():
+    """Insertions at the end of a replaced range, or at the same point, do not conflict."""
+    result = apply_suggestions(DOCUMENT, [
+        suggestion('a', '\\item Wrote internal tools for QA', '\\item Wrote QA tools'),
+        suggestion('b', '\\item Wrote internal tools for QA', '  \\item Led a team', type='insert_after'),
+        suggestion('c', '\\item Wrote internal tools for QA', '  \\item Ran deployments', type='insert_after'),
+        suggestion('d', 'internal tools for', '\\item inside', type='insert_after'),
+    ])
+    assert [e['id'] for e in result['applied']] == ['a', 'b', 'c']
+    assert result['skipped'] == [{'id': 'd', 'reason': 'overlap'}]
+    assert '\\item Wrote QA tools\n  \\item Led a team\n  \\item Ran deployments\n\\end{itemize}' in result['content']
+
+
+if __name__ == "__main__":
+    test_line_numbers()
+    test_exact_and_whitespace_matches()
+    test_overlapping_edits_are_skipped()
+    test_identical_lines_take_the_next_free_occurrence()
+    test_inserts_next_to_replacements()
+    print("✅ Suggestion apply tests passed!")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-keyword suggestion cache and the resume suggestion fan-out.
+"""
+
+import json
+import time
+
+from ai import AIAnalyzer
+from suggestion_cache import SuggestionCache, make_suggestion_key
+
+RESUME = r"""\begin{itemize}
+\item Built data pipelines
+\item Wrote internal tools
+\item Ran deployments
+\end{itemize}"""
+
+# Suggestions the fake model returns for each single-keyword request
+SUGGESTIONS = {
+    'Python': [{"id": "suggestion_1", "type": "replace", "target_text": "Built data pipelines",
+                "replacement_text": "Built data pipelines in Python", "description": "d", "keywords_used": ["Python"]}],
+    'SQL': [{"id": "suggestion_1", "type": "replace", "target_text": "Built  data pipelines",
+             "replacement_text": "Built SQL data pipelines", "description": "d", "keywords_used": ["SQL"]},
+            {"id": "suggestion_2", "type": "replace", "target_text": "Wrote internal tools",
+             "replacement_text": "Wrote internal SQL tools", "description": "d", "keywords_used": ["SQL"]}],
+    'Docker': [{"id": "suggestion_1", "type": "insert_after", "target_text": "Ran deployments",
+                "replacement_text": " with Docker", "description": "d", "keywords_used": ["Docker"]}],
+}
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModels:
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def generate_content(self, model, contents, config):
+        keyword = next(k for k in SUGGESTIONS if repr([k]) in contents)
+        self.calls.append(keyword)
+        if keyword in self.fail:
+            raise RuntimeError('quota exceeded')
+        return FakeResponse(json.dumps(SUGGESTIONS[keyword]))
+
+
+def make_analyzer(models, cache):
+    analyzer = AIAnalyzer('key', suggestion_cache=cache)
+    analyzer.client = type('FakeClient', (), {'models': models})()
+    return analyzer
+
+
+def test_key_depends_on_document_keyword_and_model():
+    """Keys differ by document, keyword and model, but not by keyword case."""
+    key = make_suggestion_key(RESUME, 'Python', 'model-a')
+    assert key == make_suggestion_key(RESUME, ' python ', 'model-a')
+    assert key != make_suggestion_key(RESUME + ' ', 'Python', 'model-a')
+    assert key != make_suggestion_key(RESUME, 'SQL', 'model-a')
+    assert key != make_suggestion_key(RESUME, 'Python', 'model-b')
+    assert key != make_suggestion_key(RESUME, 'Python', 'model-a', document_type='cover_letter')
+
+
+def test_ttl_and_lru():
+    """Entries expire after the TTL and the least recently used entry is evicted first."""
+    cache = SuggestionCache(max_entries=2, ttl=0.05)
+    cache.put(RESUME, 'a', 'm', [{'id': 'a'}])
+    cache.put(RESUME, 'b', 'm', [{'id': 'b'}])
+    assert cache.get(RESUME, 'a', 'm') == [{'id': 'a'}]
+    cache.put(RESUME, 'c', 'm', [{'id': 'c'}])
+    assert cache.get(RESUME, 'b', 'm') is None
+    time.sleep(0.06)
+    assert cache.get(RESUME, 'a', 'm') is None
+    assert cache.stats()['entries'] == 1
+
+
+def test_fan_out_merges_and_dedupes():
+    """One call per keyword; repeated targets are dropped and ids stay unique."""
+    models = FakeModels()
+    result = make_analyzer(models, SuggestionCache()).generate_resume_suggestions(RESUME, ['Python', 'SQL'])
+    assert sorted(models.calls) == ['Python', 'SQL']
+    targets = [s['target_text'] for s in result['suggestions']]
+    assert targets == ['Built data pipelines', 'Wrote internal tools']
+    assert len({s['id'] for s in result['suggestions']}) == 2
+    assert result['prompt_stats']['llm_calls'] == 2
+    assert result['prompt_stats']['duplicate_targets'] == 1
+
+
+def test_added_keyword_costs_one_call():
+    """Adding a keyword re-uses cached results and only calls the model for the new one."""
+    models = FakeModels()
+    analyzer = make_analyzer(models, SuggestionCache())
+    analyzer.generate_resume_suggestions(RESUME, ['Python', 'SQL'])
+    result = analyzer.generate_resume_suggestions(RESUME, ['Python', 'SQL', 'Docker'])
+    assert sorted(models.calls) == ['Docker', 'Python', 'SQL']
+    assert result['prompt_stats']['cached_keywords'] == 2
+    assert [s['keywords_used'] for s in result['suggestions']] == [['Python'], ['SQL'], ['Docker']]
+
+    analyzer.generate_resume_suggestions(RESUME, ['Python'])
+    assert len(models.calls) == 3
+
+
+def test_failed_calls_are_not_cached():
+    """A failed keyword contributes nothing and is retried on the next request."""
+    models = FakeModels(fail={'SQL'})
+    analyzer = make_analyzer(models, SuggestionCache())
+    result = analyzer.generate_resume_suggestions(RESUME, ['Python', 'SQL'])
+    assert [s['keywords_used'] for s in result['suggestions']] == [['Python']]
+    models.fail.clear()
+    analyzer.generate_resume_suggestions(RESUME, ['Python', 'SQL'])
+    assert models.calls.count('SQL') == 2 and models.calls.count('Python') == 1
+
+
+if __name__ == "__main__":
+    test_key_depends_on_document_keyword_and_model()
+    test_ttl_and_lru()
+    test_fan_out_merges_and_dedupes()
+    test_added_keyword_costs_one_call()
+    test_failed_calls_are_not_cached()
+    print("✅ Suggestion cache tests passed!")
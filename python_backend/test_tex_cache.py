@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared TeX font and Lua cache.
+"""
+
+import os
+import stat
+import tempfile
+
+from tex_cache import WARM_MARKER, SharedTexCache
+
+# Stands in for pdflatex: writes a pk font, a luaotfload-style cache file and a package to TEXMFVAR
+FAKE_ENGINE = """#!/bin/sh
+mkdir -p "$TEXMFVAR/fonts/pk/ljfour/public/cm" "$TEXMFVAR/luatex-cache/generic/names" "$TEXMFVAR/tex/latex/hyperref"
+echo pk > "$TEXMFVAR/fonts/pk/ljfour/public/cm/cmr10.600pk"
+echo names > "$TEXMFVAR/luatex-cache/generic/names/luaotfload-names.luc"
+echo sty > "$TEXMFVAR/tex/latex/hyperref/hyperref.sty"
+"""
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_compile_env_only_exposes_cache_paths():
+    """Writes go to the compile's overlay; the shared cache is only on the font and Lua cache paths."""
+    with tempfile.TemporaryDirectory() as root:
+        cache = SharedTexCache(os.path.join(root, 'shared'))
+        env = cache.compile_env(os.path.join(root, 'compile'))
+        overlay = os.path.join(root, 'compile', '.texmf-var')
+        assert env['TEXMFVAR'] == overlay
+        assert env['TEXMFCACHE'].split(os.pathsep) == [overlay, cache.cache_dir]
+        # After the default path, so system fonts win
+        assert env['PKFONTS'] == os.pathsep + os.path.join(cache.cache_dir, 'fonts', 'pk') + '//'
+        assert env['TFMFONTS'].startswith(os.pathsep)
+        assert 'TEXMFAUXTREES' not in env and 'TEXMFHOME' not in env
+
+
+def test_promote_copies_allowlisted_cache_files_only():
+    """Only known cache subtrees and extensions are promoted; existing files and packages are not touched."""
+    with tempfile.TemporaryDirectory() as root:
+        cache = SharedTexCache(os.path.join(root, 'shared'))
+        build_dir = os.path.join(root, 'build')
+        assert cache._promote(build_dir) == 0  # No overlay, nothing to do
+
+        overlay = cache.overlay_dir(build_dir)
+        names = os.path.join('luatex-cache', 'generic', 'names')
+        _write(os.path.join(overlay, 'fonts', 'pk', 'ljfour', 'new.600pk'), 'new')
+        _write(os.path.join(overlay, names, 'luaotfload-names.luc'), 'from build')
+        _write(os.path.join(overlay, names, 'luaotfload-names.luc.tmp'), 'half written')
+        _write(os.path.join(overlay, 'fonts', 'pk', 'evil.sty'), 'wrong extension')
+        _write(os.path.join(overlay, 'tex', 'latex', 'hyperref', 'hyperref.sty'), 'shadowing package')
+        _write(os.path.join(overlay, 'luatex-cache', 'context', 'evil.lua'), 'outside the allowed subtrees')
+        _write(os.path.join(cache.cache_dir, names, 'luaotfload-names.luc'), 'shared')
+
+        assert cache._promote(build_dir) == 1
+        with open(os.path.join(cache.cache_dir, 'fonts', 'pk', 'ljfour', 'new.600pk')) as f:
+            assert f.read() == 'new'
+        with open(os.path.join(cache.cache_dir, names, 'luaotfload-names.luc')) as f:
+            assert f.read() == 'shared'
+        promoted = sorted(os.path.relpath(os.path.join(r, n), cache.cache_dir)
+                          for r, _, files in os.walk(cache.cache_dir) for n in files)
+        assert promoted == [os.path.join('fonts', 'pk', 'ljfour', 'new.600pk'),
+                            os.path.join(names, 'luaotfload-names.luc')]
+        assert cache._promote(build_dir) == 0
+        assert cache.stats()['promoted_files'] == 1
+
+
+def test_compiles_promote_fonts_only():
+    """A user compile's new pk and tfm fonts are shared; its Lua caches and packages stay in the overlay."""
+    with tempfile.TemporaryDirectory() as root:
+        cache = SharedTexCache(os.path.join(root, 'shared'))
+        compile_dir = os.path.join(root, 'compile')
+        assert cache.promote_fonts(compile_dir) == 0  # No overlay, nothing to do
+
+        overlay = cache.overlay_dir(compile_dir)
+        pk = os.path.join('fonts', 'pk', 'ljfour', 'public', 'cm', 'cmr12.600pk')
+        tfm = os.path.join('fonts', 'tfm', 'jknappen', 'ec', 'ecrm1200.tfm')
+        _write(os.path.join(overlay, pk), 'pk')
+        _write(os.path.join(overlay, tfm), 'tfm')
+        _write(os.path.join(overlay, 'luatex-cache', 'generic', 'names', 'luaotfload-names.luc'), 'lua')
+        _write(os.path.join(overlay, 'tex', 'latex', 'hyperref', 'hyperref.sty'), 'sty')
+
+        assert cache.promote_fonts(compile_dir) == 2
+        promoted = sorted(os.path.relpath(os.path.join(r, n), cache.cache_dir)
+                          for r, _, files in os.walk(cache.cache_dir) for n in files)
+        assert promoted == sorted([pk, tfm])
+        assert cache.promote_fonts(compile_dir) == 0
+
+
+def test_warm_fills_the_shared_cache_once():
+    """Warming runs the installed engines, promotes their caches and leaves a marker."""
+    with tempfile.TemporaryDirectory() as root:
+        bin_dir = os.path.join(root, 'bin')
+        _write(os.path.join(bin_dir, 'pdflatex'), FAKE_ENGINE)
+        os.chmod(os.path.join(bin_dir, 'pdflatex'), stat.S_IRWXU)
+        old_path = os.environ['PATH']
+        os.environ['PATH'] = bin_dir + os.pathsep + old_path
+        try:
+            cache = SharedTexCache(os.path.join(root, 'shared'))
+            assert not cache.warm(engines=('not-a-tex-engine',))
+            assert not cache.warmed
+
+            assert cache.warm(engines=('pdflatex',))
+        finally:
+            os.environ['PATH'] = old_path
+
+        assert os.path.exists(os.path.join(cache.cache_dir, 'fonts', 'pk', 'ljfour', 'public', 'cm', 'cmr10.600pk'))
+        assert os.path.exists(os.path.join(cache.cache_dir, 'luatex-cache', 'generic', 'names',
+                                           'luaotfload-names.luc'))
+        assert os.path.exists(os.path.join(cache.cache_dir, WARM_MARKER))
+        assert not os.path.exists(os.path.join(cache.cache_dir, 'tex'))
+        assert cache.stats()['warmed']
+
+        # A new process (or restart) finds the marker and does not warm again
+        restarted = SharedTexCache(cache.cache_dir)
+        assert restarted.warmed and restarted.warm_in_background() is None
+
+
+if __name__ == "__main__":
+    test_compile_env_only_exposes_cache_paths()
+    test_promote_copies_allowlisted_cache_files_only()
+    test_compiles_promote_fonts_only()
+    test_warm_fills_the_shared_cache_once()
+    print("✅ TeX cache tests passed!")
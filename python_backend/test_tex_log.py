@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming TeX log parser.
+"""
+
+import os
+import tempfile
+import time
+
+from tex_log import parse_tex_log, parse_tex_log_lines
+
+SAMPLE_LOG = r"""This is pdfTeX, Version 3.141592653-2.6-1.40.25 (TeX Live 2023) (preloaded format=pdflatex 2023.5.1)  1 JAN 2024 12:00
+entering extended mode
+ \write18 enabled.
+(/tmp/compile/document.tex
+LaTeX2e <2022-11-01> patch level 1
+(/usr/share/texlive/texmf-dist/tex/latex/base/article.cls
+Document Class: article 2022/07/02 v1.4n Standard LaTeX document class
+)
+Package hyperref Warning: Token not allowed in a PDF string (Unicode):
+(hyperref)                removing `\textbf' on input line 42.
+
+LaTeX Font Warning: Font shape `OT1/cmr/bx/sc' undefined
+(Font)              using `OT1/cmr/bx/n' instead on input line 57.
+
+Overfull \hbox (12.34pt too wide) in paragraph at lines 61--63
+[]\OT1/cmr/m/n/10 Programming Languages: Java, C++, JavaScript, Python, TypeScript
+ []
+
+Underfull \vbox (badness 10000) has occurred while \output is active []
+
+LaTeX Warning: Reference `sec:skills' on page 1 undefined on input line 70.
+
+/tmp/compile/document.tex:75: Undefined control sequence.
+l.75 \resumeItm
+               {Built mobile applications}
+/tmp/compile/document.tex:80: LaTeX Error: File `fontawesome5.sty' not found.
+l.80 \usepackage
+                {fontawesome5}^^M
+!  ==> Fatal error occurred, no output PDF file produced!
+"""
+
+
+def test_parse_sample_log():
+    """Errors, missing packages, box warnings and package warnings are all found with lines."""
+    diagnostics = parse_tex_log_lines(SAMPLE_LOG.splitlines(True), base_dir='/tmp/compile')
+    by_type = {}
+    for diagnostic in diagnostics:
+        by_type.setdefault(diagnostic['type'], []).append(diagnostic)
+
+    error = by_type['error'][0]
+    assert error['file'] == 'document.tex'
+    assert error['line'] == 75
+    assert error['message'] == 'Undefined control sequence.'
+    assert error['context'] == '\\resumeItm'
+
+    missing = by_type['missing_package'][0]
+    assert missing['line'] == 80
+    assert 'fontawesome5.sty' in missing['message']
+
+    overfull, underfull = by_type['box']
+    assert (overfull['line'], overfull['end_line'], overfull['box']) == (61, 63, 'overfull hbox')
+    assert overfull['amount'] == '12.34pt too wide'
+    assert underfull['line'] is None and underfull['box'] == 'underfull vbox'
+
+    hyperref = by_type['warning'][0]
+    assert hyperref['package'] == 'hyperref'
+    assert hyperref['line'] == 42
+    assert 'removing' in hyperref['message']
+    assert any(w['line'] == 70 and 'sec:skills' in w['message'] for w in by_type['warning'])
+    assert any(w['line'] == 57 and 'using' in w['message'] for w in by_type['warning'])
+
+    assert all(d['severity'] == 'warning' for d in by_type['box'] + by_type['warning'])
+
+
+def test_parse_large_log_file():
+    """A multi-megabyte log is parsed from disk in a single streaming pass."""
+    filler = "(/usr/share/texlive/texmf-dist/tex/latex/tools/some-file.sty)\n" * 60000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, 'document.log')
+        with open(log_path, 'w') as f:
+            f.write(filler + SAMPLE_LOG.replace('/tmp/compile', temp_dir))
+        assert os.path.getsize(log_path) > 3 * 1024 * 1024
+
+        start = time.perf_counter()
+        report = parse_tex_log(log_path)
+        elapsed = time.perf_counter() - start
+
+        assert report['error_count'] == 3
+        assert report['diagnostics'][-3]['file'] == 'document.tex'
+        print(f"Parsed {os.path.getsize(log_path)} byte log in {elapsed * 1000:.1f} ms")
+
+
+def test_error_after_many_warnings():
+    """The fatal error at the end of a long log is found, and every warning is counted."""
+    warnings = "Overfull \\hbox (12.3pt too wide) in paragraph at lines 10--11\n" * 250
+    error = "./document.tex:42: Undefined control sequence.\nl.42 \\foo\n"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, 'document.log')
+        with open(log_path, 'w') as f:
+            f.write(warnings + error)
+        report = parse_tex_log(log_path)
+
+    assert report['error_count'] == 1 and report['warning_count'] == 250
+    assert len(report['diagnostics']) == 201
+    assert report['diagnostics'][-1]['message'] == 'Undefined control sequence.'
+    assert report['diagnostics'][-1]['line'] == 42
+
+
+def test_missing_log():
+    """No log (e.g. latexmk not installed) gives None rather than an exception."""
+    assert parse_tex_log('/nonexistent/document.log') is None
+
+
+if __name__ == "__main__":
+    test_parse_sample_log()
+    test_parse_large_log_file()
+    test_error_after_many_warnings()
+    test_missing_log()
+    print("✅ TeX log parser tests passed!")
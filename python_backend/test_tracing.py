@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for request-scoped logging and sampled request traces.
+"""
+
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from compile_scheduler import CompileScheduler
+from tracing import (NO_SPAN, RequestIdFilter, RequestTrace, TraceBuffer, current_request_id, end_request,
+                     new_request_id, propagate, record_span, span, start_request)
+
+
+def test_unsampled_requests_record_nothing():
+    """Without a trace, span() is the shared no-op and its attributes go nowhere."""
+    tokens = start_request('req-1')
+    try:
+        assert span('latexmk') is NO_SPAN
+        with span('latexmk', mode='final') as attributes:
+            attributes['passes'] = 2
+        record_span('queue_wait', 0.01)
+        assert current_request_id() == 'req-1'
+    finally:
+        end_request(tokens)
+    assert current_request_id() is None
+
+
+def test_spans_follow_worker_threads():
+    """Spans and the request id reach scheduler workers and propagate()d executor tasks."""
+    trace = RequestTrace('req-2', 'POST', '/convert-latex')
+    scheduler = CompileScheduler(max_workers=2)
+    seen_ids = []
+
+    def compile_step(name):
+        with span(name) as attributes:
+            attributes['thread'] = threading.current_thread().name
+            seen_ids.append(current_request_id())
+            time.sleep(0.01)
+
+    tokens = start_request('req-2', trace)
+    try:
+        with span('compile'):
+            scheduler.run('client', compile_step, 'latexmk')
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(propagate(compile_step), ['gemini_a', 'gemini_b']))
+        with span('failing') as attributes:
+            try:
+                with span('inner'):
+                    raise KeyError('boom')
+            except KeyError:
+                pass
+    finally:
+        end_request(tokens)
+    trace.finish(200)
+
+    result = trace.to_dict()
+    names = [s['name'] for s in result['spans']]
+    assert sorted(names) == ['compile', 'failing', 'gemini_a', 'gemini_b', 'inner', 'latexmk']
+    assert seen_ids == ['req-2'] * 3
+    latexmk = next(s for s in result['spans'] if s['name'] == 'latexmk')
+    assert latexmk['thread'].startswith('compile-worker') and latexmk['duration_ms'] >= 10
+    assert next(s for s in result['spans'] if s['name'] == 'inner')['error'] == 'KeyError'
+    assert result['status'] == 200 and result['duration_ms'] >= 20
+
+
+def test_ring_buffer_and_sampling():
+    """The buffer keeps the newest traces; sampling honours the rate and the forced flag."""
+    buffer = TraceBuffer(max_traces=3, sample_rate=0.0)
+    for i in range(5):
+        trace = RequestTrace(f'req-{i}', 'GET', '/health' if i % 2 else '/convert-latex')
+        trace.finish(200)
+        trace.duration_ms = i * 10
+        buffer.add(trace)
+    assert [t['request_id'] for t in buffer.recent()] == ['req-4', 'req-3', 'req-2']
+    assert [t['request_id'] for t in buffer.recent(min_duration_ms=25)] == ['req-4', 'req-3']
+    assert [t['request_id'] for t in buffer.recent(path='/health')] == ['req-3']
+    assert buffer.get('req-0') is None and buffer.get('req-3')['path'] == '/health'
+    assert buffer.stats()['recorded'] == 5
+
+    assert not buffer.should_sample() and buffer.should_sample(forced=True)
+    assert TraceBuffer(sample_rate=1.0).should_sample()
+
+    assert new_request_id('client-abc') == 'client-abc'
+    assert new_request_id('has spaces') != 'has spaces'
+    assert len(new_request_id()) == 16
+
+
+def test_log_lines_carry_the_request_id():
+    """RequestIdFilter adds the current request id, or '-' outside a request."""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('[%(request_id)s] %(message)s'))
+    handler.addFilter(RequestIdFilter())
+    logger = logging.getLogger('test_tracing')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    try:
+        logger.info('outside')
+        tokens = start_request('req-9')
+        logger.info('inside')
+        logger.debug('below the level, never formatted %s', object())
+        end_request(tokens)
+    finally:
+        logger.removeHandler(handler)
+    assert stream.getvalue().splitlines() == ['[-] outside', '[req-9] inside']
+
+
+if __name__ == "__main__":
+    test_unsampled_requests_record_nothing()
+    test_spans_follow_worker_threads()
+    test_ring_buffer_and_sampling()
+    test_log_lines_carry_the_request_id()
+    print("✅ Tracing tests passed!")
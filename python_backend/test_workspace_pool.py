@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent compile workspace pool.
+"""
+
+import os
+import tempfile
+import time
+
+from workspace_pool import WorkspacePool
+
+
+def test_workspace_reused():
+    """The same document id gets the same directory back, with its files intact."""
+    with tempfile.TemporaryDirectory() as root:
+        pool = WorkspacePool(root)
+        with pool.acquire('resume') as path:
+            with open(os.path.join(path, 'document.aux'), 'w') as f:
+                f.write('\\relax\n')
+        with pool.acquire('resume') as second_path:
+            assert second_path == path
+            assert os.path.exists(os.path.join(second_path, 'document.aux'))
+        with pool.acquire('coverLetter') as other_path:
+            assert other_path != path
+
+        stats = pool.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+        assert stats['workspaces'] == 2
+
+
+def test_count_cap_evicts_least_recent():
+    """Past max_workspaces, the least recently used workspace is removed."""
+    with tempfile.TemporaryDirectory() as root:
+        pool = WorkspacePool(root, max_workspaces=2)
+        with pool.acquire('a') as path_a:
+            pass
+        with pool.acquire('b'):
+            pass
+        with pool.acquire('c'):
+            pass
+
+        assert not os.path.exists(path_a)
+        assert pool.stats()['workspaces'] == 2
+        assert pool.stats()['evictions'] == 1
+
+
+def test_disk_cap_and_idle_expiry():
+    """Workspaces are evicted past the disk budget and expire when idle."""
+    with tempfile.TemporaryDirectory() as root:
+        pool = WorkspacePool(root, max_disk_bytes=100, idle_ttl=0.05)
+        with pool.acquire('big') as path:
+            with open(os.path.join(path, 'document.pdf'), 'wb') as f:
+                f.write(b'x' * 200)
+        assert not os.path.exists(path)
+        assert pool.stats()['evictions'] == 1
+
+        with pool.acquire('small') as path:
+            pass
+        time.sleep(0.1)
+        pool.sweep()
+        assert not os.path.exists(path)
+        assert pool.stats()['expirations'] == 1
+
+
+if __name__ == "__main__":
+    test_workspace_reused()
+    test_count_cap_evicts_least_recent()
+    test_disk_cap_and_idle_expiry()
+    print("✅ Workspace pool tests passed!")
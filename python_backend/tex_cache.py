@@ -0,0 +1,264 @@
+"""
+Shared, persistent TeX font and Lua caches.
+
+With TEXMFVAR and TEXMFCACHE pointing at the compile directory, every compile
+starts without the font map files, generated pk fonts and the luaotfload
+font names database and font caches, and rebuilds whatever the document
+needs. For LuaLaTeX or fontspec templates that is seconds per compile.
+
+SharedTexCache keeps those caches in one directory that survives restarts.
+warm() fills it at startup: it compiles a small, fixed pdfLaTeX probe
+document without shell escape and copies what it generated into the shared
+directory. Fonts that real templates use are generated by their first
+compile, so promote_fonts() also copies new pk and tfm fonts out of a
+successful compile's overlay. User documents run with -shell-escape and can
+write anything into their overlay, including .sty files or luaotfload
+caches, which are Lua code; from a user compile only the font subtrees
+(FONT_SUBTREES) are taken, and fonts are only looked up after the system
+trees, so a promoted font can add a missing font but never replace an
+installed one. In every case only files under the known cache subtrees with
+the expected extensions (PROMOTED_FILES) are copied. Each file is copied
+next to its final name and renamed into place, and only when no file of
+that name exists yet, so concurrent compiles (and server processes) never
+see a half-written file.
+
+Each compile gets its own writable overlay directory as TEXMFVAR and first
+TEXMFCACHE entry. It reads the shared directory only where caches are
+looked up: the second TEXMFCACHE entry for the Lua caches, and PKFONTS and
+TFMFONTS after the default search path for generated fonts. The shared
+directory is never a texmf tree (TEXMFAUXTREES), so it cannot shadow any
+tex/ input of the system trees.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from process_limits import LimitedRunTimeout, ProcessLimits, run_limited
+
+logger = logging.getLogger(__name__)
+
+WARM_MARKER = 'warm.json'
+
+# Probe documents that load the fonts most templates use
+WARM_DOCUMENTS = {
+    'pdflatex': r"""\documentclass{article}
+\usepackage[T1]{fontenc}
+\usepackage{lmodern}
+\usepackage{amssymb}
+\begin{document}
+Warm \textbf{bold} \textit{italic} \textsc{Small Caps} \texttt{mono} $\sum_{i=1}^n x_i \in \mathbb{R}$
+\end{document}
+""",
+    'lualatex': r"""\documentclass{article}
+\usepackage{fontspec}
+\begin{document}
+Warm \textbf{bold} \textit{italic} \textsc{Small Caps} \texttt{mono} $\sum_{i=1}^n x_i$
+\end{document}
+""",
+}
+
+# The only files copied into the shared cache: subtree of TEXMFVAR -> file name pattern
+PROMOTED_FILES = {
+    os.path.join('fonts', 'pk'): re.compile(r'[\w.+-]+\.\d+pk'),
+    os.path.join('fonts', 'tfm'): re.compile(r'[\w.+-]+\.tfm'),
+    os.path.join('luatex-cache', 'generic', 'names'): re.compile(r'[\w.+-]+\.(lua|luc|lua\.gz)'),
+    os.path.join('luatex-cache', 'generic', 'fonts'): re.compile(r'[\w.+-]+\.(lua|luc)'),
+}
+
+# What promote_fonts() takes from user compiles: fonts, never Lua caches
+FONT_SUBTREES = (os.path.join('fonts', 'pk'), os.path.join('fonts', 'tfm'))
+
+
+class SharedTexCache:
+    def __init__(self, cache_dir: str, warm_timeout: float = 300.0, limits: Optional[ProcessLimits] = None):
+        """
+        Initialize the shared cache.
+
+        Args:
+            cache_dir (str): Persistent directory shared by all compiles
+            warm_timeout (float): Seconds each warm-up probe may run
+            limits (ProcessLimits): Resource limits for the warm-up probes
+        """
+        self.cache_dir = cache_dir
+        self.warm_timeout = warm_timeout
+        self.limits = limits
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self.warmed = os.path.exists(os.path.join(self.cache_dir, WARM_MARKER))
+        self.warm_seconds = None
+        self.promotions = 0
+        self.promoted_files = 0
+
+    def overlay_dir(self, compile_dir: str) -> str:
+        """Writable cache overlay for a compile in compile_dir."""
+        return os.path.join(compile_dir, '.texmf-var')
+
+    def compile_env(self, compile_dir: str) -> Dict[str, str]:
+        """
+        Cache variables for a compile in compile_dir: writes go to its overlay, cache lookups fall back to the shared cache.
+
+        Returns:
+            Dict to update the compile environment with
+        """
+        overlay = self.overlay_dir(compile_dir)
+        return {
+            'TEXMFVAR': overlay,
+            'TEXMFCACHE': overlay + os.pathsep + self.cache_dir,
+            # A leading separator puts the default path (overlay and system trees included) first
+            'PKFONTS': os.pathsep + os.path.join(self.cache_dir, 'fonts', 'pk') + '//',
+            'TFMFONTS': os.pathsep + os.path.join(self.cache_dir, 'fonts', 'tfm') + '//',
+        }
+
+    def promote_fonts(self, compile_dir: str) -> int:
+        """
+        Copy the pk and tfm fonts a successful compile generated into the shared cache.
+
+        Only FONT_SUBTREES are read; Lua caches and everything else stay in
+        the compile's overlay.
+
+        Returns:
+            Number of files promoted
+        """
+        return self._promote(compile_dir, FONT_SUBTREES)
+
+    def _promote(self, build_dir: str, subtrees: Sequence[str] = tuple(PROMOTED_FILES)) -> int:
+        """
+        Copy the cache files a run created into the shared cache.
+
+        Only files under subtrees matching PROMOTED_FILES are copied, and files
+        already in the shared cache are left as they are.
+
+        Returns:
+            Number of files promoted
+        """
+        overlay = self.overlay_dir(build_dir)
+        if not os.path.isdir(overlay):
+            return 0
+        promoted = 0
+        for subtree in subtrees:
+            pattern = PROMOTED_FILES[subtree]
+            subtree_dir = os.path.join(overlay, subtree)
+            if os.path.realpath(subtree_dir) != os.path.join(os.path.realpath(overlay), subtree):
+                continue  # A symlink out of the overlay
+            for root, _, files in os.walk(subtree_dir, followlinks=False):
+                target_root = os.path.join(self.cache_dir, os.path.relpath(root, overlay))
+                for name in files:
+                    source = os.path.join(root, name)
+                    if not pattern.fullmatch(name) or os.path.islink(source):
+                        continue
+                    promoted += self._copy_into_cache(source, target_root, name)
+        if promoted:
+            logger.debug("Promoted %d files to the shared TeX cache", promoted)
+            with self._lock:
+                self.promotions += 1
+                self.promoted_files += promoted
+        return promoted
+
+    def _copy_into_cache(self, source: str, target_root: str, name: str) -> int:
+        """Atomically copy source to target_root/name unless it exists. Returns 1 if copied."""
+        target = os.path.join(target_root, name)
+        if os.path.exists(target):
+            return 0
+        tmp_path = None
+        try:
+            os.makedirs(target_root, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=target_root, suffix='.tmp')
+            os.close(fd)
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, target)
+            return 1
+        except OSError:
+            logger.warning("Could not promote %s to the shared TeX cache", name, exc_info=True)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return 0
+
+    def warm(self, engines: Sequence[str] = ('pdflatex',), force: bool = False) -> bool:
+        """
+        Fill the shared cache by compiling a probe document with each engine, without shell escape.
+
+        Engines that are not installed are skipped. Runs once per cache
+        directory unless force is set; a marker file records that it ran.
+
+        Args:
+            engines (Sequence[str]): Engines to warm, keys of WARM_DOCUMENTS
+            force (bool): Warm even if the marker says it was done
+
+        Returns:
+            True if the cache is warm afterwards
+        """
+        with self._warm_lock:
+            if self.warmed and not force:
+                return True
+            start = time.perf_counter()
+            warmed_engines = []
+            with tempfile.TemporaryDirectory(prefix='tex-cache-warm-') as build_dir:
+                env = os.environ.copy()
+                env.update(self.compile_env(build_dir))
+                for engine in engines:
+                    if engine not in WARM_DOCUMENTS or shutil.which(engine) is None:
+                        logger.debug("Not warming the TeX cache for %s: not installed", engine)
+                        continue
+                    tex_path = os.path.join(build_dir, f'warm-{engine}.tex')
+                    with open(tex_path, 'w', encoding='utf-8') as f:
+                        f.write(WARM_DOCUMENTS[engine])
+                    try:
+                        result, _ = run_limited(
+                            [engine, '-interaction=nonstopmode', '-halt-on-error', '-no-shell-escape',
+                             '-output-directory=' + build_dir, tex_path],
+                            self.limits, timeout=self.warm_timeout, cwd=build_dir, env=env)
+                    except (OSError, LimitedRunTimeout):
+                        logger.warning("Warming the TeX cache with %s failed", engine, exc_info=True)
+                        continue
+                    if result.returncode != 0:
+                        logger.warning("Warming the TeX cache with %s exited with %d", engine, result.returncode)
+                        continue
+                    warmed_engines.append(engine)
+                self._promote(build_dir)
+
+            self.warm_seconds = time.perf_counter() - start
+            if not warmed_engines:
+                return False
+            marker_path = os.path.join(self.cache_dir, WARM_MARKER)
+            with open(marker_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'engines': warmed_engines, 'warmed_at': time.time()}, f)
+            os.replace(marker_path + '.tmp', marker_path)
+            self.warmed = True
+            logger.info("Warmed the shared TeX cache for %s in %.1f s", ', '.join(warmed_engines), self.warm_seconds)
+            return True
+
+    def warm_in_background(self, engines: Sequence[str] = ('pdflatex',)) -> Optional[threading.Thread]:
+        """Start warm() on a daemon thread, unless the cache is already warm. Compiles do not wait for it."""
+        if self.warmed:
+            return None
+        thread = threading.Thread(target=self.warm, args=(tuple(engines),), name='tex-cache-warm', daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Any]:
+        """Return whether the cache is warm, its disk use and promotion counters."""
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        with self._lock:
+            return {
+                'cache_dir': self.cache_dir,
+                'warmed': self.warmed,
+                'warm_seconds': self.warm_seconds,
+                'disk_bytes': total,
+                'promotions': self.promotions,
+                'promoted_files': self.promoted_files,
+            }
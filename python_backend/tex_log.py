@@ -0,0 +1,198 @@
+"""
+Streaming parser for TeX .log files.
+
+Reads the log once, line by line, and turns it into a list of diagnostics
+the popup can show next to the source:
+
+- file:line:error entries (pdflatex -file-line-error) and classic "! ..." errors
+- missing package/class/file errors
+- overfull/underfull box warnings with their line ranges
+- LaTeX, package and class warnings (with "on input line N" when given)
+
+Logs are written with max_print_line=10000, so messages are not wrapped and
+almost every line can be classified from its first few characters.
+"""
+
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FILE_LINE_ERROR = re.compile(r'^(.+?\.(?:tex|sty|cls|bib|def|cfg|clo|ltx)):(\d+): (.*)$')
+CONTEXT_LINE = re.compile(r'^l\.(\d+) ?(.*)$')
+MISSING_FILE = re.compile(r"File `([^']+)' not found")
+BOX_WARNING = re.compile(r'^(Overfull|Underfull) \\([hv])box \(([^)]*)\)(?:.*? at lines? (\d+)(?:--(\d+))?)?')
+TEX_WARNING = re.compile(r'^(?:LaTeX( Font)?|Package (\S+)|Class (\S+)) Warning: (.*)$')
+INPUT_LINE = re.compile(r'on input line (\d+)\.')
+
+# First characters of every line kind we care about; everything else is skipped cheaply
+INTERESTING_STARTS = ('!', '.', '/', 'l', 'L', 'P', 'C', 'O', 'U')
+
+
+def _normalize_file(path: str, base_dir: Optional[str] = None) -> str:
+    """Report files relative to the compile directory."""
+    if base_dir and path.startswith(base_dir):
+        return os.path.relpath(path, base_dir)
+    return path[2:] if path.startswith('./') else path
+
+
+def _diagnostic(kind: str, severity: str, message: str,
+                file: Optional[str] = None, line: Optional[int] = None, **extra) -> Dict[str, Any]:
+    diagnostic = {'type': kind, 'severity': severity, 'message': message, 'file': file, 'line': line}
+    diagnostic.update(extra)
+    return diagnostic
+
+
+def _classify_error(message: str) -> str:
+    """Return 'missing_package' for missing .sty/.cls files, 'missing_file' for other files, else 'error'."""
+    missing = MISSING_FILE.search(message)
+    if not missing:
+        return 'error'
+    return 'missing_package' if missing.group(1).endswith(('.sty', '.cls')) else 'missing_file'
+
+
+def parse_tex_log_lines(lines: Iterable[str],
+                        max_warnings: int = 200,
+                        base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Parse TeX log lines into diagnostics in a single pass.
+
+    Args:
+        lines: Log lines (an open file works and is read lazily)
+        max_warnings (int): Warnings kept; errors are always kept and the whole log is read
+        base_dir (str): Compile directory, stripped from absolute file paths
+
+    Returns:
+        List of diagnostic dicts with type ('error', 'missing_package',
+        'missing_file', 'box', 'warning'), severity ('error' or 'warning'),
+        message, file and line
+    """
+    return _parse_lines(lines, max_warnings, base_dir)[0]
+
+
+def _parse_lines(lines: Iterable[str],
+                 max_warnings: int,
+                 base_dir: Optional[str]) -> Tuple[List[Dict[str, Any]], int]:
+    """parse_tex_log_lines(), also returning the number of warnings seen (kept or not)."""
+    diagnostics = []
+    warning_count = 0
+    pending_error = None  # error waiting for its "l.<n>" context line
+    pending_warning = None  # warning that may continue on following "(pkg)" lines
+    continuation_prefix = None
+
+    for raw_line in lines:
+        line = raw_line.rstrip('\r\n')
+
+        if pending_warning is not None:
+            if continuation_prefix and line.startswith(continuation_prefix):
+                pending_warning['message'] += ' ' + line[len(continuation_prefix):].strip()
+                continue
+            _finish_warning(pending_warning)
+            pending_warning = None
+
+        if not line or line[0] not in INTERESTING_STARTS:
+            continue
+
+        if line[0] == 'l' and pending_error is not None:
+            context = CONTEXT_LINE.match(line)
+            if context:
+                if pending_error['line'] is None:
+                    pending_error['line'] = int(context.group(1))
+                pending_error['context'] = context.group(2)
+                pending_error = None
+                continue
+
+        if line[0] == '!':
+            message = line[1:].strip()
+            pending_error = _diagnostic(_classify_error(message), 'error', message)
+            diagnostics.append(pending_error)
+        elif line[0] in './':
+            match = FILE_LINE_ERROR.match(line)
+            if match:
+                message = match.group(3)
+                pending_error = _diagnostic(_classify_error(message), 'error', message,
+                                            _normalize_file(match.group(1), base_dir), int(match.group(2)))
+                diagnostics.append(pending_error)
+        elif line[0] in 'OU':
+            match = BOX_WARNING.match(line)
+            if match:
+                warning_count += 1
+                if warning_count <= max_warnings:
+                    start_line = int(match.group(4)) if match.group(4) else None
+                    end_line = int(match.group(5)) if match.group(5) else start_line
+                    diagnostics.append(_diagnostic('box', 'warning', line, 'document.tex' if start_line else None,
+                                                   start_line, end_line=end_line,
+                                                   box=f"{match.group(1).lower()} {match.group(2)}box",
+                                                   amount=match.group(3)))
+        elif line[0] in 'LPC':
+            match = TEX_WARNING.match(line)
+            if match:
+                package = match.group(2) or match.group(3)
+                pending_warning = _diagnostic('warning', 'warning', match.group(4), package=package)
+                if package:
+                    continuation_prefix = f'({package})'
+                else:
+                    continuation_prefix = '(Font)' if match.group(1) else None
+                # Past the cap the warning is still parsed, so its continuation lines are skipped
+                warning_count += 1
+                if warning_count <= max_warnings:
+                    diagnostics.append(pending_warning)
+
+    if pending_warning is not None:
+        _finish_warning(pending_warning)
+    return _dedupe_errors(diagnostics), warning_count
+
+
+def _finish_warning(warning: Dict[str, Any]):
+    """Pull "on input line N" out of a completed warning message."""
+    match = INPUT_LINE.search(warning['message'])
+    if match:
+        warning['line'] = int(match.group(1))
+        warning['file'] = 'document.tex'
+
+
+def _dedupe_errors(diagnostics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop "! ..." errors that repeat a file:line:error entry.
+
+    Some errors (e.g. "! Emergency stop.") are printed in both forms.
+    """
+    located = {d['message'] for d in diagnostics if d['severity'] == 'error' and d['file']}
+    return [d for d in diagnostics
+            if not (d['severity'] == 'error' and d['file'] is None and d['message'] in located)]
+
+
+def parse_tex_log(log_file_path: str, max_warnings: int = 200) -> Optional[Dict[str, Any]]:
+    """
+    Parse a .log file from disk. File paths are reported relative to its directory.
+
+    Args:
+        log_file_path (str): Path to the .log file
+        max_warnings (int): Warnings kept in diagnostics; all errors are kept
+
+    Returns:
+        Dict with diagnostics, error_count, warning_count (all warnings, kept or not) and parse_ms,
+        or None if the log does not exist
+    """
+    if not os.path.exists(log_file_path):
+        return None
+
+    start_time = time.perf_counter()
+    try:
+        with open(log_file_path, 'r', encoding='utf-8', errors='replace') as log_file:
+            diagnostics, warning_count = _parse_lines(log_file, max_warnings,
+                                                      base_dir=os.path.dirname(os.path.abspath(log_file_path)))
+    except OSError as e:
+        logger.debug("Error reading log file: %s", e)
+        return None
+
+    error_count = sum(1 for d in diagnostics if d['severity'] == 'error')
+    return {
+        'diagnostics': diagnostics,
+        'error_count': error_count,
+        'warning_count': warning_count,
+        'parse_ms': (time.perf_counter() - start_time) * 1000,
+    }
@@ -0,0 +1,250 @@
+"""
+Request-scoped logging and sampled request traces.
+
+Every request gets a request id (the client's X-Request-Id, or a new one)
+that is added to each log line written while handling it, including lines
+from compile workers and fan-out threads started with propagate().
+
+A sampled request also gets a RequestTrace: spans for each stage
+(compile_cache, compile_queue, latexmk, gemini calls...) with their offset,
+duration and attributes. Finished traces go into a fixed-size ring buffer
+served by GET /traces. TRACE_SAMPLE_RATE picks the share of requests that
+are traced; a request with an X-Trace: 1 header is always traced.
+
+When a request is not sampled, span() is a no-op context manager, and log
+calls below LOG_LEVEL return after one level check, so the hot path pays
+next to nothing for either.
+"""
+
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+_trace = contextvars.ContextVar('trace', default=None)
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds the current request id (or '-') to every record as %(request_id)s."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or '-'
+        return True
+
+
+def configure_logging(level: Optional[str] = None):
+    """
+    Send log records to stderr with request ids, at LOG_LEVEL (default INFO).
+
+    Leaves existing root handlers alone (e.g. when a server configured
+    logging already) apart from adding the request id filter to them.
+    """
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv('LOG_LEVEL') or 'INFO').upper())
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+    for handler in root.handlers:
+        if not any(isinstance(f, RequestIdFilter) for f in handler.filters):
+            handler.addFilter(RequestIdFilter())
+
+
+class RequestTrace:
+    def __init__(self, request_id: str, method: str, path: str):
+        """
+        Spans recorded while handling one request.
+
+        Args:
+            request_id (str): Request id the spans belong to
+            method (str): HTTP method
+            path (str): Request path
+        """
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.status = None
+        self.duration_ms = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()  # spans can come from worker threads
+        self._spans = []
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Record the time spent in the with block; the yielded attributes dict can be added to."""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            record = {
+                'name': name,
+                'start_ms': (start - self._start) * 1000,
+                'duration_ms': (end - start) * 1000,
+                'thread': threading.current_thread().name,
+                'attributes': attributes,
+            }
+            if error:
+                record['error'] = error
+            with self._lock:
+                self._spans.append(record)
+
+    def add_span(self, name: str, duration: float, **attributes: Any):
+        """Record a span that ended just now and took duration seconds."""
+        start = time.perf_counter() - duration
+        with self._lock:
+            self._spans.append({
+                'name': name,
+                'start_ms': (start - self._start) * 1000,
+                'duration_ms': duration * 1000,
+                'thread': threading.current_thread().name,
+                'attributes': attributes,
+            })
+
+    def finish(self, status: Optional[int]):
+        self.status = status
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self._spans, key=lambda span: span['start_ms'])
+        return {
+            'request_id': self.request_id,
+            'method': self.method,
+            'path': self.path,
+            'started_at': self.started_at,
+            'status': self.status,
+            'duration_ms': self.duration_ms,
+            'spans': spans,
+        }
+
+
+class TraceBuffer:
+    def __init__(self, max_traces: int = 200, sample_rate: float = 0.0):
+        """
+        Ring buffer of recent request traces.
+
+        Args:
+            max_traces (int): Finished traces kept; the oldest are dropped first
+            sample_rate (float): Share of requests traced (0 to 1); X-Trace forces one
+        """
+        self.max_traces = max_traces
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._traces = deque(maxlen=max_traces)
+        self.recorded = 0
+
+    def should_sample(self, forced: bool = False) -> bool:
+        return forced or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def add(self, trace: RequestTrace):
+        with self._lock:
+            self._traces.append(trace)
+            self.recorded += 1
+
+    def recent(self, limit: int = 50, min_duration_ms: float = 0.0, path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return up to limit finished traces, newest first, optionally filtered by duration and path."""
+        with self._lock:
+            traces = list(self._traces)
+        selected = []
+        for trace in reversed(traces):
+            if (trace.duration_ms or 0) < min_duration_ms or (path and trace.path != path):
+                continue
+            selected.append(trace.to_dict())
+            if len(selected) >= limit:
+                break
+        return selected
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            traces = list(self._traces)
+        for trace in reversed(traces):
+            if trace.request_id == request_id:
+                return trace.to_dict()
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'traces': len(self._traces),
+                'recorded': self.recorded,
+                'max_traces': self.max_traces,
+                'sample_rate': self.sample_rate,
+            }
+
+
+def new_request_id(client_value: Optional[str] = None) -> str:
+    """The client's request id if it is short and printable, else a new random one."""
+    if client_value and len(client_value) <= 64 and client_value.isprintable() and ' ' not in client_value:
+        return client_value
+    return uuid.uuid4().hex[:16]
+
+
+def start_request(request_id: str, trace: Optional[RequestTrace] = None):
+    """Make request_id (and trace, if sampled) current. Returns tokens for end_request."""
+    return _request_id.set(request_id), _trace.set(trace)
+
+
+def end_request(tokens):
+    request_token, trace_token = tokens
+    _trace.reset(trace_token)
+    _request_id.reset(request_token)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _trace.get()
+
+
+class _NoSpan:
+    """Stands in for RequestTrace.span when the request is not sampled."""
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attributes: Any):
+    """Record a span on the current request's trace; a no-op when the request is not sampled."""
+    trace = _trace.get()
+    if trace is None:
+        return NO_SPAN
+    return trace.span(name, **attributes)
+
+
+def record_span(name: str, duration: float, **attributes: Any):
+    """Record a span that ended just now on the current request's trace, if it is sampled."""
+    trace = _trace.get()
+    if trace is not None:
+        trace.add_span(name, duration, **attributes)
+
+
+def propagate(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap fn to run in a copy of the caller's context, so worker threads keep the request id and trace."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
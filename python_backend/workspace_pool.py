@@ -0,0 +1,152 @@
+"""
+Pool of persistent, per-document compile workspaces.
+
+A fresh temp dir throws away the .aux, .fdb_latexmk, .out and .toc files, so
+latexmk has to run pdflatex several times to settle references. Keeping one
+workspace per client document id lets latexmk's own dependency database skip
+reruns when labels and references have not changed.
+
+Idle workspaces expire, and the pool is capped on workspace count and disk use.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+
+def _directory_size(path: str) -> int:
+    """Return the total size of the files under path."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class WorkspacePool:
+    def __init__(self,
+                 root_dir: str,
+                 max_workspaces: int = 32,
+                 max_disk_bytes: int = 256 * 1024 * 1024,
+                 idle_ttl: float = 30 * 60):
+        """
+        Initialize the workspace pool.
+
+        Args:
+            root_dir (str): Directory that holds one subdirectory per workspace
+            max_workspaces (int): Maximum number of workspaces kept
+            max_disk_bytes (int): Maximum total disk use across workspaces
+            idle_ttl (float): Seconds after which an unused workspace expires
+        """
+        self.root_dir = root_dir
+        self.max_workspaces = max_workspaces
+        self.max_disk_bytes = max_disk_bytes
+        self.idle_ttl = idle_ttl
+
+        self._lock = threading.Lock()
+        self._workspaces = {}  # name -> {'lock', 'last_used', 'size', 'in_use'}
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+        # Workspaces from a previous run are not tracked, so clear them out
+        os.makedirs(self.root_dir, exist_ok=True)
+        for entry in os.scandir(self.root_dir):
+            if entry.is_dir() and len(entry.name) == 32 and all(c in '0123456789abcdef' for c in entry.name):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    @staticmethod
+    def workspace_name(document_id: str) -> str:
+        """Map a client-supplied document id to a safe directory name."""
+        return hashlib.sha256(document_id.encode('utf-8')).hexdigest()[:32]
+
+    @contextmanager
+    def acquire(self, document_id: str) -> Iterator[str]:
+        """
+        Check out the workspace for a document.
+
+        Compiles for the same document are serialized; different documents
+        compile concurrently.
+
+        Args:
+            document_id (str): Client-supplied document or session id
+
+        Yields:
+            Path of the workspace directory
+        """
+        name = self.workspace_name(document_id)
+        path = os.path.join(self.root_dir, name)
+
+        with self._lock:
+            workspace = self._workspaces.get(name)
+            if workspace is None:
+                workspace = {'lock': threading.Lock(), 'last_used': time.time(), 'size': 0, 'in_use': 0}
+                self._workspaces[name] = workspace
+                self.misses += 1
+            else:
+                self.hits += 1
+            workspace['in_use'] += 1
+
+        size = None
+        try:
+            with workspace['lock']:
+                os.makedirs(path, exist_ok=True)
+                yield path
+                size = _directory_size(path)
+        finally:
+            with self._lock:
+                workspace['in_use'] -= 1
+                workspace['last_used'] = time.time()
+                if size is not None:
+                    workspace['size'] = size
+
+        self.sweep()
+
+    def _remove(self, name: str):
+        """Delete a workspace. Caller holds the lock and checked it is idle."""
+        del self._workspaces[name]
+        shutil.rmtree(os.path.join(self.root_dir, name), ignore_errors=True)
+
+    def sweep(self):
+        """Expire idle workspaces and evict the least recently used past the caps."""
+        now = time.time()
+        with self._lock:
+            idle = [(w['last_used'], name) for name, w in self._workspaces.items() if not w['in_use']]
+            idle.sort()
+
+            for last_used, name in list(idle):
+                if now - last_used > self.idle_ttl:
+                    self._remove(name)
+                    self.expirations += 1
+                    idle.remove((last_used, name))
+
+            total_size = sum(w['size'] for w in self._workspaces.values())
+            for last_used, name in idle:
+                if len(self._workspaces) <= self.max_workspaces and total_size <= self.max_disk_bytes:
+                    break
+                total_size -= self._workspaces[name]['size']
+                self._remove(name)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return workspace counts, disk use and reuse counters."""
+        with self._lock:
+            return {
+                'workspaces': len(self._workspaces),
+                'disk_bytes': sum(w['size'] for w in self._workspaces.values()),
+                'max_workspaces': self.max_workspaces,
+                'max_disk_bytes': self.max_disk_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+            }